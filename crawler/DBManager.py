@@ -161,6 +161,41 @@ class DBManager :
             self.cursor.close()
             return False
     
+    # 같은 sql을 여러 행에 대해 실행 (commit은 하지 않음 → 여러 작업을 한 트랜잭션으로 묶을 때 사용)
+    # 성공하면 영향 받은 행 수, 실패하면 -1 반환
+    def ExecuteMany(self, sql, rows) :
+        cursor = None
+        try :
+            cursor = self.con.cursor()
+            return cursor.executemany(sql, rows)
+        except Exception as e :
+            print(e)
+            return -1
+        finally :
+            if cursor :
+                cursor.close()
+
+    # sql 한 문장 실행 (CREATE TABLE / UPDATE 등, commit은 하지 않음)
+    # 성공하면 영향 받은 행 수, 실패하면 -1 반환
+    def Execute(self, sql, params=None) :
+        cursor = None
+        try :
+            cursor = self.con.cursor()
+            return cursor.execute(sql, params)
+        except Exception as e :
+            print(e)
+            return -1
+        finally :
+            if cursor :
+                cursor.close()
+
+    # ExecuteMany / Execute로 실행한 작업 확정 / 취소
+    def Commit(self) :
+        self.con.commit()
+
+    def Rollback(self) :
+        self.con.rollback()
+
     def CheckDuplicate(self, sql, datas=None):
         # 커서 변수 초기화, try에서 문제 생겨도, finally에서 오류 안남
         cursor = None
@@ -0,0 +1,203 @@
+"""
+crawl_scheduler.py 동작 확인 (가짜 네이버 지도 페이지 + 별도 확인용 DB)
+
+- fake_naver/ 폴더의 정적 페이지를 로컬 HTTP 서버로 띄우고 NAVER_MAP_URL을 그 주소로 바꿔서
+  브라우저 워커 여러 개로 가게 목록(stores) → 상세 정보 / 메뉴 / 리뷰(reviews)를 수집합니다.
+- 확인용 DB(CHECK_DB, 기본 feelfood_crawl_check)를 새로 만들어서 사용하므로 실제 데이터는 건드리지 않습니다.
+  .env의 DB 접속 정보를 사용하며, 해당 계정에 DB 생성 권한이 필요합니다. (MySQL 8.0 이상)
+- 저장된 가게 / 메뉴 / 리뷰 수가 가짜 페이지 데이터와 같은지 확인하고, --refresh로 다시 돌려서 리뷰가 중복 저장되지 않는지 확인합니다.
+
+실행 예)
+    python check_scheduler.py --workers 2
+    python check_scheduler.py --workers 3 --queue     # DB 작업 큐(crawl_job) 사용
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import functools
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from dotenv import load_dotenv
+from DBManager import DBManager
+
+load_dotenv()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_DIR = os.path.join(BASE_DIR, 'fake_naver')
+CHECK_DB = os.environ.get('CRAWL_CHECK_DB', 'feelfood_crawl_check')
+LOCATIONS = ['가짜대', '테스트대']
+
+# fake_naver/fake.js의 FAKE 값과 같게 유지
+FAKE_STORES_PER_LOCATION = 4
+FAKE_MENUS = 3
+FAKE_REVIEWS = 23
+
+class FakeNaverHandler(SimpleHTTPRequestHandler):
+    """/p/search/{검색어}는 모두 index.html, 나머지는 fake_naver/의 파일 (없는 사진은 빈 응답)"""
+    def do_GET(self):
+        if self.path.startswith('/p/search/'):
+            self.path = '/index.html'
+        elif self.path.startswith('/photo/'):
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fake_server():
+    """fake_naver/를 빈 포트에서 서비스하고 검색 주소 반환"""
+    handler = functools.partial(FakeNaverHandler, directory=FAKE_DIR)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, name='fake-naver', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/p/search/"
+
+def create_schema(dbm, check_db):
+    """확인용 DB와 테이블을 새로 만듦 (README의 store / review / menu와 같은 구조)"""
+    cursor = dbm.con.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{check_db}`")
+    cursor.execute(f"CREATE DATABASE `{check_db}` CHARACTER SET utf8mb4")
+    cursor.execute(f"USE `{check_db}`")
+    cursor.execute("""
+        CREATE TABLE store (
+          s_idx INT NOT NULL AUTO_INCREMENT,
+          s_name VARCHAR(255),
+          s_categ VARCHAR(255),
+          s_location VARCHAR(255),
+          s_address VARCHAR(255),
+          s_img TEXT,
+          s_y_coord DECIMAL(12, 9),
+          s_x_coord DECIMAL(12, 9),
+          PRIMARY KEY (s_idx)
+        ) ENGINE=InnoDB""")
+    cursor.execute("""
+        CREATE TABLE review (
+          r_idx INT NOT NULL AUTO_INCREMENT,
+          s_idx INT NOT NULL,
+          r_content TEXT,
+          r_visit_count INT,
+          r_date DATE,
+          r_location VARCHAR(255),
+          r_writer VARCHAR(255),
+          r_content_hash CHAR(64) CHARACTER SET ascii AS (SHA2(r_content, 256)) STORED,
+          PRIMARY KEY (r_idx),
+          UNIQUE KEY uq_review_dedup (s_idx, r_writer, r_date, r_content_hash),
+          FOREIGN KEY (s_idx) REFERENCES store(s_idx)
+        ) ENGINE=InnoDB""")
+    cursor.execute("""
+        CREATE TABLE menu (
+          m_idx INT NOT NULL AUTO_INCREMENT,
+          s_idx INT NOT NULL,
+          m_name VARCHAR(255),
+          m_price VARCHAR(255),
+          m_location VARCHAR(255),
+          PRIMARY KEY (m_idx),
+          FOREIGN KEY (s_idx) REFERENCES store(s_idx)
+        ) ENGINE=InnoDB""")
+    dbm.con.commit()
+    cursor.close()
+
+def count(dbm, sql):
+    dbm.OpenSQL(sql)
+    value = dbm.getValue(0, 'cnt')
+    dbm.CloseSQL()
+    return value
+
+def table_counts(host, id, pw, check_db, port):
+    dbm = DBManager()
+    dbm.DBOpen(host, id, pw, check_db, port)
+    try:
+        return {
+            'stores': count(dbm, "SELECT COUNT(*) AS cnt FROM store"),
+            'crawled': count(dbm, "SELECT COUNT(*) AS cnt FROM store WHERE s_img IS NOT NULL AND s_address IS NOT NULL"),
+            'menus': count(dbm, "SELECT COUNT(*) AS cnt FROM menu"),
+            'reviews': count(dbm, "SELECT COUNT(*) AS cnt FROM review")
+        }
+    finally:
+        dbm.DBClose()
+
+def check(name, actual, expected):
+    ok = actual == expected
+    print(f"  [{'OK' if ok else 'FAIL'}] {name}: {actual} (기대값 {expected})")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 네이버 지도 페이지로 crawl_scheduler 동작 확인")
+    parser.add_argument('--workers', type=int, default=2, help="브라우저 워커 프로세스 수 (2 이상 권장)")
+    parser.add_argument('--min-interval', type=float, default=0.5, help="워커당 작업 시작 최소 간격(초)")
+    parser.add_argument('--queue', action='store_true', help="DB 작업 큐(crawl_job)로 실행")
+    parser.add_argument('--keep-db', action='store_true', help="확인이 끝나도 확인용 DB를 지우지 않음")
+    args = parser.parse_args()
+
+    host = os.environ.get('host')
+    port = int(os.environ.get('port', 3306))
+    id = os.environ.get('user')
+    pw = os.environ.get('passwd')
+
+    dbm = DBManager()
+    if not dbm.DBOpen(host, id, pw, os.environ.get('dbname'), port):
+        print("DB 연결 실패")
+        sys.exit(1)
+    try:
+        create_schema(dbm, CHECK_DB)
+    finally:
+        dbm.DBClose()
+
+    server, url = start_fake_server()
+    # 크롤러 모듈은 import할 때 환경 변수를 읽고, spawn으로 띄운 워커도 이 환경 변수를 물려받음
+    os.environ['dbname'] = CHECK_DB
+    os.environ['NAVER_MAP_URL'] = url
+    import crawl_scheduler
+    print(f"[확인] 가짜 네이버 지도 {url}, DB {CHECK_DB}, 워커 {args.workers}개{' (작업 큐)' if args.queue else ''}")
+
+    def run(stage, jobs, refresh=False):
+        started = time.monotonic()
+        if args.queue:
+            summary = crawl_scheduler.run_queue_stage(stage, jobs, args.workers, args.min_interval, refresh)
+        else:
+            summary = crawl_scheduler.run_stage(stage, jobs, args.workers, args.min_interval)
+        print(f"\n[확인] {stage}: {dict(summary)} ({time.monotonic() - started:.1f}초)")
+        return summary
+
+    stores = FAKE_STORES_PER_LOCATION * len(LOCATIONS)
+    results = []
+    try:
+        # 1) 가게 목록: 지역마다 2페이지 이상
+        run('stores', LOCATIONS)
+        results.append(check("가게 목록", table_counts(host, id, pw, CHECK_DB, port)['stores'], stores))
+
+        # 2) 상세 정보 / 메뉴 / 리뷰
+        jobs = crawl_scheduler.load_review_jobs(LOCATIONS, False)
+        summary = run('reviews', jobs)
+        counts = table_counts(host, id, pw, CHECK_DB, port)
+        key = 'done' if args.queue else 'ok'
+        results.append(check("성공한 가게 작업", summary[key], stores))
+        results.append(check("이미지 / 주소 저장", counts['crawled'], stores))
+        results.append(check("메뉴", counts['menus'], stores * FAKE_MENUS))
+        results.append(check("리뷰", counts['reviews'], stores * FAKE_REVIEWS))
+
+        # 3) 정기 갱신: 이미 저장된 리뷰는 다시 저장하지 않음
+        run('reviews', crawl_scheduler.load_review_jobs(LOCATIONS, True), refresh=True)
+        counts = table_counts(host, id, pw, CHECK_DB, port)
+        results.append(check("갱신 후 리뷰 (중복 없음)", counts['reviews'], stores * FAKE_REVIEWS))
+    finally:
+        server.shutdown()
+        if not args.keep_db:
+            dbm = DBManager()
+            if dbm.DBOpen(host, id, pw, CHECK_DB, port):
+                cursor = dbm.con.cursor()
+                cursor.execute(f"DROP DATABASE IF EXISTS `{CHECK_DB}`")
+                cursor.close()
+                dbm.DBClose()
+
+    if all(results):
+        print("\n✅ 모든 확인 통과")
+    else:
+        print("\n[비상] 확인 실패 항목이 있습니다 (log.txt 참고)")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
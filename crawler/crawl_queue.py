@@ -0,0 +1,273 @@
+import os
+import socket
+import threading
+import argparse
+from dotenv import load_dotenv
+from DBManager import DBManager
+
+# ---------------------------------------------------------
+# DB 크롤링 작업 큐 (crawl_job 테이블)
+# - 작업마다 상태(pending / running / done / failed / dead), 시도 횟수, 마지막 오류, 임대 만료 시각, 워커 id 저장
+# - claim: FOR UPDATE SKIP LOCKED로 작업 하나를 잠그고 running + 임대(leased_until)로 바꿔서 가져감
+#   → 여러 크롤러 프로세스(다른 서버 포함)가 같은 작업을 동시에 가져가지 않음
+#   → 프로세스가 죽어서 임대가 만료된 작업은 다른 워커가 다시 가져감
+# - fail: 시도 횟수에 따라 점점 늦게 다시 시도 (backoff), MAX_ATTEMPTS번 실패하면 dead로 건너뜀
+# - 재시작하면 done이 아닌 작업만 이어서 처리
+#
+#   python crawl_queue.py --stats
+#   python crawl_queue.py --retry-dead --type reviews
+# ---------------------------------------------------------
+
+load_dotenv()
+host = os.environ.get('host')
+port = int(os.environ.get('port', 3306))
+id = os.environ.get('user')
+pw = os.environ.get('passwd')
+dbName = os.environ.get('dbname')
+
+# 작업 종류: stores (지역 가게 목록, store_list.py) / reviews (가게 상세·메뉴·리뷰, naver_review.py)
+JOB_TYPES = ['stores', 'reviews']
+# 작업 하나를 가져간 워커가 끝낼 때까지 다른 워커가 못 가져가는 시간(초)
+# 처리 중에는 run_jobs가 LEASE_SEC / 3마다 임대를 연장하므로, 오래 걸리는 가게도 다른 워커가 다시 가져가지 않음
+# (워커가 죽어서 연장이 멈추면 LEASE_SEC 뒤에 다른 워커가 가져감)
+LEASE_SEC = 1800
+# 이 횟수만큼 실패하면 dead (다시 시도하지 않음)
+MAX_ATTEMPTS = 5
+# 실패 후 다시 시도까지 대기(초): BACKOFF_BASE * 2^(시도 횟수-1), 최대 BACKOFF_MAX
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 3600
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def ensure_table(dbm):
+    sql = """
+    CREATE TABLE IF NOT EXISTS crawl_job (
+        j_idx INT NOT NULL AUTO_INCREMENT,
+        j_type VARCHAR(16) NOT NULL,
+        j_location VARCHAR(255) NOT NULL,
+        j_store VARCHAR(255) NOT NULL DEFAULT '',
+        status VARCHAR(16) NOT NULL DEFAULT 'pending',
+        attempts INT NOT NULL DEFAULT 0,
+        last_error TEXT,
+        leased_until DATETIME NULL,
+        worker_id VARCHAR(64) NULL,
+        next_run_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (j_idx),
+        UNIQUE KEY uq_crawl_job (j_type, j_location, j_store),
+        INDEX idx_crawl_job_claim (j_type, status, next_run_at)
+    ) ENGINE=InnoDB
+    """
+    ok = dbm.Execute(sql) >= 0
+    dbm.Commit()
+    return ok
+
+def enqueue(dbm, j_type, items, requeue_done=False):
+    """
+    (지역, 가게) 목록을 작업으로 추가 (stores 작업은 가게를 ''로), 이미 있는 작업은 상태 유지
+    - requeue_done이면 done인 작업을 다시 pending으로 (정기 갱신), dead는 그대로 건너뜀
+    - 반환: 영향 받은 행 수, 실패하면 -1
+    """
+    rows = [(j_type, location, store or '') for location, store in items]
+    if not rows:
+        return 0
+    if requeue_done:
+        # status를 마지막에 바꿔야 앞의 IF가 원래 상태를 봄
+        sql = """
+            INSERT INTO crawl_job (j_type, j_location, j_store) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                attempts = IF(status = 'done', 0, attempts),
+                next_run_at = IF(status = 'done', NOW(), next_run_at),
+                status = IF(status = 'done', 'pending', status)
+        """
+    else:
+        sql = "INSERT IGNORE INTO crawl_job (j_type, j_location, j_store) VALUES (%s, %s, %s)"
+    count = dbm.ExecuteMany(sql, rows)
+    if count < 0:
+        dbm.Rollback()
+        return -1
+    dbm.Commit()
+    return count
+
+def claim(dbm, j_type, worker_id, location=None, lease_sec=LEASE_SEC, max_attempts=MAX_ATTEMPTS):
+    """
+    실행할 수 있는 작업 하나를 임대해서 반환 ({'j_idx', 'j_location', 'j_store', 'attempts'}), 없으면 None
+    - pending / failed(대기 시간 지남) / running(임대 만료, 처리하던 프로세스가 죽음) 중 오래된 순서
+    """
+    # 임대가 만료됐는데 이미 최대 횟수만큼 시도한 작업은 dead
+    expire_sql = """
+        UPDATE crawl_job SET status = 'dead', leased_until = NULL,
+            last_error = CONCAT('임대 만료 (워커 ', IFNULL(worker_id, '?'), ' 응답 없음) ', IFNULL(last_error, ''))
+        WHERE j_type = %s AND status = 'running' AND leased_until < NOW() AND attempts >= %s
+    """
+    if dbm.Execute(expire_sql, (j_type, max_attempts)) < 0:
+        dbm.Rollback()
+        return None
+    dbm.Commit()
+
+    sql = """
+        SELECT j_idx, j_location, j_store, attempts
+        FROM crawl_job
+        WHERE j_type = %s
+          AND ((status IN ('pending', 'failed') AND next_run_at <= NOW())
+               OR (status = 'running' AND leased_until < NOW()))
+    """
+    params = [j_type]
+    if location is not None:
+        sql += " AND j_location = %s"
+        params.append(location)
+    # 다른 워커가 잠근 행은 기다리지 않고 건너뜀 (MySQL 8.0+)
+    sql += " ORDER BY next_run_at, j_idx LIMIT 1 FOR UPDATE SKIP LOCKED"
+
+    if not dbm.OpenSQL(sql, tuple(params)):
+        dbm.Rollback()
+        return None
+    job = dbm.getData(0)
+    dbm.CloseSQL()
+    if job is None:
+        dbm.Commit()
+        return None
+
+    lease_sql = """
+        UPDATE crawl_job
+        SET status = 'running', attempts = attempts + 1, worker_id = %s,
+            leased_until = DATE_ADD(NOW(), INTERVAL %s SECOND)
+        WHERE j_idx = %s
+    """
+    if dbm.Execute(lease_sql, (worker_id, lease_sec, job['j_idx'])) < 1:
+        dbm.Rollback()
+        return None
+    dbm.Commit()
+    job['attempts'] += 1
+    return job
+
+def extend_lease(dbm, job, worker_id, lease_sec=LEASE_SEC):
+    """임대 만료 시각을 지금부터 lease_sec초 뒤로 연장, 임대를 잃었으면(다른 워커가 가져감) False"""
+    sql = """
+        UPDATE crawl_job SET leased_until = DATE_ADD(NOW(), INTERVAL %s SECOND)
+        WHERE j_idx = %s AND worker_id = %s AND status = 'running'
+    """
+    count = dbm.Execute(sql, (lease_sec, job['j_idx'], worker_id))
+    dbm.Commit()
+    return count > 0
+
+def _keep_lease(dbm, job, worker_id, lease_sec, stop):
+    """handler가 끝날 때까지(stop) lease_sec / 3마다 임대 연장"""
+    while not stop.wait(lease_sec / 3):
+        if not extend_lease(dbm, job, worker_id, lease_sec):
+            print(f"[작업 {job['j_idx']}] 임대 연장 실패 (다른 워커가 가져갔을 수 있음)")
+
+def complete(dbm, job, worker_id):
+    """작업 완료 (임대한 워커만 바꿀 수 있음)"""
+    sql = """
+        UPDATE crawl_job SET status = 'done', leased_until = NULL, last_error = NULL
+        WHERE j_idx = %s AND worker_id = %s AND status = 'running'
+    """
+    ok = dbm.Execute(sql, (job['j_idx'], worker_id)) >= 0
+    dbm.Commit()
+    return ok
+
+def fail(dbm, job, worker_id, error, max_attempts=MAX_ATTEMPTS):
+    """작업 실패 기록, 최대 횟수 미만이면 backoff 후 다시 시도 / 이상이면 dead"""
+    attempts = job['attempts']
+    status = 'dead' if attempts >= max_attempts else 'failed'
+    backoff = min(BACKOFF_BASE * 2 ** max(attempts - 1, 0), BACKOFF_MAX)
+    sql = """
+        UPDATE crawl_job
+        SET status = %s, last_error = %s, leased_until = NULL,
+            next_run_at = DATE_ADD(NOW(), INTERVAL %s SECOND)
+        WHERE j_idx = %s AND worker_id = %s AND status = 'running'
+    """
+    ok = dbm.Execute(sql, (status, str(error)[:1000], backoff, job['j_idx'], worker_id)) >= 0
+    dbm.Commit()
+    return status if ok else None
+
+def run_jobs(dbm, j_type, handler, worker_id=None, location=None, before_each=None, lease_sec=LEASE_SEC):
+    """
+    작업이 없을 때까지 claim → handler(job) → complete / fail 반복
+    - handler는 성공하면 None, 실패하면 오류 메시지를 반환 (예외도 실패로 기록)
+    - handler가 실행되는 동안 백그라운드 스레드가 dbm으로 임대를 연장
+      (handler는 dbm을 쓰면 안 됨, 가게 수집은 따로 연 DB 연결 사용)
+    - before_each: 작업 시작 전에 호출 (요청 속도 제한 등)
+    - 반환: 상태별 처리 개수 dict
+    """
+    worker_id = worker_id or default_worker_id()
+    summary = {'done': 0, 'failed': 0, 'dead': 0}
+    while True:
+        job = claim(dbm, j_type, worker_id, location, lease_sec)
+        if job is None:
+            break
+        if before_each:
+            before_each()
+        print(f"\n[작업 {job['j_idx']}] {job['j_location']} {job['j_store']} (시도 {job['attempts']}/{MAX_ATTEMPTS})")
+        stop = threading.Event()
+        keeper = threading.Thread(target=_keep_lease, args=(dbm, job, worker_id, lease_sec, stop), daemon=True)
+        keeper.start()
+        try:
+            error = handler(job)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            # 연장 스레드가 끝난 뒤에 같은 연결로 complete / fail
+            stop.set()
+            keeper.join()
+
+        if error is None:
+            complete(dbm, job, worker_id)
+            summary['done'] += 1
+        else:
+            status = fail(dbm, job, worker_id, error)
+            if status:
+                summary[status] += 1
+            print(f"[작업 {job['j_idx']}] 실패 → {status}: {error}")
+    return summary
+
+def stats(dbm, j_type=None):
+    """상태별 작업 수 {(종류, 상태): 개수}"""
+    sql = "SELECT j_type, status, COUNT(*) AS cnt FROM crawl_job"
+    params = None
+    if j_type:
+        sql += " WHERE j_type = %s"
+        params = (j_type,)
+    sql += " GROUP BY j_type, status"
+    result = {}
+    if dbm.OpenSQL(sql, params):
+        for row in dbm.getAll() or []:
+            result[(row['j_type'], row['status'])] = row['cnt']
+        dbm.CloseSQL()
+    return result
+
+def retry_dead(dbm, j_type=None):
+    """dead 작업을 처음부터 다시 시도하도록 pending으로"""
+    sql = "UPDATE crawl_job SET status = 'pending', attempts = 0, next_run_at = NOW() WHERE status = 'dead'"
+    params = None
+    if j_type:
+        sql += " AND j_type = %s"
+        params = (j_type,)
+    count = dbm.Execute(sql, params)
+    dbm.Commit()
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="crawl_job 작업 큐 관리")
+    parser.add_argument('--type', choices=JOB_TYPES, default=None)
+    parser.add_argument('--stats', action='store_true', help="상태별 작업 수 출력")
+    parser.add_argument('--retry-dead', action='store_true', help="dead 작업을 다시 pending으로")
+    args = parser.parse_args()
+
+    dbm = DBManager()
+    if not dbm.DBOpen(host, id, pw, dbName, port):
+        print("DB 연결 실패")
+        return
+    try:
+        ensure_table(dbm)
+        if args.retry_dead:
+            print(f"dead 작업 {retry_dead(dbm, args.type)}개를 다시 대기열에 넣었습니다")
+        for (j_type, status), count in sorted(stats(dbm, args.type).items()):
+            print(f"{j_type:8} {status:8} {count}")
+    finally:
+        dbm.DBClose()
+
+if __name__ == '__main__':
+    main()
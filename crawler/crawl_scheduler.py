@@ -0,0 +1,254 @@
+import time
+import queue
+import random
+import logging
+import argparse
+import multiprocessing
+from collections import Counter
+
+import naver_review
+import store_list as store_list_crawler
+import crawl_queue
+from DBManager import DBManager
+
+# ---------------------------------------------------------
+# 크롤링 스케줄러
+# - 브라우저(headless Chrome) 워커 프로세스 N개가 공유 큐에서 작업을 하나씩 가져가서 처리
+#   reviews: (지역, 가게) 작업 → naver_review.crawl_store
+#   stores : 지역 작업       → store_list.collect_location
+# - 워커마다 DB 연결 / 드라이버를 따로 쓰고, 작업 사이에 최소 간격을 둬서 요청 속도 제한
+# - 타임아웃이 나면 워커가 드라이버를 다시 만들고, 워커 프로세스가 죽으면 스케줄러가 새로 띄움
+#
+#   python crawl_scheduler.py --locations 부산대 전북대 --workers 3
+#   python crawl_scheduler.py --all-locations --refresh --workers 4      # 정기 갱신 (새 리뷰만)
+#   python crawl_scheduler.py --stage stores --locations 제주대 충남대
+#   python crawl_scheduler.py --all-locations --queue                    # DB 작업 큐 (다른 서버에서 같이 실행 가능, 재시작하면 이어서)
+# ---------------------------------------------------------
+
+WORKERS = 3
+# 워커 하나가 작업을 시작하는 최소 간격(초) + 무작위 추가 대기(초)
+MIN_INTERVAL = 5.0
+JITTER = 2.0
+# 워커 프로세스를 다시 띄우는 최대 횟수 (Chrome이 아예 안 뜨는 경우 무한 재시작 방지)
+MAX_WORKER_RESTARTS = 10
+
+class RateLimiter:
+    """마지막 작업 시작 후 min_interval(+jitter)초가 지날 때까지 대기"""
+    def __init__(self, min_interval=MIN_INTERVAL, jitter=JITTER):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.last_started = None
+
+    def wait(self):
+        if self.last_started is not None:
+            delay = self.min_interval + random.uniform(0, self.jitter) - (time.monotonic() - self.last_started)
+            if delay > 0:
+                time.sleep(delay)
+        self.last_started = time.monotonic()
+
+# 작업 처리 클래스 (naver_review.main / store_list.main과 같은 코드 사용)
+RUNNERS = {
+    'reviews': naver_review.ReviewJobRunner,
+    'stores': store_list_crawler.StoreJobRunner
+}
+
+def worker_main(worker_id, stage, job_queue, result_queue, in_flight, min_interval):
+    """
+    워커 프로세스: 큐에서 (번호, 작업)을 꺼내 처리하고 결과를 돌려줌 (None을 받으면 종료)
+    처리 중인 작업 번호는 공유 메모리 in_flight[worker_id]에 기록 (프로세스가 갑자기 죽어도 스케줄러가 알 수 있음)
+    """
+    runner = RUNNERS[stage](worker_id)
+    limiter = RateLimiter(min_interval)
+    try:
+        while True:
+            item = job_queue.get()
+            if item is None:
+                break
+            index, job = item
+            limiter.wait()
+            in_flight[worker_id] = index
+            status = runner.run(job)
+            in_flight[worker_id] = -1
+            result_queue.put((worker_id, index, status))
+    finally:
+        runner.close()
+
+def queue_worker_main(worker_id, stage, min_interval):
+    """
+    DB 작업 큐 워커 프로세스: crawl_job에서 작업을 임대해서 처리하고 결과를 DB에 기록
+    (프로세스가 죽으면 처리 중이던 작업은 임대가 만료된 뒤 다른 워커가 다시 가져감)
+    """
+    queue_dbm = DBManager()
+    if not queue_dbm.DBOpen(naver_review.host, naver_review.id, naver_review.pw, naver_review.dbName, naver_review.port):
+        print(f"[worker {worker_id}] DB 연결 실패")
+        return
+    runner = RUNNERS[stage](worker_id)
+    limiter = RateLimiter(min_interval)
+
+    try:
+        summary = crawl_queue.run_jobs(queue_dbm, stage, runner.run_job, before_each=limiter.wait)
+        print(f"[worker {worker_id}] 작업 큐 처리 결과: {summary}")
+    finally:
+        runner.close()
+        queue_dbm.DBClose()
+
+def run_queue_stage(stage, jobs, workers=WORKERS, min_interval=MIN_INTERVAL, refresh=False):
+    """작업을 crawl_job에 넣고 워커 프로세스들이 DB에서 임대해서 처리, 상태별 작업 수 반환"""
+    queue_dbm = DBManager()
+    if not queue_dbm.DBOpen(naver_review.host, naver_review.id, naver_review.pw, naver_review.dbName, naver_review.port):
+        print("DB 연결 실패")
+        return Counter()
+    try:
+        crawl_queue.ensure_table(queue_dbm)
+        items = jobs if stage == 'reviews' else [(location, '') for location in jobs]
+        crawl_queue.enqueue(queue_dbm, stage, items, requeue_done=refresh)
+    finally:
+        queue_dbm.DBClose()
+
+    context = multiprocessing.get_context('spawn')
+
+    def start_worker(worker_id):
+        proc = context.Process(target=queue_worker_main, args=(worker_id, stage, min_interval), daemon=True)
+        proc.start()
+        return proc
+
+    procs = {worker_id: start_worker(worker_id) for worker_id in range(max(1, workers))}
+    next_worker_id = len(procs)
+    restarts = 0
+    while procs:
+        for worker_id, proc in list(procs.items()):
+            proc.join(timeout=5)
+            if proc.is_alive():
+                continue
+            del procs[worker_id]
+            if proc.exitcode != 0:
+                # 처리 중이던 작업은 crawl_job에 running으로 남아 있다가 임대 만료 후 다시 처리됨
+                print(f"[스케줄러] worker {worker_id} 비정상 종료 (exit {proc.exitcode})")
+                logging.critical(f"worker {worker_id} 비정상 종료 (exit {proc.exitcode})")
+                if restarts < MAX_WORKER_RESTARTS:
+                    restarts += 1
+                    procs[next_worker_id] = start_worker(next_worker_id)
+                    next_worker_id += 1
+
+    queue_dbm = DBManager()
+    if not queue_dbm.DBOpen(naver_review.host, naver_review.id, naver_review.pw, naver_review.dbName, naver_review.port):
+        return Counter()
+    try:
+        return Counter({status: count for (_, status), count in crawl_queue.stats(queue_dbm, stage).items()})
+    finally:
+        queue_dbm.DBClose()
+
+def load_review_jobs(locations, refresh):
+    """지역마다 DB의 가게 목록을 읽어서 (지역, 가게) 작업 목록 생성"""
+    jobs = []
+    for location in locations:
+        stores = naver_review.load_stores_from_db(location, refresh)
+        print(f"{location}: 가게 {len(stores)}개")
+        jobs.extend((location, store) for store in stores)
+    return jobs
+
+def run_stage(stage, jobs, workers=WORKERS, min_interval=MIN_INTERVAL):
+    """작업을 워커 프로세스에 나눠서 처리하고 상태별 개수 반환"""
+    # 드라이버 / DB 연결을 부모에서 물려받지 않도록 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    job_queue = context.Queue()
+    result_queue = context.Queue()
+    for index, job in enumerate(jobs):
+        job_queue.put((index, job))
+    workers = max(1, min(workers, len(jobs)))
+    for _ in range(workers):
+        job_queue.put(None)
+    # 워커별 처리 중인 작업 번호 (-1: 없음), 다시 띄운 워커까지 자리 확보
+    in_flight = context.Array('i', [-1] * (workers + MAX_WORKER_RESTARTS))
+
+    def start_worker(worker_id):
+        proc = context.Process(target=worker_main,
+                               args=(worker_id, stage, job_queue, result_queue, in_flight, min_interval), daemon=True)
+        proc.start()
+        return proc
+
+    procs = {worker_id: start_worker(worker_id) for worker_id in range(workers)}
+    next_worker_id = workers
+    restarts = 0
+    summary = Counter()
+    finished = 0
+    started = time.monotonic()
+
+    while finished < len(jobs):
+        try:
+            worker_id, index, status = result_queue.get(timeout=5)
+        except queue.Empty:
+            # 비정상 종료한 워커 확인 → 처리 중이던 작업은 실패로 기록하고 새 워커 시작
+            for worker_id, proc in list(procs.items()):
+                if proc.is_alive() or proc.exitcode == 0:
+                    continue
+                del procs[worker_id]
+                index = in_flight[worker_id]
+                job = jobs[index] if index >= 0 else None
+                print(f"[스케줄러] worker {worker_id} 비정상 종료 (exit {proc.exitcode}), 처리 중이던 작업: {job}")
+                logging.critical(f"worker {worker_id} 비정상 종료 (exit {proc.exitcode}): {job}")
+                if job is not None:
+                    summary['crashed'] += 1
+                    finished += 1
+                if restarts < MAX_WORKER_RESTARTS:
+                    restarts += 1
+                    procs[next_worker_id] = start_worker(next_worker_id)
+                    next_worker_id += 1
+            if not any(proc.is_alive() for proc in procs.values()):
+                print("[스케줄러] 살아있는 워커가 없어서 중단합니다")
+                break
+            continue
+
+        job = jobs[index]
+        summary[status] += 1
+        finished += 1
+        elapsed = time.monotonic() - started
+        print(f"\n[스케줄러] 진행률: {finished}/{len(jobs)} ({finished/len(jobs)*100:.1f}%) "
+              f"- worker {worker_id} {job} → {status}, {finished / max(elapsed, 1e-9) * 60:.1f}개/분")
+        logging.info(f"진행률: {finished}/{len(jobs)} - {job} → {status}")
+
+    summary['not_run'] = len(jobs) - finished
+    for proc in procs.values():
+        proc.join(timeout=30)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="브라우저 워커 여러 개로 네이버 지도 크롤링")
+    parser.add_argument('--stage', choices=list(RUNNERS), default='reviews',
+                        help="reviews: 가게 상세/메뉴/리뷰 (naver_review), stores: 가게 목록 (store_list)")
+    parser.add_argument('--locations', nargs='+', default=[], help="수집할 지역 (예: 부산대 전북대)")
+    parser.add_argument('--all-locations', action='store_true', help="DB store 테이블의 모든 지역")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="브라우저 워커 프로세스 수")
+    parser.add_argument('--min-interval', type=float, default=MIN_INTERVAL, help="워커당 작업 시작 최소 간격(초)")
+    parser.add_argument('--refresh', action='store_true', default=naver_review.REFRESH_MODE,
+                        help="이미 처리한 가게도 다시 방문 (새 리뷰 갱신)")
+    parser.add_argument('--queue', action='store_true',
+                        help="DB 작업 큐(crawl_job) 사용: 여러 스케줄러가 작업을 나눠 갖고, 재시작하면 끝나지 않은 작업부터")
+    args = parser.parse_args()
+
+    locations = list(args.locations)
+    if args.all_locations:
+        locations += [loc for loc in naver_review.get_location() if loc not in locations]
+    if not locations:
+        print("수집할 지역이 없습니다. --locations 또는 --all-locations를 지정하세요.")
+        return
+
+    if args.stage == 'reviews':
+        jobs = load_review_jobs(locations, args.refresh)
+    else:
+        jobs = locations
+    # 작업 큐는 이전 실행에서 끝나지 않은 작업이 남아 있을 수 있으므로 계속 진행
+    if not jobs and not args.queue:
+        print("수집할 작업이 없습니다.")
+        return
+
+    print(f"\n[스케줄러] 작업 {len(jobs)}개, 워커 {args.workers}개, 최소 간격 {args.min_interval}초")
+    started = time.monotonic()
+    if args.queue:
+        summary = run_queue_stage(args.stage, jobs, args.workers, args.min_interval, args.refresh)
+    else:
+        summary = run_stage(args.stage, jobs, args.workers, args.min_interval)
+    print(f"\n모든 수집 작업 완료! {dict(summary)} ({(time.monotonic() - started) / 60:.1f}분)")
+
+if __name__ == "__main__":
+    main()
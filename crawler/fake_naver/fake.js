@@ -0,0 +1,24 @@
+// 가짜 네이버 지도 데이터 (check_scheduler.py의 FAKE_* 상수와 같게 유지)
+const FAKE = {
+    storesPerLocation: 4,   // 지역마다 가게 수
+    listPageSize: 3,        // 가게 목록 한 페이지 가게 수 (2페이지 이상이 되도록)
+    menus: 3,               // 가게마다 메뉴 수
+    reviews: 23,            // 가게마다 리뷰 수
+    reviewPageSize: 10      // 더보기 한 번에 늘어나는 리뷰 수
+};
+const CATEGORIES = ['한식', '일식', '카페,디저트', '중식'];
+const WEEKDAYS = ['일요일', '월요일', '화요일', '수요일', '목요일', '금요일', '토요일'];
+
+function param(name) {
+    return new URLSearchParams(window.location.search).get(name) || '';
+}
+
+function storeNames(area) {
+    return Array.from({length: FAKE.storesPerLocation}, (_, i) => `${area} 가짜식당 ${i + 1}`);
+}
+
+// 최신순: i가 클수록 예전 리뷰
+function reviewDate(i) {
+    const date = new Date(2025, 11, 31 - i);
+    return `${date.getFullYear()}년 ${date.getMonth() + 1}월 ${date.getDate()}일 ${WEEKDAYS[date.getDay()]}`;
+}
@@ -10,10 +10,13 @@ from selenium import webdriver
 import time
 import random
 import os
+import hashlib
 import numpy as np
 
 from DBManager import DBManager
+from page_extract import extract_fields
 from dotenv import load_dotenv
+import crawl_queue
 load_dotenv()
 
 dbm = DBManager()
@@ -22,6 +25,8 @@ port = int(os.environ.get('port', 3306))
 id = os.environ.get('user')
 pw = os.environ.get('passwd')
 dbName = os.environ.get('dbname')
+# 네이버 지도 검색 주소 (테스트할 때는 로컬 가짜 페이지 주소로 바꿀 수 있음)
+NAVER_MAP_URL = os.environ.get('NAVER_MAP_URL', 'https://map.naver.com/p/search/')
 
 logging.basicConfig(        # 로그 기록 설정하기
     filename='log.txt',     # 파일 이름
@@ -29,6 +34,37 @@ logging.basicConfig(        # 로그 기록 설정하기
     encoding='utf-8',       # TXT 파일 인코딩 설정
     format='%(asctime)s : %(levelname)s - %(message)s' )
 
+# 수집 대상 가게
+# False: 아직 처리하지 않은 가게(s_img IS NULL)만 / True: 지역의 모든 가게를 다시 방문해서 새 리뷰만 추가 (정기 갱신)
+REFRESH_MODE = False
+# True면 가게마다 이미 저장된 최근 리뷰를 먼저 불러오고, 최신순 목록에서 저장된 리뷰가 나오면 더보기를 멈춤
+INCREMENTAL = True
+# 워터마크로 불러올 기간 (가장 최근 리뷰 날짜 기준 N일 이내 리뷰)
+# 작성자가 가장 최근 리뷰를 지워도 그 전 리뷰에서 멈출 수 있도록 여러 개를 불러옴
+WATERMARK_DAYS = 30
+# True면 DB 작업 큐(crawl_job)에서 가게를 하나씩 임대해서 처리
+# (여러 프로세스 / 서버가 나눠서 수집, 중간에 멈춰도 다시 실행하면 끝나지 않은 가게부터 이어서 수집)
+USE_JOB_QUEUE = False
+# 가게 N개마다 드라이버를 새로 만듦 (Chrome 메모리 누수 방지, 0이면 안 함)
+RESTART_EVERY = 50
+
+# 리뷰 항목(li.place_apply_pui)에서 가져올 값
+REVIEW_FIELDS = {
+    'text': ['css', 'div.pui__vn15t2 > a'],
+    'visit': ['xpath', ".//span[contains(text(), '번째')]"],
+    'date': ['xpath', ".//span[contains(text(), '년')]"],
+    'writer': ['css', 'span.pui__NMi-Dp']
+}
+# 메뉴 항목(li.E2jtL / 포장·배달 메뉴)에서 가져올 값
+MENU_FIELDS = {
+    'name': ['css', 'span.lPzHi'],
+    'price': ['css', 'div.GXS1X']
+}
+DETAIL_MENU_FIELDS = {
+    'name': ['css', 'div.MenuContent__tit__313LA'],
+    'price': ['css', 'div.MenuContent__price__lhCy9']
+}
+
 def random_sleep(base_time) :
     random_offset = round(random.uniform(-1.0,1.0),1)
     sleep_time = max(base_time + random_offset, 0.1)
@@ -66,7 +102,7 @@ def main_iframe(driver, wait) :
         logging.critical("메인 프레임 전환에 실패하였습니다")
         print(e)
 
-def menu_price(store, location, wait, dbm) :
+def menu_price(store, driver, location, wait, dbm) :
     """
     트랜잭션용 메뉴 저장 함수
     - DB 연결/종료를 하지 않음 (외부에서 관리)
@@ -106,11 +142,13 @@ def menu_price(store, location, wait, dbm) :
         try :
             # 모든 메뉴의 박스 찾기
             menu_data = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'li.E2jtL')))
-            # 각 박스를 하나씩 반복
-            for menu in menu_data :
-                # 각 데이터 찾아서 저장
-                menu_text = menu.find_element(By.CSS_SELECTOR, "span.lPzHi").get_attribute("innerText")
-                price_text = menu.find_element(By.CSS_SELECTOR,"div.GXS1X").get_attribute("innerText")
+            # 각 박스의 이름 / 가격을 한 번에 추출해서 하나씩 반복
+            for item in extract_fields(driver, menu_data, MENU_FIELDS) :
+                # 이름이나 가격이 없는 박스가 있으면 포장/배달 메뉴 구조로 처리
+                if item['name'] is None or item['price'] is None:
+                    raise ValueError("메뉴 이름 / 가격 객체를 찾지 못했습니다")
+                menu_text = item['name']
+                price_text = item['price']
                 
                 # 현재 세션 중복 체크
                 if menu_text in menu_list:
@@ -150,9 +188,11 @@ def menu_price(store, location, wait, dbm) :
             try :
                 # 포장 / 매장 메뉴의 객체 박스를 찾음
                 menu_data = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.MenuContent__info_detail__rCviz')))
-                for menu in menu_data :
-                    menu_text = menu.find_element(By.CSS_SELECTOR, "div.MenuContent__tit__313LA").get_attribute("innerText")
-                    price_text = menu.find_element(By.CSS_SELECTOR,"div.MenuContent__price__lhCy9").get_attribute("innerText")
+                for item in extract_fields(driver, menu_data, DETAIL_MENU_FIELDS) :
+                    if item['name'] is None or item['price'] is None:
+                        raise ValueError("상세 메뉴 이름 / 가격 객체를 찾지 못했습니다")
+                    menu_text = item['name']
+                    price_text = item['price']
                     
                     # 현재 세션 중복 체크
                     if menu_text in menu_list:
@@ -235,21 +275,42 @@ def find_img_address(store, location, wait, dbm) :
         print(e)
         return -1
 
-def find_review(store, driver, location, wait, dbm):
+def review_key(writer, date, content):
+    """리뷰 중복 판단 키 (uq_review_dedup와 같은 기준: 작성자, 날짜, 내용 SHA-256)"""
+    return (writer, str(date), hashlib.sha256(content.encode('utf-8')).hexdigest())
+
+def load_review_watermark(s_idx, dbm):
+    """
+    가게의 가장 최근 리뷰 날짜부터 WATERMARK_DAYS일 이내에 저장된 리뷰 키 set 반환
+    - 저장된 리뷰가 없으면 빈 set (처음부터 전부 수집)
+    """
+    sql = """
+        SELECT r_writer, r_date, r_content_hash
+        FROM review
+        WHERE s_idx = %s
+          AND r_date >= (SELECT DATE_SUB(MAX(r_date), INTERVAL %s DAY) FROM review WHERE s_idx = %s)
+    """
+    known = set()
+    if dbm.OpenSQL(sql, (s_idx, WATERMARK_DAYS, s_idx)):
+        for row in dbm.getAll() or []:
+            known.add((row['r_writer'], str(row['r_date']), row['r_content_hash']))
+        dbm.CloseSQL()
+    return known
+
+def find_review(store, driver, location, wait, dbm, incremental=INCREMENTAL):
     """
     트랜잭션용 리뷰 저장 함수
     - DB 연결/종료를 하지 않음 (외부에서 관리)
+    - incremental이면 최신순 목록에서 이미 저장된 리뷰가 나오는 페이지까지만 수집
     """
 
     # 리뷰 버튼 찾음
     review_xpath = "//span[text()='리뷰']"
     # 리뷰 최신순 버튼 찾음
     recent_xpath = "//a[text()='최신순']"
-    # 방문 횟수, 작성일 셀렉터
-    xpath_expression = ".//span[contains(text(), '번째')]"
-    date_xpath_expression = ".//span[contains(text(), '년')]"
-
     previous_review_count = 0
+    inserted_count = 0
+    duplicate_count = 0
     
     try :
         # s_idx 먼저 찾기
@@ -262,6 +323,11 @@ def find_review(store, driver, location, wait, dbm):
         if not s_idx:
             print("s_idx를 찾을 수 없어 리뷰 수집 중단")
             return -1
+
+        # 이미 저장된 최근 리뷰 (증분 수집 멈춤 기준)
+        known_reviews = load_review_watermark(s_idx, dbm) if incremental else set()
+        if known_reviews:
+            print(f"저장된 최근 리뷰 {len(known_reviews)}개 기준으로 새 리뷰만 수집합니다")
         
         try:
             # 리뷰 버튼을
@@ -283,30 +349,49 @@ def find_review(store, driver, location, wait, dbm):
             logging.critical("최신순 버튼을 찾지 못했습니다")
 
         # 스크롤 하면서 전체 리뷰 저장 시작 부분
-        Flag = True
-        while Flag :
-            Flag = scroll(driver, wait)
-            random_sleep(1)  # 페이지 로딩 대기
+        # (더보기를 누르기 전에 현재 페이지부터 확인해야 저장된 리뷰가 첫 페이지에 있을 때 바로 멈출 수 있음)
+        reached_known = False
+        while True :
             review_data = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'li.place_apply_pui')))
             new_reviews_to_collect = review_data[previous_review_count:]
             previous_review_count += len(new_reviews_to_collect)
-            for element in new_reviews_to_collect:
-                try:
-                    review_text = element.find_element(By.CSS_SELECTOR, "div.pui__vn15t2 > a").get_attribute("innerText")
-                    visit_count = element.find_element(By.XPATH, xpath_expression).get_attribute("innerText")
-                    review_date = element.find_element(By.XPATH, date_xpath_expression).get_attribute("innerText")
-                    review_writer = element.find_element(By.CSS_SELECTOR, "span.pui__NMi-Dp").get_attribute("innerText")
-
-                    # 개별 리뷰를 바로 DB에 저장
-                    if save_review_to_db(s_idx, store, review_text, visit_count, review_date, location, review_writer, dbm) == -1:
-                        return -1
 
+            # 이번 페이지 새 리뷰의 내용 / 방문 횟수 / 작성일 / 작성자를 한 번에 추출해서 모아서 저장
+            page_rows = []
+            for item in extract_fields(driver, new_reviews_to_collect, REVIEW_FIELDS):
+                missing = [name for name, value in item.items() if value is None]
+                if missing:
+                    logging.warning(f"개별 리뷰 추출 실패: {', '.join(missing)} 없음")
+                    continue
+                try:
+                    row = make_review_row(s_idx, item['text'], item['visit'], item['date'], location, item['writer'])
+                    if row:
+                        page_rows.append(row)
                 except Exception as e:
-                    logging.warning(f"개별 리뷰 추출 또는 저장 실패: {str(e)}")
+                    logging.warning(f"개별 리뷰 변환 실패: {str(e)}")
                     continue
 
-        print(f"총 {previous_review_count}개의 리뷰 수집 완료")
-        logging.info(f"총 {previous_review_count}개의 리뷰 수집 완료")
+            inserted = save_reviews_to_db(page_rows, dbm)
+            if inserted == -1:
+                print(f"리뷰 저장 실패: {store}")
+                return -1
+            inserted_count += inserted
+            duplicate_count += len(page_rows) - inserted
+
+            # 저장된 리뷰가 나왔으면 그 뒤는 예전 리뷰이므로 더보기 중단
+            if known_reviews and any(review_key(row[5], row[3], row[1]) in known_reviews for row in page_rows):
+                reached_known = True
+                print("저장된 리뷰에 도달해서 수집을 멈춥니다")
+                break
+
+            if not scroll(driver, wait):
+                break
+            random_sleep(1)  # 페이지 로딩 대기
+
+        if incremental and known_reviews and not reached_known:
+            logging.info(f"{store}: 저장된 리뷰를 찾지 못해서 전체 리뷰를 확인했습니다")
+        print(f"총 {previous_review_count}개의 리뷰 수집 완료 (새 리뷰 {inserted_count}개, 중복 {duplicate_count}개 건너뜀)")
+        logging.info(f"총 {previous_review_count}개의 리뷰 수집 완료 (새 리뷰 {inserted_count}개, 중복 {duplicate_count}개)")
         return True
     
     except Exception as e:
@@ -315,49 +400,46 @@ def find_review(store, driver, location, wait, dbm):
 
 
 
-def save_review_to_db(s_idx, store_name, review_text, visit_count, review_date, location, review_writer, dbm):
+def make_review_row(s_idx, review_text, visit_count, review_date, location, review_writer):
     """
-    트랜잭션용 개별 리뷰 저장 함수
-    - DB 연결/종료를 하지 않음 (외부에서 관리)
+    리뷰 하나를 review 테이블에 넣을 값 튜플로 변환
+    - 빈 리뷰는 None
     """
+    # 줄바꿈 제거 및 전처리
+    review_text = review_text.replace('\n', ' ').strip()
 
-    try:
-        # 줄바꿈 제거 및 전처리
-        review_text = review_text.replace('\n', ' ').strip()
-        
-        # 빈 리뷰는 저장 안 함
-        if not review_text or review_text == '':
-            return False
-        
-        # 날짜 형식 변환: "2025년 12월 11일 목요일" -> "2025-12-11"
-        formatted_date = convert_date_format(review_date)
-        
-        # 방문 횟수를 정수로 변환: "5번째 방문" -> 5
-        visit_count = extract_visit_number(visit_count)
+    # 빈 리뷰는 저장 안 함
+    if not review_text:
+        return None
 
-        # 중복 체크
-        sql = "SELECT 1 FROM review WHERE s_idx = %s AND r_content = %s AND r_date = %s AND r_writer = %s"
-        if dbm.CheckDuplicate(sql, (s_idx, review_text, formatted_date, review_writer)):
-            print(f"중복 리뷰 건너뜀: {store_name} - {formatted_date}")
-            return -1
-        
-        # DB에 Insert(추가) 할 SQL문
-        sql = """
-            INSERT INTO review (s_idx, r_content, r_visit_count, r_date, r_location, r_writer) 
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        
-        # DB에 저장
-        if dbm.RunSQL(sql, (s_idx, review_text, visit_count, formatted_date, location, review_writer)):
-            return True
-        else:
-            print(f"리뷰 저장 실패: {store_name}")
-            return False
-            
-    except Exception as e:
-        logging.error(f"리뷰 DB 저장 중 오류: {e}")
-        print(e)
-        return False
+    # 날짜 형식 변환: "2025년 12월 11일 목요일" -> "2025-12-11"
+    formatted_date = convert_date_format(review_date)
+
+    # 방문 횟수를 정수로 변환: "5번째 방문" -> 5
+    visit_count = extract_visit_number(visit_count)
+
+    return (s_idx, review_text, visit_count, formatted_date, location, review_writer)
+
+def save_reviews_to_db(rows, dbm):
+    """
+    트랜잭션용 리뷰 일괄 저장 함수
+    - DB 연결/종료, commit을 하지 않음 (외부에서 관리)
+    - uq_review_dedup(s_idx, r_writer, r_date, r_content_hash) 유니크 키로 이미 있는 리뷰는 INSERT IGNORE로 건너뜀
+      (리뷰마다 SELECT로 중복 확인하지 않음)
+    - 새로 저장한 리뷰 수, 실패하면 -1 반환
+    """
+    if not rows:
+        return 0
+
+    # pymysql은 INSERT ... VALUES 형식의 executemany를 여러 행 INSERT 한 번으로 보냄
+    sql = """
+        INSERT IGNORE INTO review (s_idx, r_content, r_visit_count, r_date, r_location, r_writer)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    inserted = dbm.ExecuteMany(sql, rows)
+    if inserted == -1:
+        logging.error(f"리뷰 일괄 저장 실패: {len(rows)}개")
+    return inserted
 
 def extract_visit_number(visit_str):
     """
@@ -450,8 +532,11 @@ def create_driver() :
     wait = WebDriverWait(driver, 10)
     return driver, wait
 
-def load_stores_from_db(target_location) :
-    """DB에서 특정 지역의 가게 목록을 가져옵니다"""
+def load_stores_from_db(target_location, refresh=REFRESH_MODE) :
+    """
+    DB에서 특정 지역의 가게 목록을 가져옵니다
+    - refresh면 이미 처리한 가게도 포함 (새 리뷰 갱신용)
+    """
     store_list = []
 
     try:
@@ -460,8 +545,10 @@ def load_stores_from_db(target_location) :
             print("DB 연결 실패")
             return []
         
-        # store 테이블에서 해당 지역의 가게 목록 조회 + 처리 건너뛴 가게만 처리하기 위한 후처리 (최신화 하려면, 뒷부분 제거)
-        sql = "SELECT s_name FROM store WHERE s_location = %s " + "AND s_img IS NULL"
+        # store 테이블에서 해당 지역의 가게 목록 조회 + 처리 건너뛴 가게만 처리하기 위한 후처리 (최신화는 refresh)
+        sql = "SELECT s_name FROM store WHERE s_location = %s "
+        if not refresh:
+            sql += "AND s_img IS NULL"
 
         if dbm.OpenSQL(sql, (target_location,)):
             total = dbm.getTotal()
@@ -526,12 +613,213 @@ def get_location() :
     return uni_list
 
 
+def open_location(driver, location) :
+    """네이버 지도를 지역 검색 화면으로 고정"""
+    driver.get(f"{NAVER_MAP_URL}{location}")
+
+def search_store(driver, wait, store) :
+    """검색바에 가게 이름을 입력하고 가게 상세 iframe으로 들어감"""
+    # 네이버지도 검색바 찾기
+    search = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'input.input_search')))
+    # 검색바 초기화
+    search.click()
+    search.send_keys(Keys.CONTROL + 'a')
+    search.send_keys(Keys.DELETE)
+
+    # 5초 잠시대기
+    time.sleep(1)
+    # 가게 이름 검색바에 입력 후 엔터
+    search.send_keys(store + Keys.ENTER)
+
+    print(f"{store}에 대해 수집을 시작합니다")
+
+    search_iframe(driver, wait, search)
+    logging.info(f"{store}에 대해 수집을 시작합니다")
+
+    main_iframe(driver, wait)
+
+    time.sleep(2)
+
+def crawl_store(driver, wait, store, location, dbm) :
+    """
+    가게 하나의 이미지/주소, 메뉴, 리뷰를 수집해서 한 트랜잭션으로 저장
+    - 성공하면 True, 실패해서 rollback하면 False
+    - 검색 단계의 TimeoutException은 그대로 올려서 호출한 쪽에서 드라이버를 다시 만들게 함
+    """
+    search_store(driver, wait, store)
+
+    # ========== 트랜잭션 시작 ==========
+    # DB 연결 (한 번만 열어서 트랜잭션으로 묶음)
+    if not dbm.DBOpen(host, id, pw, dbName, port):
+        print("DB 연결 실패")
+        return False
+
+    try:
+        # autocommit을 False로 설정 (수동 트랜잭션 모드)
+        # 이렇게 하면 명시적으로 commit()을 호출하기 전까지 DB에 반영 안됨
+        dbm.con.autocommit(False)
+
+        # 1. 이미지, 주소 저장
+        result1 = find_img_address(store, location, wait, dbm)
+        if result1 == -1:
+            # 함수가 실패하면 rollback하고 다음 가게로
+            print(f"[ROLLBACK] {store}: 이미지/주소 수집 실패")
+            dbm.con.rollback()
+            return False
+
+        # 2. 메뉴 가격 저장
+        result2 = menu_price(store, driver, location, wait, dbm)
+        if result2 == -1:
+            # 함수가 실패하면 rollback하고 다음 가게로
+            print(f"[ROLLBACK] {store}: 메뉴 수집 실패")
+            dbm.con.rollback()
+            return False
+
+        # 3. 리뷰 수집
+        result3 = find_review(store, driver, location, wait, dbm)
+        if result3 == -1:
+            # 함수가 실패하면 rollback하고 다음 가게로
+            print(f"[ROLLBACK] {store}: 리뷰 수집 실패")
+            dbm.con.rollback()
+            return False
+
+        # ========== 세 함수 모두 성공했을 때만 commit ==========
+        dbm.con.commit()
+        print(f"[COMMIT] {store}: 모든 데이터 저장 완료 ✓")
+        logging.info(f"[COMMIT] {store}: 트랜잭션 성공")
+        return True
+
+    except Exception as e:
+        # 예상치 못한 오류 발생시 rollback
+        print(f"[ROLLBACK] {store}: 예상치 못한 오류 - {e}")
+        logging.error(f"트랜잭션 오류: {store} - {e}")
+        dbm.con.rollback()
+        return False
+
+    finally:
+        # 트랜잭션이 끝나면 반드시 DB 연결 종료
+        dbm.DBClose()
+
+def restart_driver(driver, location) :
+    """타임아웃 후 드라이버를 다시 만들고 지역 검색 화면으로 이동"""
+    try:
+        driver.quit()
+    except:
+        pass
+    driver, wait = create_driver()
+    open_location(driver, location)
+    time.sleep(2)  # 페이지 로딩 대기
+    return driver, wait
+
+class ReviewJobRunner:
+    """
+    (지역, 가게) 작업 처리: 가게 상세 정보 / 메뉴 / 리뷰 수집
+    main / crawl_from_queue / crawl_scheduler.py 워커가 같이 사용
+    - 타임아웃이 나면 드라이버를 다시 만들고, 가게 RESTART_EVERY개마다 드라이버를 새로 만듦
+    """
+    def __init__(self, worker_id=0):
+        self.worker_id = worker_id
+        self.dbm = DBManager()  # 작업 전용 DB 연결 (가게마다 열고 닫음)
+        self.driver, self.wait = create_driver()
+        self.location = None
+        self.done = 0
+        self.last_error = None
+
+    def run(self, job):
+        """job = (지역, 가게), 결과 'ok' / 'rollback' / 'timeout' / 'error' 반환 (실패 이유는 last_error)"""
+        location, store = job
+        self.last_error = None
+        try:
+            if location != self.location:
+                # 우선 네이버 지도를 **대 로 화면 고정
+                open_location(self.driver, location)
+                self.location = location
+            if crawl_store(self.driver, self.wait, store, location, self.dbm):
+                return 'ok'
+            self.last_error = '수집 실패 (rollback)'
+            return 'rollback'
+
+        except TimeoutException as e:
+            logging.critical(f"[worker {self.worker_id}] 타임아웃 오류 발생: {store} - {str(e)}")
+            print(f"⏱️ [worker {self.worker_id}] {store} 타임아웃으로 건너뜀")
+            self.last_error = f"timeout: {e}"
+            self.restart()
+            return 'timeout'
+
+        except Exception as x:
+            error_msg = str(x)
+            print(f"[worker {self.worker_id}] {store} 수집 오류: {error_msg}")
+            self.last_error = error_msg
+            if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
+                logging.critical(f"[worker {self.worker_id}] 네트워크 타임아웃 오류: {store}")
+                self.restart()
+                return 'timeout'
+            return 'error'
+
+        finally:
+            self.done += 1
+            # 항상 기본 프레임으로 복귀
+            try:
+                self.driver.switch_to.default_content()
+            except:
+                pass
+            if RESTART_EVERY and self.done % RESTART_EVERY == 0:
+                self.restart()
+
+    def run_job(self, job):
+        """crawl_queue.run_jobs용: crawl_job 행을 처리하고 성공하면 None, 실패하면 오류 메시지"""
+        status = self.run((job['j_location'], job['j_store']))
+        return None if status == 'ok' else self.last_error or status
+
+    def restart(self):
+        self.driver, self.wait = restart_driver(self.driver, self.location or '')
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except:
+            pass
+
+def crawl_from_queue(locations, refresh=REFRESH_MODE, worker_id=None) :
+    """
+    지역들의 가게를 crawl_job에 넣고, 작업 큐에서 가게를 하나씩 임대해서 수집
+    - 실패한 가게는 잠시 뒤 다시 시도하고, crawl_queue.MAX_ATTEMPTS번 실패하면 건너뜀
+    """
+    queue_dbm = DBManager()  # 작업 큐 전용 연결 (가게 트랜잭션과 따로 commit)
+    if not queue_dbm.DBOpen(host, id, pw, dbName, port):
+        print("DB 연결 실패")
+        return None
+
+    runner = None
+    try:
+        crawl_queue.ensure_table(queue_dbm)
+        for location in locations:
+            stores = load_stores_from_db(location, refresh)
+            count = crawl_queue.enqueue(queue_dbm, 'reviews', [(location, store) for store in stores], requeue_done=refresh)
+            print(f"{location}: 작업 큐에 가게 {len(stores)}개 등록 (새로 추가 / 갱신 {count}개)")
+
+        runner = ReviewJobRunner()
+        summary = crawl_queue.run_jobs(queue_dbm, 'reviews', runner.run_job, worker_id)
+        print(f"\n작업 큐 처리 결과: {summary}")
+        return summary
+
+    finally:
+        if runner is not None:
+            runner.close()
+        queue_dbm.DBClose()
+
 def main() :
     # 전체 리뷰 수집 get_location() / 원하는 대학교만 골라서 수집 ['연세대', '고려대', '성균관대']
+    # (여러 브라우저로 나눠서 수집하려면 crawl_scheduler.py)
     uni_list = ['서울대 입구역', '전북대', '부산대', '충남대', '충북대', '강원대', '경북대', '경상국립대', '전남대', '제주대']
 
+    if USE_JOB_QUEUE:
+        crawl_from_queue(uni_list)
+        print("\n모든 수집 작업 완료!")
+        return
+
     # 드라이버 생성
-    driver, wait = create_driver()
+    runner = ReviewJobRunner()
 
     try :
         for location in uni_list :
@@ -542,127 +830,16 @@ def main() :
                 print("수집할 가게가 없습니다.")
                 continue
 
-            # driver 생성
-            # 우선 네이버 지도를 **대 로 화면 고정
-            url = f"https://map.naver.com/p/search/{location}"
-            driver.get(url)
-
             for idx, store in enumerate(store_list, 1):
                 print(f"\n진행률: {idx}/{len(store_list)} ({idx/len(store_list)*100:.1f}%)")
                 logging.info(f"진행률: {idx}/{len(store_list)}")
-                
-                try :
-                    # 네이버지도 검색바 찾기
-                    search = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'input.input_search')))
-                    # 검색바 초기화
-                    search.click()
-                    search.send_keys(Keys.CONTROL + 'a')
-                    search.send_keys(Keys.DELETE)
-
-                    # 5초 잠시대기
-                    time.sleep(1)
-                    # 가게 이름 검색바에 입력 후 엔터
-                    search.send_keys(store + Keys.ENTER)
-
-                    print(f"{store}에 대해 수집을 시작합니다")
-                    
-                    search_iframe(driver, wait, search)
-                    logging.info(f"{store}에 대해 수집을 시작합니다")
-
-                    main_iframe(driver, wait)
-                    
-                    time.sleep(2)
-                    
-                    # ========== 트랜잭션 시작 ==========
-                    # DB 연결 (한 번만 열어서 트랜잭션으로 묶음)
-                    if not dbm.DBOpen(host, id, pw, dbName, port):
-                        print("DB 연결 실패")
-                        continue
-
-                    try:
-                        # autocommit을 False로 설정 (수동 트랜잭션 모드)
-                        # 이렇게 하면 명시적으로 commit()을 호출하기 전까지 DB에 반영 안됨
-                        dbm.con.autocommit(False)
-
-                        # 1. 이미지, 주소 저장
-                        result1 = find_img_address(store, location, wait, dbm)
-                        if result1 == -1:
-                            # 함수가 실패하면 rollback하고 다음 가게로
-                            print(f"[ROLLBACK] {store}: 이미지/주소 수집 실패")
-                            dbm.con.rollback()
-                            dbm.DBClose()
-                            continue
-                        
-                        # 2. 메뉴 가격 저장
-                        result2 = menu_price(store, location, wait, dbm)
-                        if result2 == -1:
-                            # 함수가 실패하면 rollback하고 다음 가게로
-                            print(f"[ROLLBACK] {store}: 메뉴 수집 실패")
-                            dbm.con.rollback()
-                            dbm.DBClose()
-                            continue
-                        
-                        # 3. 리뷰 수집
-                        result3 = find_review(store, driver, location, wait, dbm)
-                        if result3 == -1:
-                            # 함수가 실패하면 rollback하고 다음 가게로
-                            print(f"[ROLLBACK] {store}: 리뷰 수집 실패")
-                            dbm.con.rollback()
-                            dbm.DBClose()
-                            continue
-                        
-                        # ========== 세 함수 모두 성공했을 때만 commit ==========
-                        dbm.con.commit()
-                        print(f"[COMMIT] {store}: 모든 데이터 저장 완료 ✓")
-                        logging.info(f"[COMMIT] {store}: 트랜잭션 성공")
-
-                    except Exception as e:
-                        # 예상치 못한 오류 발생시 rollback
-                        print(f"[ROLLBACK] {store}: 예상치 못한 오류 - {e}")
-                        logging.error(f"트랜잭션 오류: {store} - {e}")
-                        dbm.con.rollback()
-                        
-                    finally:
-                        # 트랜잭션이 끝나면 반드시 DB 연결 종료
-                        dbm.DBClose()
-
-                except TimeoutException as e:
-                    logging.critical(f"타임아웃 오류 발생: {store} - {str(e)}")
-                    print(f"⏱️ {store} 타임아웃으로 건너뜀")
-                    # 드라이버 재생성 추가
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                    driver, wait = create_driver()
-                    url = f"https://map.naver.com/p/search/{location}"
-                    driver.get(url)
-                    time.sleep(2)
-                    
-                except Exception as x:
-                    error_msg = str(x)
-                    if 'timeout' in error_msg.lower() or 'timed out' in error_msg.lower():
-                        logging.critical(f"네트워크 타임아웃 오류: {store}")
-                        print(f"⏱️ {store} 네트워크 타임아웃으로 건너뜀")
-                        driver.quit()
-                        driver, wait = create_driver()
-                        # 추가: 네이버 지도로 다시 이동
-                        url = f"https://map.naver.com/p/search/{location}"
-                        driver.get(url)
-                        time.sleep(2)  # 페이지 로딩 대기
-                    
-                finally:
-                    # 항상 기본 프레임으로 복귀
-                    try:
-                        driver.switch_to.default_content()
-                    except:
-                        pass
+                runner.run((location, store))
 
             print(f"\n{location} 지역 수집 완료!")
             
     finally:
-        driver.quit()
+        runner.close()
         print("\n모든 수집 작업 완료!")
 
 if __name__ == "__main__" :
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,53 @@
+import logging
+from selenium.webdriver.common.by import By
+
+# ---------------------------------------------------------
+# 목록 항목 값 추출 (naver_review.py / store_list.py 공용)
+# - 페이지의 모든 항목 값을 execute_script 한 번으로 가져옴
+# - 스크립트가 실패하면 항목마다 find_element로 가져옴
+# ---------------------------------------------------------
+
+# True면 목록의 모든 항목 값을 execute_script 한 번으로 가져옴
+# (False면 항목마다 find_element + get_attribute로 chromedriver를 여러 번 호출)
+USE_JS_EXTRACT = True
+
+# elements 각각에서 fields({이름: ['css' 또는 'xpath', 셀렉터]})의 innerText를 꺼내서 dict 리스트로 반환
+FIELDS_EXTRACT_JS = """
+const [items, fields] = arguments;
+const read = (el, [kind, selector]) => {
+    const node = kind === 'xpath'
+        ? document.evaluate(selector, el, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : el.querySelector(selector);
+    return node ? node.innerText : null;
+};
+return items.map(el => Object.fromEntries(Object.entries(fields).map(([name, spec]) => [name, read(el, spec)])));
+"""
+
+def extract_fields(driver, elements, fields):
+    """
+    elements마다 fields 값(innerText)을 추출해서 dict 리스트로 반환, 없는 값은 None
+    - USE_JS_EXTRACT면 execute_script 한 번으로 전체 추출
+    - 스크립트가 실패하면 요소마다 find_element로 추출
+    """
+    if not elements:
+        return []
+    if USE_JS_EXTRACT and driver is not None:
+        try:
+            records = driver.execute_script(FIELDS_EXTRACT_JS, list(elements), fields)
+            if isinstance(records, list) and len(records) == len(elements):
+                return records
+            logging.warning("execute_script 추출 결과 개수가 맞지 않아 요소별로 추출합니다")
+        except Exception as e:
+            logging.warning(f"execute_script 추출 실패, 요소별로 추출합니다: {e}")
+
+    records = []
+    for element in elements:
+        record = {}
+        for name, (kind, selector) in fields.items():
+            try:
+                by = By.XPATH if kind == 'xpath' else By.CSS_SELECTOR
+                record[name] = element.find_element(by, selector).get_attribute("innerText")
+            except Exception:
+                record[name] = None
+        records.append(record)
+    return records
@@ -1,14 +1,17 @@
 import os
 from DBManager import DBManager
+from page_extract import extract_fields
 import pandas as pd
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 import time
 import random
 from dotenv import load_dotenv
+import crawl_queue
 load_dotenv()
 
 dbm = DBManager()
@@ -17,6 +20,17 @@ port = int(os.environ.get('port', 3306))
 id = os.environ.get('user')
 pw = os.environ.get('passwd')
 dbName = os.environ.get('dbname')
+# 네이버 지도 검색 주소 (테스트할 때는 로컬 가짜 페이지 주소로 바꿀 수 있음)
+NAVER_MAP_URL = os.environ.get('NAVER_MAP_URL', 'https://map.naver.com/p/search/')
+
+# True면 지역을 DB 작업 큐(crawl_job)에 넣고 임대해서 처리 (이미 끝난 지역은 건너뛰고, 실패하면 나중에 다시 시도)
+USE_JOB_QUEUE = False
+
+# 가게 항목(li.UEzoS)에서 가져올 값
+STORE_FIELDS = {
+    'name': ['css', 'span.TYaxT'],
+    'thema': ['css', 'span.KCMnt']
+}
 
 def random_sleep(base_time) :
     random_offset = round(random.uniform(-1.0,1.0),1)
@@ -24,9 +38,12 @@ def random_sleep(base_time) :
     time.sleep(sleep_time)
 
 def find_store(driver, wait, location) :
-
+    """
+    검색 결과의 모든 페이지에서 가게 이름과 테마를 추출해서 저장합니다.
+    - 1페이지에서 가게 리스트를 못 찾거나 저장에 실패한 페이지가 있으면 False
+    """
     current_page = 1
-    """단일 가게 요소를 받아서 이름과 테마를 추출하여 리스트에 추가합니다."""
+    saved_all = True
     while True :
         print(f"{current_page}페이지 수집 중")
 
@@ -42,20 +59,16 @@ def find_store(driver, wait, location) :
             store_list = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.UEzoS")))
         except:
             print(f"{current_page}페이지에서 가게 리스트를 찾지 못했습니다.")
+            if current_page == 1:
+                return False
             break
 
-        # 데이터 추출
-        for store in store_list:
+        # 데이터 추출 (페이지의 가게 이름 / 테마를 한 번에)
+        for store in extract_fields(driver, store_list, STORE_FIELDS):
             try :
-                try: # 이름 추출
-                    name = store.find_element(By.CSS_SELECTOR, "span.TYaxT").get_attribute("innerText")
-                except:
-                    name = "Null"
-                
-                try: # 테마(카테고리) 추출
-                    thema = store.find_element(By.CSS_SELECTOR, "span.KCMnt").get_attribute("innerText")
-                except:
-                    thema = "Null"
+                # 이름 / 테마(카테고리)가 없으면 "Null"
+                name = store['name'] if store['name'] is not None else "Null"
+                thema = store['thema'] if store['thema'] is not None else "Null"
                 
                 # 이름과 테마를 세트로 묶어서 저장 (데이터 밀림 현상 방지)
                 if name != "Null": # name 값이 존재하면
@@ -70,8 +83,11 @@ def find_store(driver, wait, location) :
             
         # DB 저장 함수 호출
         if store_data:
-            save_to_db(store_data)
-            print(f"{current_page}페이지: {len(store_data)}개 데이터 처리 완료")
+            if save_to_db(store_data):
+                print(f"{current_page}페이지: {len(store_data)}개 데이터 처리 완료")
+            else:
+                print(f"{current_page}페이지: 저장 실패")
+                saved_all = False
         else:
             print(f"{current_page}페이지: 수집된 데이터가 없습니다.")
 
@@ -85,15 +101,16 @@ def find_store(driver, wait, location) :
         random_sleep(2.5)
         current_page += 1
 
+    return saved_all
 
 def save_to_db(store_data) :
-    # 인자를 딕셔너리 리스트 하나로 받아옴
-    try :
-        # DB 오픈
-        if not dbm.DBOpen(host, id, pw, dbName, port):
-            print("DB 연결에 실패했습니다.")
-            return
+    # 인자를 딕셔너리 리스트 하나로 받아옴, 저장(또는 전부 중복)이면 True / 실패하면 False
+    # DB 오픈
+    if not dbm.DBOpen(host, id, pw, dbName, port):
+        print("DB 연결에 실패했습니다.")
+        return False
 
+    try :
         # 중복이 아닌 데이터만 모을 리스트
         new_names = []
         new_themas = []
@@ -142,11 +159,14 @@ def save_to_db(store_data) :
                 print(f"{len(new_names)}건의 신규 가게 저장 성공")
             else:
                 print("데이터 프레임 저장 실패")
+                return False
         else:
             print("모든 데이터가 중복이어서 저장하지 않았습니다.")
+        return True
 
     except Exception as e :
         print(f"DB 저장 중 오류 발생: {e}")
+        return False
 
     finally:
         # 함수 종료 시 무조건 DB 닫기
@@ -213,29 +233,106 @@ def create_driver() :
     return driver, wait
 
 
+def collect_location(driver, wait, lc) :
+    """'{지역} 음식점' 검색 결과의 모든 페이지에서 가게 목록을 수집해서 저장, 실패하면 False"""
+    place = f"{lc} 음식점"
+    location = f"{lc}"
+
+    url = f"{NAVER_MAP_URL}{place}"
+    driver.get(url)
+    iframe = wait.until(EC.presence_of_element_located((By.ID, 'searchIframe')))
+    driver.switch_to.frame(iframe)
+    return find_store(driver, wait, location)
+
+class StoreJobRunner:
+    """
+    지역 작업 처리: '{지역} 음식점' 검색 결과의 가게 목록 수집
+    main / collect_from_queue / crawl_scheduler.py 워커가 같이 사용
+    """
+    def __init__(self, worker_id=0):
+        self.worker_id = worker_id
+        self.driver, self.wait = create_driver()
+        self.last_error = None
+
+    def run(self, location):
+        """결과 'ok' / 'error' / 'timeout' 반환 (실패 이유는 last_error)"""
+        self.last_error = None
+        try:
+            if collect_location(self.driver, self.wait, location):
+                return 'ok'
+            self.last_error = '가게 리스트를 찾지 못했거나 저장에 실패했습니다'
+            return 'error'
+        except TimeoutException as e:
+            print(f"⏱️ [worker {self.worker_id}] {location} 가게 목록 타임아웃")
+            self.last_error = f"timeout: {e}"
+            self.restart()
+            return 'timeout'
+        except Exception as e:
+            print(f"[worker {self.worker_id}] {location} 가게 목록 수집 오류: {e}")
+            self.last_error = str(e)
+            return 'error'
+        finally:
+            try:
+                self.driver.switch_to.default_content()
+            except:
+                pass
+
+    def run_job(self, job):
+        """crawl_queue.run_jobs용: crawl_job 행을 처리하고 성공하면 None, 실패하면 오류 메시지"""
+        status = self.run(job['j_location'])
+        return None if status == 'ok' else self.last_error or status
+
+    def restart(self):
+        self.close()
+        self.driver, self.wait = create_driver()
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except:
+            pass
+
+def collect_from_queue(locations, worker_id=None) :
+    """지역들을 crawl_job에 넣고 작업 큐에서 하나씩 임대해서 가게 목록 수집"""
+    queue_dbm = DBManager()  # 작업 큐 전용 연결
+    if not queue_dbm.DBOpen(host, id, pw, dbName, port):
+        print("DB 연결 실패")
+        return None
+
+    runner = None
+    try:
+        crawl_queue.ensure_table(queue_dbm)
+        crawl_queue.enqueue(queue_dbm, 'stores', [(location, '') for location in locations])
+        runner = StoreJobRunner()
+        summary = crawl_queue.run_jobs(queue_dbm, 'stores', runner.run_job, worker_id)
+        print(f"작업 큐 처리 결과: {summary}")
+        return summary
+
+    finally:
+        if runner is not None:
+            runner.close()
+        queue_dbm.DBClose()
+
 def main() :
     #######################################################
     lc = "제주대"
+    # (여러 지역을 브라우저 여러 개로 나눠서 수집하려면 crawl_scheduler.py --stage stores)
     #######################################################
 
-    place = f"{lc} 음식점"
-    location = f"{lc}"
+    if USE_JOB_QUEUE:
+        collect_from_queue([lc])
+        return
 
-    driver, wait = create_driver()
+    runner = StoreJobRunner()
 
     # 에러 발생 시에도 브라우저 종료
     try:
-        url = f"https://map.naver.com/p/search/{place}"
-        driver.get(url)
-        iframe = wait.until(EC.presence_of_element_located((By.ID, 'searchIframe')))
-        driver.switch_to.frame(iframe)
-        find_store(driver, wait, location)
-    except Exception as e:
-        print(f"메인 실행 중 오류 발생: {e}")
+        if runner.run(lc) != 'ok':
+            print(f"메인 실행 중 오류 발생: {runner.last_error}")
     finally:
         # 프로그램 종료 시 드라이버 메모리 해제
-        driver.quit() 
+        runner.close()
         print("드라이버를 종료합니다.")
 
 if __name__ == "__main__" :
-    main()
\ No newline at end of file
+    main()
@@ -1,13 +1,208 @@
 # .py들과 DBMS를 연결해줄 클래스 작성
+import os, time, threading, collections
 import pymysql, pymysql.cursors, pandas as pd
+
+def _env_number(name, default) :
+    """환경 변수 값을 숫자로 읽고, 없거나 잘못된 값이면 기본값을 사용"""
+    try :
+        return type(default)(os.environ.get(name, default))
+    except (TypeError, ValueError) :
+        return default
+
+class ConnectionPool :
+    """
+    스레드 안전한 pymysql 커넥션 풀
+    - min_size    : 풀이 유지하는 최소 커넥션 수 (처음 만들 때 미리 연결)
+    - max_size    : 동시에 열 수 있는 최대 커넥션 수 (대여 중 + 대기 중)
+    - idle_timeout: 이 시간(초) 이상 놀고 있던 커넥션은 닫음 (min_size까지는 유지)
+    - max_lifetime: 이 시간(초) 이상 지난 커넥션은 재사용하지 않고 닫음
+    - ping_interval: 마지막 사용 후 이 시간(초)이 지난 커넥션은 대여 전에 ping으로 상태 확인
+    - checkout_timeout: 풀이 가득 찼을 때 반납을 기다리는 최대 시간(초)
+    """
+    def __init__(self, connect_kwargs, min_size=1, max_size=10, idle_timeout=300,
+                 max_lifetime=3600, ping_interval=5, checkout_timeout=10) :
+        self.connect_kwargs   = connect_kwargs
+        self.min_size         = max(0, min_size)
+        self.max_size         = max(1, max_size, self.min_size)
+        self.idle_timeout     = idle_timeout
+        self.max_lifetime     = max_lifetime
+        self.ping_interval    = ping_interval
+        self.checkout_timeout = checkout_timeout
+
+        # 대기 중인 커넥션 : (커넥션, 생성 시각, 마지막 사용 시각)
+        self._idle    = collections.deque()
+        # 커넥션별 생성 시각 (대여 중인 커넥션의 수명 계산용)
+        self._born    = {}
+        # 현재 열려 있는 커넥션 수 (대여 중 + 대기 중)
+        self._size    = 0
+        self._cond    = threading.Condition()
+
+        # 최소 개수만큼 미리 연결 (실패해도 요청 시점에 다시 시도)
+        for _ in range(self.min_size) :
+            try :
+                con = self._connect()
+            except Exception as e :
+                print(f"커넥션 풀 초기 연결 실패: {e}")
+                break
+            with self._cond :
+                self._size += 1
+                self._idle.append((con, self._born[con], time.monotonic()))
+
+    def _connect(self) :
+        con = pymysql.connect(**self.connect_kwargs)
+        self._born[con] = time.monotonic()
+        return con
+
+    def _discard(self, con) :
+        # 커넥션을 풀에서 완전히 제거 (lock 밖에서 호출)
+        self._born.pop(con, None)
+        try :
+            con.close()
+        except Exception :
+            pass
+
+    def _evict_idle(self, now) :
+        # idle_timeout / max_lifetime이 지난 대기 커넥션 정리 (lock 안에서 호출)
+        expired = []
+        kept    = collections.deque()
+        for entry in self._idle :
+            con, born, last_used = entry
+            too_old  = now - born >= self.max_lifetime
+            too_idle = now - last_used >= self.idle_timeout
+            if too_old or (too_idle and self._size - len(expired) > self.min_size) :
+                expired.append(con)
+            else :
+                kept.append(entry)
+        self._idle  = kept
+        self._size -= len(expired)
+        return expired
+
+    def acquire(self) :
+        """커넥션 하나를 빌려옴 (없으면 새로 만들고, 가득 찼으면 반납을 기다림)"""
+        deadline = time.monotonic() + self.checkout_timeout
+        while True :
+            entry   = None
+            # 정리한 커넥션은 _size에서 이미 빠졌으므로, 대기 시간 초과로 나가더라도 반드시 닫음
+            expired = []
+            try :
+                with self._cond :
+                    while True :
+                        evicted = self._evict_idle(time.monotonic())
+                        if evicted :
+                            expired.extend(evicted)
+                            self._cond.notify_all()
+                        if self._idle :
+                            # 가장 최근에 반납된 커넥션부터 사용 (LIFO)
+                            entry = self._idle.pop()
+                            break
+                        if self._size < self.max_size :
+                            self._size += 1
+                            break
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 :
+                            raise TimeoutError(f"커넥션 풀 대기 시간 초과 (max_size={self.max_size})")
+                        self._cond.wait(remaining)
+            finally :
+                for con in expired :
+                    self._discard(con)
+
+            # 대기 커넥션이 없어서 자리만 예약한 경우 -> 새 연결
+            if entry is None :
+                try :
+                    return self._connect()
+                except Exception :
+                    with self._cond :
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            # 대여 전 health check : 오래 놀던 커넥션만 ping (끊긴 커넥션이면 버리고 다시 시도)
+            con, born, last_used = entry
+            if time.monotonic() - last_used < self.ping_interval :
+                return con
+            try :
+                con.ping(reconnect=False)
+                return con
+            except Exception :
+                with self._cond :
+                    self._size -= 1
+                    self._cond.notify()
+                self._discard(con)
+
+    def release(self, con) :
+        """빌려간 커넥션을 반납 (열린 트랜잭션은 rollback 후 재사용)"""
+        born = self._born.get(con)
+        healthy = born is not None and con.open
+        if healthy :
+            try :
+                # 커밋하지 않은 작업 / SELECT 스냅샷이 다음 사용자에게 넘어가지 않도록 정리
+                con.rollback()
+            except Exception :
+                healthy = False
+        now = time.monotonic()
+        with self._cond :
+            if healthy and now - born < self.max_lifetime :
+                self._idle.append((con, born, now))
+                con = None
+            else :
+                self._size -= 1
+            self._cond.notify()
+        if con is not None :
+            self._discard(con)
+
+    def close(self) :
+        """대기 중인 커넥션을 모두 닫음 (대여 중인 커넥션은 반납될 때 정리됨)"""
+        with self._cond :
+            idle, self._idle = self._idle, collections.deque()
+            self._size -= len(idle)
+            self.max_lifetime = 0
+            self._cond.notify_all()
+        for con, _, _ in idle :
+            self._discard(con)
+
+# 접속 정보별로 풀을 하나씩 공유
+_pools      = {}
+_pools_lock = threading.Lock()
+
+def get_pool(host, id, pw, dbName, port=3306) :
+    """접속 정보에 해당하는 커넥션 풀을 반환 (없으면 환경 변수 설정으로 생성)"""
+    key = (host, id, pw, dbName, int(port))
+    with _pools_lock :
+        pool = _pools.get(key)
+        if pool is None :
+            pool = ConnectionPool(
+                dict(host = host,
+                     db = dbName,
+                     user = id,
+                     password = pw,
+                     port = int(port),
+                     charset = 'utf8mb4',
+                     cursorclass = pymysql.cursors.DictCursor),
+                min_size         = _env_number('DB_POOL_MIN_SIZE', 1),
+                max_size         = _env_number('DB_POOL_MAX_SIZE', 10),
+                idle_timeout     = _env_number('DB_POOL_IDLE_TIMEOUT', 300.0),
+                max_lifetime     = _env_number('DB_POOL_MAX_LIFETIME', 3600.0),
+                ping_interval    = _env_number('DB_POOL_PING_INTERVAL', 5.0),
+                checkout_timeout = _env_number('DB_POOL_CHECKOUT_TIMEOUT', 10.0))
+            _pools[key] = pool
+        return pool
+
 class DBManager :
     # 생성자
     def __init__(self):
         self.con    = None
         self.cursor = None
+        self.datas  = None
+        self._pool  = None
     # DBMS 연결 메소드
-    def DBOpen(self, host, id, pw, dbName, port=3306):
+    # 기본적으로 커넥션 풀에서 커넥션을 빌려옴 (use_pool=False면 매번 새로 연결)
+    def DBOpen(self, host, id, pw, dbName, port=3306, use_pool=True):
         try:
+            if use_pool :
+                self._pool = get_pool(host, id, pw, dbName, port)
+                self.con = self._pool.acquire()
+                return True
+            self._pool = None
             self.con = pymysql.connect(
                 host = host,
                 db = dbName,
@@ -21,8 +216,15 @@ class DBManager :
             print(e)
             return False
     # DBMS 연결을 종료하는 메소드
+    # 풀에서 빌려온 커넥션은 닫지 않고 풀에 반납
     def DBClose(self) :
-        self.con.close()
+        if self.con is None :
+            return
+        if self._pool is not None :
+            self._pool.release(self.con)
+        else :
+            self.con.close()
+        self.con = None
     
     # sql문 작성 -> 실행 -> 트랜잭션  O / X
     # select -> fetchone() / fetchall()
@@ -1,11 +1,13 @@
 # Flask 라이브러리에서 필요한 기능들을 가져옵니다
-from flask import Flask, render_template, request, redirect, session, jsonify
+from flask import Flask, render_template, request, redirect, session, jsonify, g
 import random
 import gemini_api
 import service
 import user_service
 import random
 import reco_based_on_weather
+import weather_prefetcher
+import local_emotion
 import os
 from DBManager import DBManager
 # ======================
@@ -104,7 +106,8 @@ def main_list():
     emotion = None
     if request.method == 'POST':
         emotion_text = request.form.get('selection')
-        emotion = gemini_api.emotion_analyze(emotion_text)
+        # 로컬 모델로 먼저 분류하고, 확신도가 낮으면 Gemini로 분석
+        emotion = local_emotion.analyze(emotion_text) or gemini_api.emotion_analyze(emotion_text)
         if emotion is None or emotion == '기':
             # 에러 메시지를 쿼리 파라미터로 전달하면서 index로 리다이렉트
             return redirect('/?error=emotion_analysis_failed')
@@ -379,15 +382,24 @@ def weather_result():
             return render_template('weather_result.html',
                                  error="해당 대학의 위치 정보를 찾을 수 없습니다.")
 
-        # OpenWeather API로 실시간 날씨 조회
-        weather_data = reco_based_on_weather.get_weather_by_university(university)
+        if weather_prefetcher.is_running():
+            # 백그라운드에서 미리 만들어 둔 날씨 + 추천 결과만 읽음 (외부 API 호출 없음)
+            snapshot = weather_prefetcher.get_snapshot(university)
+            if snapshot is None:
+                return render_template('weather_result.html',
+                                    error="날씨 정보를 준비 중입니다. 잠시 후 다시 시도해주세요.")
+            weather_data = snapshot['weather']
+            recommendation = snapshot['recommendation']
+        else:
+            # OpenWeather API로 실시간 날씨 조회 (캐시 사용)
+            weather_data = reco_based_on_weather.get_weather_by_university(university)
 
-        if not weather_data.get('success'):
-            return render_template('weather_result.html',
-                                error=weather_data.get('error', '날씨 정보를 가져올 수 없습니다.'))
+            if not weather_data.get('success'):
+                return render_template('weather_result.html',
+                                    error=weather_data.get('error', '날씨 정보를 가져올 수 없습니다.'))
 
-        # Rule-Based 음식 카테고리 추천 (우선순위 순으로 정렬)
-        recommendation = reco_based_on_weather.get_food_recommendation_by_weather(weather_data)
+            # Rule-Based 음식 카테고리 추천 (우선순위 순으로 정렬)
+            recommendation = reco_based_on_weather.get_food_recommendation_by_weather(weather_data)
 
         # 음식 추천 실패 시 에러 처리
         if not recommendation.get('success'):
@@ -417,19 +429,54 @@ def weather_result():
                             error="처리 중 오류가 발생했습니다. 다시 시도해주세요.")
 
 
+@app.route('/api/weather/metrics')
+def weather_metrics_api():
+    """날씨 프리페처의 갱신 소요 시간, 대학별 데이터 경과 시간을 JSON으로 반환"""
+    return jsonify(weather_prefetcher.metrics())
+
+
+@app.route('/api/cache/metrics')
+def cache_metrics_api():
+    """Gemini 호출 캐시(감정 분석, 운세)의 크기와 hit / miss 수를 JSON으로 반환"""
+    return jsonify({
+        "emotion": gemini_api.emotion_cache_stats(),
+        "fortune": gemini_api.fortune_cache.stats(),
+        "local_emotion": local_emotion.stats()
+    })
+
+
 # ==========================================
 # Flask 앱 실행
 # ==========================================
 
 # ================= DB 초기화 =================
-dbm = DBManager()
-
 host = os.environ.get('host')
 port = int(os.environ.get('port', 3306))
 id = os.environ.get('user')
 pw = os.environ.get('passwd')
 dbName = os.environ.get('dbname')
 
+def get_db():
+    """
+    요청(app context)마다 DBManager를 하나씩 만들어 g에 보관
+    - 같은 요청 안에서는 같은 커넥션을 재사용
+    - 요청이 끝나면 close_db에서 커넥션을 풀에 반납
+    - 여러 스레드가 동시에 요청을 처리해도 커서/조회 결과가 섞이지 않음
+    연결에 실패하면 None 반환
+    """
+    if 'dbm' not in g:
+        dbm = DBManager()
+        if not dbm.DBOpen(host, id, pw, dbName, port):
+            return None
+        g.dbm = dbm
+    return g.dbm
+
+@app.teardown_appcontext
+def close_db(exception):
+    dbm = g.pop('dbm', None)
+    if dbm is not None:
+        dbm.DBClose()
+
 
 @app.route("/login")
 def login_page():
@@ -462,7 +509,8 @@ def get_user_profile():
 
     user_idx = session.get('user_idx')
 
-    if not dbm.DBOpen(host, id, pw, dbName):
+    dbm = get_db()
+    if dbm is None:
         return jsonify({"success": False, "message": "DB 연결 실패"})
 
     try:
@@ -486,8 +534,6 @@ def get_user_profile():
     except Exception as e:
         print(f"Profile Error: {e}")
         return jsonify({"success": False, "message": "서버 오류"})
-    finally:
-        dbm.DBClose()
 
 
 @app.route("/api/user/change_password", methods=["POST"])
@@ -515,7 +561,8 @@ def change_password():
     if count < 2 or re.search(r'[^A-Za-z0-9!~@#]', new_password):
         return jsonify({"success": False, "message": "비밀번호 조건을 만족하지 않습니다."})
 
-    if not dbm.DBOpen(host, id, pw, dbName):
+    dbm = get_db()
+    if dbm is None:
         return jsonify({"success": False, "message": "DB 연결 실패"})
 
     try:
@@ -546,8 +593,6 @@ def change_password():
     except Exception as e:
         print(f"Change Password Error: {e}")
         return jsonify({"success": False, "message": "서버 오류"})
-    finally:
-        dbm.DBClose()
 
 
 @app.route("/favorites")
@@ -564,13 +609,12 @@ def favorites():
 def check_userid():
     userid = request.json.get("userid")
 
-    if dbm.DBOpen(host, id, pw, dbName, port):
+    dbm = get_db()
+    if dbm is not None:
         # 테이블의 u_id 컬럼에서 중복 확인
         sql = "SELECT 1 FROM user WHERE u_id = %s"
         exists = dbm.CheckDuplicate(sql, (userid,))
-        dbm.DBClose()
         return jsonify({"exists": exists})
-    dbm.DBClose()
 
     print("Error: 아이디 중복 확인 중 DB 연결 실패")
     return jsonify({"exists": False, "error": "DB 연결 실패"})
@@ -590,7 +634,8 @@ def signup_process():
         return jsonify(success=False, field="userid", msg="아이디 형식이 올바르지 않습니다.")
 
     # DB 연결 시도
-    if not dbm.DBOpen(host, id, pw, dbName, port):
+    dbm = get_db()
+    if dbm is None:
         print("Error: 회원가입 처리 중 DB 연결 실패")
         return jsonify(success=False, msg="서버 연결 실패")
 
@@ -619,8 +664,6 @@ def signup_process():
     except Exception as e:
         print(f"Exception: 회원가입 중 예외 발생: {e}")
         return jsonify(success=False, msg="알 수 없는 오류가 발생했습니다.")
-    finally:
-        dbm.DBClose()
 
 # ================= 기능 3: 로그인 처리 =================
 @app.route("/login_process", methods=["POST"])
@@ -628,7 +671,8 @@ def login_process():
     userid = request.form.get("userid", "").strip()
     password = request.form.get("password", "")
 
-    if not dbm.DBOpen(host, id, pw, dbName, port):
+    dbm = get_db()
+    if dbm is None:
         return jsonify(success=False, msg="DB 연결 실패")
 
     try:
@@ -659,8 +703,6 @@ def login_process():
     except Exception as e:
         print(f"Login Error: {e}") # 에러 내용 출력
         return jsonify(success=False, msg="서버 오류")
-    finally:
-        dbm.DBClose()
 
 # ================= 기능 4: 로그아웃 =================
 @app.route("/logout", methods=["POST", "GET"])
@@ -671,6 +713,24 @@ def logout():
     print(f"Logout: 사용자 로그아웃 ({user_id})")
     return redirect("/")  # 메인 페이지로 리다이렉트
 
+def start_background():
+    """날씨 프리페처 / 로컬 감정 모델 로드를 백그라운드 스레드로 시작 (여러 번 불러도 한 번만 시작)"""
+    weather_prefetcher.start()
+    local_emotion.start()
+
+def create_app():
+    """
+    백그라운드 작업을 시작하고 앱을 반환 (WSGI 서버용)
+    - gunicorn "app:create_app()" 처럼 사용
+    - app.py를 import만 할 때(테스트, 스크립트 등)는 스레드나 모델 로드가 시작되지 않음
+    """
+    start_background()
+    return app
+
 if __name__ == '__main__':
+    # debug 모드의 리로더 부모 프로세스에서는 시작하지 않고, 실제 서버 프로세스에서만 시작
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background()
     # app.run(host='0.0.0.0', debug=True)
-    app.run(debug=True)
\ No newline at end of file
+    # 요청마다 커넥션을 따로 쓰므로 여러 스레드로 동시에 처리해도 안전
+    app.run(debug=True, threaded=True)
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+find_store 조회 방식 비교 벤치마크 (기존 JOIN 방식 vs 윈도우 함수 방식)
+
+- 별도의 벤치마크용 DB(BENCH_DB, 기본 feelfood_bench)에 합성 데이터를 만들고
+  두 방식의 SQL이 가져오는 행 수와 소요 시간을 비교합니다.
+- .env의 DB 접속 정보를 사용하며, 해당 계정에 DB 생성 권한이 필요합니다. (MySQL 8.0 이상)
+
+실행 예)
+    python bench_find_store.py --stores 200 --max-menus 80 --count 100
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+import service
+from DBManager import DBManager
+
+CATEGORIES = ["한식", "일식", "카페/디저트", "양식/브런치", "고기/구이/치킨", "중식/아시아", "술집/이자카야", "기타"]
+LOCATION = "벤치대"
+
+def create_schema(dbm, bench_db):
+    """벤치마크용 DB와 테이블을 새로 만듦 (기존 벤치마크 DB는 삭제)"""
+    cursor = dbm.con.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{bench_db}`")
+    cursor.execute(f"CREATE DATABASE `{bench_db}` CHARACTER SET utf8mb4")
+    cursor.execute(f"USE `{bench_db}`")
+    cursor.execute("""
+        CREATE TABLE store (
+          s_idx INT NOT NULL AUTO_INCREMENT,
+          s_name VARCHAR(255),
+          s_categ VARCHAR(255),
+          s_location VARCHAR(255),
+          s_address VARCHAR(255),
+          s_img TEXT,
+          PRIMARY KEY (s_idx),
+          INDEX idx_store_location (s_location)
+        ) ENGINE=InnoDB""")
+    cursor.execute("""
+        CREATE TABLE menu (
+          m_idx INT NOT NULL AUTO_INCREMENT,
+          s_idx INT NOT NULL,
+          m_name VARCHAR(255),
+          m_price VARCHAR(255),
+          PRIMARY KEY (m_idx),
+          INDEX idx_menu_s_idx (s_idx)
+        ) ENGINE=InnoDB""")
+    cursor.execute("""
+        CREATE TABLE store_emotion_count_table (
+          s_idx INT PRIMARY KEY,
+          s_location VARCHAR(255),
+          happy_cnt INT DEFAULT 0,
+          angry_cnt INT DEFAULT 0,
+          sad_cnt INT DEFAULT 0,
+          love_cnt INT DEFAULT 0,
+          fun_cnt INT DEFAULT 0
+        ) ENGINE=InnoDB""")
+    # 실제 view는 s_categ를 8개 대분류로 묶지만, 벤치마크에서는 s_categ에 대분류를 바로 저장
+    cursor.execute("""
+        CREATE VIEW vw_store_major_category AS
+        SELECT s_idx, s_name, s_location, s_categ, s_categ AS major_categ FROM store""")
+    cursor.close()
+
+def fill_data(dbm, stores_per_category, max_menus, seed):
+    """카테고리별 가게, 가게별 메뉴(1 ~ max_menus개), 감정 카운트 합성 데이터 생성"""
+    rng = random.Random(seed)
+    cursor = dbm.con.cursor()
+    s_idx = 0
+    store_rows, menu_rows, emotion_rows = [], [], []
+    for cat in CATEGORIES:
+        for n in range(stores_per_category):
+            s_idx += 1
+            store_rows.append((s_idx, f"{cat} 가게 {n}", cat, LOCATION, f"벤치시 {s_idx}번지", f"https://img/{s_idx}.jpg"))
+            for m in range(rng.randint(1, max_menus)):
+                menu_rows.append((s_idx, f"메뉴 {m}", f"{rng.randint(3, 30) * 1000:,}원"))
+            emotion_rows.append((s_idx, LOCATION) + tuple(rng.randint(0, 60) for _ in range(5)))
+    cursor.executemany("INSERT INTO store (s_idx, s_name, s_categ, s_location, s_address, s_img) VALUES (%s, %s, %s, %s, %s, %s)", store_rows)
+    cursor.executemany("INSERT INTO menu (s_idx, m_name, m_price) VALUES (%s, %s, %s)", menu_rows)
+    cursor.executemany("""INSERT INTO store_emotion_count_table
+        (s_idx, s_location, happy_cnt, angry_cnt, sad_cnt, love_cnt, fun_cnt)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)""", emotion_rows)
+    dbm.con.commit()
+    cursor.close()
+    return len(store_rows), len(menu_rows)
+
+def run_sql(dbm, sql, params, repeat):
+    """SQL을 repeat번 실행해서 (가져온 행 수, 소요 시간 목록(ms)) 반환"""
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor = dbm.con.cursor()
+        cursor.execute(sql, params)
+        rows = len(cursor.fetchall())
+        cursor.close()
+        timings.append((time.perf_counter() - start) * 1000)
+    return rows, timings
+
+def main():
+    parser = argparse.ArgumentParser(description="find_store 조회 방식 비교 벤치마크")
+    parser.add_argument("--stores", type=int, default=200, help="카테고리별 가게 수")
+    parser.add_argument("--max-menus", type=int, default=80, help="가게별 최대 메뉴 수")
+    parser.add_argument("--count", type=int, default=100, help="카테고리별 가게 수 제한 (sub_list는 100)")
+    parser.add_argument("--review-count", type=int, default=0, help="최소 리뷰 수 (sub_list는 0)")
+    parser.add_argument("--emotion", default="희")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    bench_db = os.environ.get("BENCH_DB", "feelfood_bench")
+    dbm = DBManager()
+    if not dbm.DBOpen(service.host, service.id, service.pw, None, service.port, use_pool=False):
+        print("DB 연결 실패")
+        return
+
+    try:
+        create_schema(dbm, bench_db)
+        store_total, menu_total = fill_data(dbm, args.stores, args.max_menus, args.seed)
+        print(f"합성 데이터: 가게 {store_total}개, 메뉴 {menu_total}개 ({len(CATEGORIES)}개 카테고리)")
+
+        results = {}
+        for label, limit_in_sql in (("before (JOIN 전체 메뉴)", False), ("after (윈도우 함수)", True)):
+            sql, params = service.build_find_store_sql(
+                args.emotion, LOCATION, CATEGORIES, args.count, args.review_count, limit_in_sql)
+            rows, timings = run_sql(dbm, sql, params, args.repeat)
+            results[label] = (rows, timings)
+
+        # find_store 전체(조회 + 파이썬 조립)도 같은 DB로 측정
+        service.dbName = bench_db
+        end_to_end = {}
+        outputs = []
+        for label, limit_in_sql in (("before (JOIN 전체 메뉴)", False), ("after (윈도우 함수)", True)):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                output = service.find_store(args.emotion, LOCATION, CATEGORIES, args.count, args.review_count, limit_in_sql)
+                timings.append((time.perf_counter() - start) * 1000)
+            end_to_end[label] = timings
+            outputs.append(output)
+
+        print(f"\n{'방식':<24}{'행 수':>10}{'SQL p50(ms)':>14}{'find_store p50(ms)':>20}")
+        for label, (rows, timings) in results.items():
+            print(f"{label:<24}{rows:>10}{statistics.median(timings):>14.1f}{statistics.median(end_to_end[label]):>20.1f}")
+        print(f"\n두 방식의 find_store 결과 일치: {outputs[0] == outputs[1]}")
+    finally:
+        dbm.DBClose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+캐시 공통 유틸리티
+- SingleFlight : 같은 키로 동시에 들어온 요청을 실제 호출 한 번으로 합침
+- LRUCache     : 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 지우는 캐시 (항목별 만료 시각 지원)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class _Call :
+    """진행 중인 호출 하나 (결과를 기다리는 요청들이 공유)"""
+    def __init__(self) :
+        self.done   = threading.Event()
+        self.result = None
+        self.error  = None
+
+class SingleFlight :
+    """
+    같은 키에 대한 호출이 진행 중이면 새로 호출하지 않고 그 결과를 같이 받음
+    (예: 같은 대학 날씨를 동시에 요청하면 외부 API는 한 번만 호출)
+    """
+    def __init__(self) :
+        self._lock  = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn) :
+        """key로 fn()을 실행하고 결과를 반환 (진행 중인 호출이 있으면 그 결과를 기다림)"""
+        with self._lock :
+            call = self._calls.get(key)
+            leader = call is None
+            if leader :
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader :
+            call.done.wait()
+            if call.error is not None :
+                raise call.error
+            return call.result
+
+        try :
+            call.result = fn()
+            return call.result
+        except BaseException as e :
+            call.error = e
+            raise
+        finally :
+            with self._lock :
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self, key) :
+        """key에 대한 호출이 진행 중인지 확인"""
+        with self._lock :
+            return key in self._calls
+
+class LRUCache :
+    """
+    스레드 안전한 LRU 캐시
+    - maxsize를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - set할 때 expires_at(time.time() 기준 시각)을 주면 그 이후에는 없는 것으로 처리
+    - hits / misses 카운터 제공
+    """
+    def __init__(self, maxsize=1024) :
+        self.maxsize = max(1, maxsize)
+        self._data   = OrderedDict()    # key -> (value, expires_at)
+        self._lock   = threading.Lock()
+        self.hits    = 0
+        self.misses  = 0
+
+    def get(self, key, default=None) :
+        with self._lock :
+            entry = self._data.get(key)
+            if entry is not None :
+                value, expires_at = entry
+                if expires_at is None or time.time() < expires_at :
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, expires_at=None) :
+        with self._lock :
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize :
+                self._data.popitem(last=False)
+
+    def clear(self) :
+        with self._lock :
+            self._data.clear()
+
+    def stats(self) :
+        """현재 크기와 hit / miss 수, 적중률 반환"""
+        with self._lock :
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else None
+            }
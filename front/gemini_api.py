@@ -1,16 +1,63 @@
 import re
 import os
+import json
+import sqlite3
 import pandas as pd
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from soynlp.normalizer import repeat_normalize
+from cache_util import LRUCache, SingleFlight
 
 load_dotenv()
 LLM_MODEL = os.getenv('LLM_MODEL')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 client = genai.Client(api_key=GEMINI_API_KEY)
 
+# 감정 분석 캐시 : 정규화한 문장 -> 감정 결과
+EMOTION_CACHE_SIZE = int(os.getenv('EMOTION_CACHE_SIZE', 4096))
+emotion_cache = LRUCache(EMOTION_CACHE_SIZE)
+emotion_flight = SingleFlight()
+
+# 운세 캐시 : (생년월일, 날짜) -> (운세 텍스트, 카테고리 리스트), 자정에 만료
+FORTUNE_CACHE_SIZE = int(os.getenv('FORTUNE_CACHE_SIZE', 1024))
+# 설정하면 운세를 SQLite 파일에도 저장 (서버 재시작 / 여러 프로세스 간 공유)
+FORTUNE_CACHE_PATH = os.getenv('FORTUNE_CACHE_PATH')
+fortune_cache = LRUCache(FORTUNE_CACHE_SIZE)
+fortune_flight = SingleFlight()
+
+def normalize_emotion_text(emotion_text) :
+    """캐시 키용 정규화 (머신러닝 쪽 clean_text와 같은 반복 문자 정규화 + 공백 정리)"""
+    if not isinstance(emotion_text, str) :
+        return ""
+    return " ".join(repeat_normalize(emotion_text, num_repeats=2).split())
+
 def emotion_analyze(emotion_text) :
+    """
+    문장의 감정을 '희', '노', '슬', '사', '락' 중 하나로 분류
+    - 정규화한 문장이 같으면 캐시된 결과를 반환
+    - 같은 문장이 동시에 들어오면 API는 한 번만 호출
+    """
+    normalized = normalize_emotion_text(emotion_text)
+    if not normalized :
+        return _request_emotion(emotion_text)
+
+    emotion = emotion_cache.get(normalized)
+    if emotion is not None :
+        return emotion
+
+    def load() :
+        emotion = _request_emotion(normalized)
+        # 실패(None)는 캐시하지 않음
+        if emotion is not None :
+            emotion_cache.set(normalized, emotion)
+        return emotion
+    return emotion_flight.do(normalized, load)
+
+def emotion_cache_stats() :
+    return emotion_cache.stats()
+
+def _request_emotion(emotion_text) :
     prompt = f'''
 당신은 텍스트에 담긴 미묘한 감정을 파악하는 전문 '감정 분석가'입니다.
 아래 [분석 대상 문장]을 읽고, 가장 지배적인 감정을 다음 5가지 카테고리 중 하나로 분류하여 출력하세요.
@@ -58,9 +105,10 @@ def emotion_analyze(emotion_text) :
 # Gemini AI 운세 + 음식 추천
 # ==========================================
 
-def generate_fortune_and_food(birth_date):
+def _request_fortune(birth_date, now):
+    """Gemini에 운세를 요청해서 (운세 텍스트, 카테고리 리스트) 반환 (실패하면 예외 발생)"""
     formatted_date = f"{birth_date[:4]}년 {birth_date[4:6]}월 {birth_date[6:]}일"
-    today = pd.Timestamp.now().strftime("%Y년 %m월 %d일")
+    today = now.strftime("%Y년 %m월 %d일")
     # 카테고리명을 정확히 추출하기 위해 형식을 지정합니다.
     # 테마리스트는 이후 변경필요
     prompt = f"""
@@ -82,19 +130,91 @@ def generate_fortune_and_food(birth_date):
     [추천_카테고리: 카테고리명1; 카테고리명2; 카테고리명3]
     """
 
+    response = client.models.generate_content(model=LLM_MODEL, contents=prompt)
+    full_text = response.text
+
+    # split(',') 대신 split(';')으로 변경
+    match = re.search(r"\[추천_카테고리:\s*(.*?)\]", full_text)
+    if match:
+        # 세미콜론으로 자르기 때문에 '초밥,롤'이 한 덩어리로 유지됩니다.
+        category_list = [c.strip() for c in match.group(1).split(';')]
+    else:
+        category_list = ["한식", "카페,디저트"]
+
+    return full_text, category_list
+
+def _fortune_db():
+    con = sqlite3.connect(FORTUNE_CACHE_PATH, timeout=5)
+    con.execute("""CREATE TABLE IF NOT EXISTS fortune_cache (
+        birth_date TEXT NOT NULL,
+        day TEXT NOT NULL,
+        fortune_text TEXT NOT NULL,
+        category_list TEXT NOT NULL,
+        PRIMARY KEY (birth_date, day))""")
+    return con
+
+def _load_fortune_from_disk(birth_date, day):
+    """디스크 캐시에서 오늘 운세 조회 (없거나 디스크 캐시를 안 쓰면 None)"""
+    if not FORTUNE_CACHE_PATH:
+        return None
+    try:
+        con = _fortune_db()
+        try:
+            row = con.execute("SELECT fortune_text, category_list FROM fortune_cache WHERE birth_date = ? AND day = ?",
+                              (birth_date, day)).fetchone()
+        finally:
+            con.close()
+        if row:
+            return row[0], json.loads(row[1])
+    except Exception as e:
+        print(f"운세 디스크 캐시 조회 실패: {e}")
+    return None
+
+def _save_fortune_to_disk(birth_date, day, full_text, category_list):
+    """디스크 캐시에 오늘 운세 저장 (지난 날짜의 운세는 같이 정리)"""
+    if not FORTUNE_CACHE_PATH:
+        return
+    try:
+        con = _fortune_db()
+        try:
+            with con:
+                con.execute("INSERT OR REPLACE INTO fortune_cache VALUES (?, ?, ?, ?)",
+                            (birth_date, day, full_text, json.dumps(category_list, ensure_ascii=False)))
+                con.execute("DELETE FROM fortune_cache WHERE day < ?", (day,))
+        finally:
+            con.close()
+    except Exception as e:
+        print(f"운세 디스크 캐시 저장 실패: {e}")
+
+def _load_or_request_fortune(birth_date, now, day, expires_at):
+    cached = _load_fortune_from_disk(birth_date, day)
+    if cached is None:
+        cached = _request_fortune(birth_date, now)
+        _save_fortune_to_disk(birth_date, day, *cached)
+    fortune_cache.set((birth_date, day), cached, expires_at)
+    return cached
+
+def generate_fortune_and_food(birth_date):
+    """
+    생년월일로 오늘의 운세와 추천 카테고리를 반환
+    - 같은 날 같은 생년월일은 캐시된 결과를 반환 (자정에 만료)
+    - 동시에 같은 생년월일로 요청이 오면 API는 한 번만 호출
+    """
+    now = pd.Timestamp.now()
+    day = now.strftime("%Y-%m-%d")
+    key = (birth_date, day)
+    # 오늘 자정 (로컬 시간 기준)
+    expires_at = (now.normalize() + pd.Timedelta(days=1)).to_pydatetime().timestamp()
+
+    cached = fortune_cache.get(key)
+    if cached is not None:
+        full_text, category_list = cached
+        return full_text, list(category_list)
+
     try:
-        response = client.models.generate_content(model=LLM_MODEL, contents=prompt)
-        full_text = response.text
-
-        # split(',') 대신 split(';')으로 변경
-        match = re.search(r"\[추천_카테고리:\s*(.*?)\]", full_text)
-        if match:
-            # 세미콜론으로 자르기 때문에 '초밥,롤'이 한 덩어리로 유지됩니다.
-            category_list = [c.strip() for c in match.group(1).split(';')]
-        else:
-            category_list = ["한식", "카페,디저트"]
-            
-        return full_text, category_list
+        full_text, category_list = fortune_flight.do(
+            key, lambda: _load_or_request_fortune(birth_date, now, day, expires_at))
+        return full_text, list(category_list)
     except Exception as e:
         print(f"API 에러: {e}")
         return "운세를 가져올 수 없습니다.", ["한식", "카페,디저트"]
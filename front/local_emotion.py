@@ -0,0 +1,257 @@
+"""
+로컬 감정 분류기 (Gemini 호출 전 빠른 경로)
+- machine-learning/model_*.py로 학습한 6개 DistilKoBERT 감정 모델을 CPU에서 실행
+- .h5 가중치는 처음 한 번 TFLite(dynamic range 양자화)로 변환해서 {감정}_model.tflite로 저장해 두고 재사용
+- Interpreter는 스레드 안전하지 않으므로 요청마다 풀에서 모델 묶음을 빌려 씀 (LOCAL_EMOTION_POOL개까지 동시 추론)
+- 가장 높은 점수가 LOCAL_EMOTION_THRESHOLD 미만이면 None을 반환 → 호출하는 쪽에서 Gemini로 넘김
+- tensorflow / transformers가 없거나 모델 파일이 없으면 항상 None (기존처럼 Gemini만 사용)
+"""
+import os
+import queue
+import threading
+import time
+from dotenv import load_dotenv
+from soynlp.normalizer import repeat_normalize
+
+load_dotenv()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 학습된 .h5 / 변환된 .tflite 파일이 있는 폴더
+MODEL_DIR = os.getenv("LOCAL_EMOTION_MODEL_DIR", os.path.join(BASE_DIR, "..", "machine-learning", "processed_data"))
+# 이 점수 미만이면 Gemini로 넘김
+THRESHOLD = float(os.getenv("LOCAL_EMOTION_THRESHOLD", 0.6))
+MAX_LEN = int(os.getenv("LOCAL_EMOTION_MAX_LEN", 128))
+NUM_THREADS = int(os.getenv("LOCAL_EMOTION_THREADS", 2))
+# 동시에 추론할 수 있는 요청 수 (Interpreter 묶음 개수, 가중치는 파일을 mmap해서 공유하고 작업 메모리만 늘어남)
+POOL_SIZE = max(1, int(os.getenv("LOCAL_EMOTION_POOL", 2)))
+# LOCAL_EMOTION=0 이면 로컬 분류기를 사용하지 않음
+ENABLED = os.getenv("LOCAL_EMOTION", "1") != "0"
+MODEL_NAME = "monologg/distilkobert"
+
+# 모델 파일 이름 -> 웹에서 쓰는 감정 ('불만'은 '노'로 합침)
+EMOTION_MODELS = {
+    "happy": "희",
+    "angry": "노",
+    "sad": "슬",
+    "love": "사",
+    "fun": "락",
+    "complaint": "노"
+}
+
+_lock = threading.Lock()        # 로딩 상태 / 풀 크기 보호
+_state = {"status": "idle", "error": None, "load_sec": None, "pool": 0}
+_tokenizer = None
+_factories = {}   # 모델 이름 -> 실행 함수(토큰을 받아 확률(float) 반환)를 만드는 함수
+# TFLite Interpreter는 스레드 안전하지 않으므로 모델 6개의 실행 함수 묶음을 요청마다 하나씩 빌려 씀
+# 묶음은 필요할 때 POOL_SIZE개까지 만들고, 모두 사용 중이면 반납될 때까지 기다림
+_pool = queue.Queue()
+_stats = {"local": 0, "fallback": 0, "unavailable": 0, "total_ms": 0.0}
+
+def clean_text(text):
+    if not isinstance(text, str): return ""
+    return repeat_normalize(text, num_repeats=2)
+
+def _build_keras_model(tf, weights_path):
+    from transformers import TFDistilBertModel
+
+    class DistilBertLayer(tf.keras.layers.Layer):
+        def __init__(self, model_name, **kwargs):
+            super().__init__(**kwargs)
+            self.bert = TFDistilBertModel.from_pretrained(model_name, from_pt=True)
+
+        def call(self, inputs):
+            return self.bert(inputs[0], attention_mask=inputs[1])[0]
+
+    # 이름이 dense_1, dense_2로 바뀌지 않도록 세션 정리 (저장된 파일과 이름을 맞추기 위함)
+    tf.keras.backend.clear_session()
+    input_ids = tf.keras.layers.Input(shape=(MAX_LEN,), dtype=tf.int32, name="input_ids")
+    attention_mask = tf.keras.layers.Input(shape=(MAX_LEN,), dtype=tf.int32, name="attention_mask")
+    last_hidden_state = DistilBertLayer(MODEL_NAME)([input_ids, attention_mask])
+    x = tf.keras.layers.Dropout(0.2)(last_hidden_state[:, 0, :])
+    output = tf.keras.layers.Dense(1, activation="sigmoid", name="dense")(x)
+    model = tf.keras.models.Model(inputs=[input_ids, attention_mask], outputs=output)
+    model.load_weights(weights_path, by_name=True)
+    return model
+
+def _convert_to_tflite(tf, weights_path, tflite_path):
+    """.h5 가중치로 모델을 만들고 dynamic range 양자화(int8 가중치)한 TFLite 파일로 저장"""
+    model = _build_keras_model(tf, weights_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_model = converter.convert()
+    with open(tflite_path, "wb") as f:
+        f.write(tflite_model)
+
+def _tflite_runner(tf, tflite_path):
+    interpreter = tf.lite.Interpreter(model_path=tflite_path, num_threads=NUM_THREADS)
+    interpreter.allocate_tensors()
+    inputs = {}
+    for detail in interpreter.get_input_details():
+        key = "attention_mask" if "attention_mask" in detail["name"] else "input_ids"
+        inputs[key] = detail
+    output_index = interpreter.get_output_details()[0]["index"]
+    # machine-learning/export_tflite.py로 만든 파일은 입력 길이가 (None,)인 동적 모델이므로
+    # 현재 입력 크기와 다르면 다시 잡음 (여기서 변환한 (1, MAX_LEN) 고정 모델도 그대로 동작)
+    shape = {"current": tuple(next(iter(inputs.values()))["shape"])}
+
+    def run(encodings):
+        input_shape = tuple(encodings["input_ids"].shape)
+        if input_shape != shape["current"]:
+            for detail in inputs.values():
+                interpreter.resize_tensor_input(detail["index"], list(input_shape), strict=False)
+            interpreter.allocate_tensors()
+            shape["current"] = input_shape
+        for key, detail in inputs.items():
+            interpreter.set_tensor(detail["index"], encodings[key].astype(detail["dtype"]))
+        interpreter.invoke()
+        return float(interpreter.get_tensor(output_index)[0][0])
+    return run
+
+def _keras_runner(model):
+    def run(encodings):
+        return float(model(encodings, training=False)[0][0])
+    # Keras 모델은 여러 스레드에서 같이 호출해도 되므로 묶음마다 같은 함수를 사용
+    return lambda: run
+
+def _new_runner_set():
+    return {name: factory() for name, factory in _factories.items()}
+
+def _acquire():
+    """실행 함수 묶음을 빌림 (없으면 POOL_SIZE개까지 새로 만들고, 넘으면 반납될 때까지 대기)"""
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        pass
+    with _lock:
+        create = _state["pool"] < POOL_SIZE
+        if create:
+            _state["pool"] += 1
+    if not create:
+        return _pool.get()
+    try:
+        return _new_runner_set()
+    except Exception:
+        with _lock:
+            _state["pool"] -= 1
+        raise
+
+def _load():
+    global _tokenizer
+    started = time.perf_counter()
+    try:
+        import tensorflow as tf
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        return f"tensorflow / transformers 없음: {e}"
+
+    factories = {}
+    first_set = {}   # 로드하면서 만든 첫 번째 묶음 (첫 요청이 Interpreter 생성을 기다리지 않도록 풀에 넣어 둠)
+    for name in EMOTION_MODELS:
+        weights_path = os.path.join(MODEL_DIR, f"{name}_model.h5")
+        tflite_path = os.path.join(MODEL_DIR, f"{name}_model.tflite")
+        try:
+            if not os.path.exists(tflite_path):
+                if not os.path.exists(weights_path):
+                    print(f"  [경고] 파일이 없습니다: {weights_path}")
+                    continue
+                try:
+                    _convert_to_tflite(tf, weights_path, tflite_path)
+                    print(f"  - TFLite 변환 완료: {tflite_path}")
+                except Exception as e:
+                    # 변환이 안 되면 양자화 없이 Keras 모델로 실행
+                    print(f"  [경고] {name} TFLite 변환 실패, Keras 모델 사용: {e}")
+                    factories[name] = _keras_runner(_build_keras_model(tf, weights_path))
+                    first_set[name] = factories[name]()
+                    continue
+            first_set[name] = _tflite_runner(tf, tflite_path)
+            factories[name] = lambda path=tflite_path: _tflite_runner(tf, path)
+        except Exception as e:
+            print(f"  [오류] {name} 모델 로드 실패: {e}")
+
+    if not factories:
+        return f"로드된 모델이 없습니다 ({MODEL_DIR})"
+
+    _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+    _factories.update(factories)
+    _pool.put(first_set)
+    _state["pool"] = 1
+    _state["load_sec"] = round(time.perf_counter() - started, 2)
+    return None
+
+def load():
+    """모델을 로드 (이미 로드했거나 로드 중이면 무시), 로드 성공 여부 반환"""
+    with _lock:
+        if _state["status"] != "idle":
+            return _state["status"] == "ready"
+        _state["status"] = "loading"
+    error = _load()
+    with _lock:
+        _state["status"] = "ready" if error is None else "failed"
+        _state["error"] = error
+    if error:
+        print(f"로컬 감정 분류기 사용 안 함: {error}")
+    else:
+        print(f"로컬 감정 분류기 로드 완료 ({len(_factories)}개 모델, 동시 추론 최대 {POOL_SIZE}개, {_state['load_sec']}초)")
+    return error is None
+
+def start():
+    """백그라운드 스레드에서 모델 로드 (로드가 끝나기 전 요청은 Gemini로 처리)"""
+    if ENABLED:
+        threading.Thread(target=load, name="local-emotion-loader", daemon=True).start()
+
+def predict(text):
+    """감정별 점수 반환 {'희': 0.91, '노': 0.12, ...} (모델이 준비되지 않았으면 None)"""
+    if _state["status"] != "ready":
+        return None
+    encodings = _tokenizer(clean_text(text), truncation=True, padding="max_length", max_length=MAX_LEN,
+                           return_token_type_ids=False, return_tensors="np")
+    encodings = {"input_ids": encodings["input_ids"], "attention_mask": encodings["attention_mask"]}
+    scores = {}
+    runners = _acquire()
+    try:
+        for name, run in runners.items():
+            emotion = EMOTION_MODELS[name]
+            scores[emotion] = max(scores.get(emotion, 0.0), run(encodings))
+    finally:
+        _pool.put(runners)
+    return scores
+
+def analyze(text):
+    """
+    문장의 감정을 '희', '노', '슬', '사', '락' 중 하나로 반환
+    확신도가 THRESHOLD 미만이거나 모델이 준비되지 않았으면 None
+    """
+    if not ENABLED or not isinstance(text, str) or not text.strip():
+        return None
+    started = time.perf_counter()
+    try:
+        scores = predict(text)
+    except Exception as e:
+        print(f"로컬 감정 분석 오류: {e}")
+        scores = None
+    if not scores:
+        _stats["unavailable"] += 1
+        return None
+
+    emotion = max(scores, key=scores.get)
+    _stats["total_ms"] += (time.perf_counter() - started) * 1000
+    if scores[emotion] < THRESHOLD:
+        _stats["fallback"] += 1
+        return None
+    _stats["local"] += 1
+    return emotion
+
+def stats():
+    """로드 상태와 로컬 처리 / Gemini로 넘긴 횟수 반환"""
+    answered = _stats["local"] + _stats["fallback"]
+    return {
+        "status": _state["status"],
+        "error": _state["error"],
+        "load_sec": _state["load_sec"],
+        "models": sorted(_factories),
+        "pool": {"created": _state["pool"], "idle": _pool.qsize(), "max": POOL_SIZE},
+        "threshold": THRESHOLD,
+        "local": _stats["local"],
+        "fallback": _stats["fallback"],
+        "unavailable": _stats["unavailable"],
+        "avg_inference_ms": round(_stats["total_ms"] / answered, 1) if answered else None
+    }
@@ -1,16 +1,25 @@
 """
 날씨 기반 음식 추천 모듈 (Rule-Based)
-- OpenWeather API로 실시간 날씨 조회
+- OpenWeather API로 실시간 날씨 조회 (대학별 TTL 캐시)
 - 날씨 + 온도 구간에 따라 미리 정의된 음식 카테고리 추천
 """
 
 import requests
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from cache_util import SingleFlight
 
 # 환경 변수 로드
 load_dotenv()
 API_KEY = os.getenv("OPEN_WEATHER_API")
+# 로컬 stub 서버로 테스트할 때는 OPEN_WEATHER_URL을 바꿔서 사용
+WEATHER_URL = os.getenv("OPEN_WEATHER_URL", "https://api.openweathermap.org/data/2.5/weather")
+# 캐시된 날씨를 그대로 쓰는 시간(초)
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", 600))
+# TTL이 지난 뒤에도 이 시간(초) 동안은 이전 날씨를 바로 보여주고 뒤에서 갱신
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", 1800))
 
 # 지거국 10곳 좌표 정보
 UNIVERSITIES = {
@@ -481,10 +490,74 @@ CATEGORY_PRIORITY_TABLE = {
     }
 }
 
+# 날씨 캐시 (대학별 TTL + stale-while-revalidate + single-flight)
+class WeatherCache:
+    """
+    대학별 날씨 조회 결과 캐시
+    - TTL 이내 : 캐시된 값을 바로 반환
+    - TTL ~ TTL + stale_ttl : 캐시된 값을 바로 반환하고, 백그라운드에서 한 번만 갱신
+    - 그 이후 / 캐시 없음 : 직접 조회 (같은 대학 동시 요청은 한 번의 API 호출을 공유)
+    - 조회에 실패한 결과는 캐시하지 않음 (이전 값이 있으면 그대로 유지)
+    """
+    def __init__(self, fetch, ttl, stale_ttl):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = {}          # 대학 이름 -> (날씨 데이터, 조회 시각)
+        self._refreshing = set()    # 백그라운드 갱신 중인 대학
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def get(self, university_name):
+        with self._lock:
+            entry = self._entries.get(university_name)
+        if entry:
+            data, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                return dict(data)
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(university_name)
+                return dict(data)
+        return dict(self._flight.do(university_name, lambda: self._load(university_name)))
+
+    def _load(self, university_name):
+        data = self.fetch(university_name)
+        if data.get("success"):
+            with self._lock:
+                self._entries[university_name] = (data, time.monotonic())
+        return data
+
+    def _refresh_in_background(self, university_name):
+        with self._lock:
+            if university_name in self._refreshing:
+                return
+            self._refreshing.add(university_name)
+        threading.Thread(target=self._background_refresh, args=(university_name,), daemon=True).start()
+
+    def _background_refresh(self, university_name):
+        try:
+            self._flight.do(university_name, lambda: self._load(university_name))
+        except Exception as e:
+            print(f"날씨 백그라운드 갱신 실패 ({university_name}): {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(university_name)
+
+    def put(self, university_name, data):
+        """외부(프리페처 등)에서 조회한 최신 날씨를 캐시에 저장"""
+        if data.get("success"):
+            with self._lock:
+                self._entries[university_name] = (data, time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 # 날씨 조회 함수
 def get_weather_by_university(university_name):
     """
-    대학 이름을 받아 해당 위치의 현재 날씨를 조회
+    대학 이름을 받아 해당 위치의 현재 날씨를 조회 (캐시 사용)
     """
     if not API_KEY:
         return {"success": False, "error": "OpenWeather API 키가 없습니다."}
@@ -492,10 +565,16 @@ def get_weather_by_university(university_name):
     if university_name not in UNIVERSITIES:
         return {"success": False, "error": "존재하지 않는 대학입니다."}
 
+    return weather_cache.get(university_name)
+
+def fetch_weather_by_university(university_name):
+    """
+    캐시를 거치지 않고 OpenWeather API로 현재 날씨를 직접 조회
+    """
     coord = UNIVERSITIES[university_name]
 
     try:
-        url = "https://api.openweathermap.org/data/2.5/weather"
+        url = WEATHER_URL
         params = {
             "lat": coord["lat"],
             "lon": coord["lon"],
@@ -520,6 +599,8 @@ def get_weather_by_university(university_name):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+weather_cache = WeatherCache(fetch_weather_by_university, WEATHER_CACHE_TTL, WEATHER_STALE_TTL)
+
 # 음식 추천 함수 (Rule-Based)
 def get_food_recommendation_by_weather(weather_data):
     """
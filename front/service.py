@@ -93,6 +93,67 @@ def find_menu(store_name, dbm):
     
     return menu_dic
 
+def find_menus_by_store(s_idx_list, dbm):
+    """
+    여러 가게의 메뉴를 한 번에 조회해서 {s_idx: [메뉴, ...]} 형태로 반환
+    메뉴 형식은 process_menu_data가 받는 형식과 동일 ({'name': ..., 'price': ...})
+    """
+    menu_map = {s_idx: [] for s_idx in s_idx_list}
+    if not s_idx_list:
+        return menu_map
+
+    placeholders = ', '.join(['%s'] * len(s_idx_list))
+    sql = f"""SELECT m.s_idx, m.m_name, m.m_price
+    FROM menu m
+    WHERE m.s_idx IN ({placeholders})
+    ORDER BY m.s_idx, m.m_idx"""
+
+    if not dbm.OpenSQL(sql, tuple(s_idx_list)):
+        print("메뉴 조회 실패")
+        return menu_map
+    menus = dbm.getAll()
+    dbm.CloseSQL()
+
+    for menu in menus or []:
+        menu_map[menu.get('s_idx')].append({
+            'name': menu.get('m_name'),
+            'price': menu.get('m_price')
+        })
+    return menu_map
+
+def find_emotions_by_store(s_idx_list, dbm):
+    """
+    여러 가게의 감정별 평균 점수를 한 번에 조회해서 {s_idx: emotion_dic} 형태로 반환
+    emotion_dic 형식은 find_emotion과 동일
+    """
+    emotion_map = {
+        s_idx: {"희": 0, "노": 0, "애(슬픔)": 0, "애(사랑)": 0, "락": 0}
+        for s_idx in s_idx_list
+    }
+    if not s_idx_list:
+        return emotion_map
+
+    placeholders = ', '.join(['%s'] * len(s_idx_list))
+    sql = f"""SELECT r.s_idx, t.t_emo_type, AVG(e.e_score) as avg_score
+    FROM emotion e
+    JOIN review r ON e.r_idx = r.r_idx
+    JOIN etype t ON e.t_idx = t.t_idx
+    WHERE r.s_idx IN ({placeholders})
+    GROUP BY r.s_idx, t.t_emo_type"""
+
+    if not dbm.OpenSQL(sql, tuple(s_idx_list)):
+        print("감정 점수 조회 실패")
+        return emotion_map
+    emotions = dbm.getAll()
+    dbm.CloseSQL()
+
+    for emotion in emotions or []:
+        emotion_dic = emotion_map.get(emotion.get('s_idx'))
+        t_emo_type = emotion.get('t_emo_type')
+        if emotion_dic is not None and t_emo_type in emotion_dic:
+            emotion_dic[t_emo_type] = emotion.get('avg_score')
+    return emotion_map
+
 def weather_store(s_location, cat_list):
     dbm = get_dbm()
     # DB 연결 시도
@@ -104,51 +165,52 @@ def weather_store(s_location, cat_list):
     restaurant_list = []
 
     try:
-        # 카테고리 리스트에서 카테고리 한개씩 산출
-        for cat in cat_list:
-            # 가게 정보를 담는 리스트
-            store_list = []
-            # 카테고리, 위치에 맞는 가게 정보 DB에서 조회
-            sql = """SELECT s.*, v.major_categ 
+        # 카테고리별 가게 정보를 담는 딕셔너리 (조회 실패해도 빈 리스트로 반환)
+        category_store_map = {cat: [] for cat in cat_list}
+
+        if cat_list:
+            # 모든 카테고리의 가게를 한 번에 조회
+            # 가게 주소가 null일 경우 아직 수집 전이니 제외
+            placeholders = ', '.join(['%s'] * len(cat_list))
+            sql = f"""SELECT s.s_idx, s.s_name, s.s_address, s.s_img, v.major_categ
                 FROM store s INNER JOIN vw_store_major_category v ON s.s_idx = v.s_idx
-                WHERE v.major_categ = %s AND s.s_location = %s"""
-            # DB에서 데이터 가져오기
-            if not dbm.OpenSQL(sql, (cat,s_location)):
-                print(f"{cat} 카테고리 조회 실패")
-                continue
-            # 한 카테고리에 여러 가게가 있으니 전체를 가져와야함
-            datas = dbm.getAll()
-            dbm.CloseSQL()
-            
-            # 카테고리 안에 가게 정보가 있을 때만 처리
-            if datas:
-                for data in datas:
-                    # 가게 주소가 null일 경우 아직 수집 전이니 패스
-                    if data.get('s_address') is None :
-                        continue
-                    # 가게 이름 저장
-                    store_name = data.get("s_name")
-                    # 메뉴 정보를 담을 함수 호출
-                    menu_dic = find_menu(store_name, dbm)
-                    # 감정 정보를 담을 함수 호출
-                    emotion_dic = find_emotion(store_name, dbm)
-                    # 가게 정보를 딕셔너리로 저장
-                    store_dic = {
-                        's_idx': data.get('s_idx'),
-                        'name': store_name,
-                        'address': data.get('s_address'),
-                        'img': data.get('s_img'),
-                        'menu' : menu_dic,
-                        'emotion_score' : emotion_dic
-                    }
-                    # store_list에 딕셔너리 저장
-                    store_list.append(store_dic)
-            # 최종적으로, restaurants 딕셔너리엔 카테고리 : [가게 정보]가 담김
+                WHERE v.major_categ IN ({placeholders}) AND s.s_location = %s
+                AND s.s_address IS NOT NULL
+                ORDER BY s.s_idx"""
+            if dbm.OpenSQL(sql, tuple(cat_list) + (s_location,)):
+                datas = dbm.getAll() or []
+                dbm.CloseSQL()
+            else:
+                print("카테고리별 가게 조회 실패")
+                datas = []
+
+            # 메뉴, 감정 점수도 가게 전체에 대해 한 번씩만 조회
+            s_idx_list = list(dict.fromkeys(data.get('s_idx') for data in datas))
+            menu_map = find_menus_by_store(s_idx_list, dbm)
+            emotion_map = find_emotions_by_store(s_idx_list, dbm)
+
+            # 메모리에서 카테고리별로 가게 정보 조립
+            for data in datas:
+                store_list = category_store_map.get(data.get('major_categ'))
+                if store_list is None:
+                    continue
+                s_idx = data.get('s_idx')
+                store_dic = {
+                    's_idx': s_idx,
+                    'name': data.get('s_name'),
+                    'address': data.get('s_address'),
+                    'img': data.get('s_img'),
+                    'menu' : process_menu_data(menu_map.get(s_idx)),
+                    'emotion_score' : emotion_map.get(s_idx)
+                }
+                store_list.append(store_dic)
+
+        # restaurant_list에는 카테고리별로 가게정보가 담긴 딕셔너리가 리스트로 저장됨
+        for cat in cat_list:
             restaurants = {
                 "cat": cat,
-                "store_list": store_list
+                "store_list": category_store_map[cat]
             }
-            # restaurant_list에는 카테고리별로 가게정보가 담긴 딕셔너리가 리스트로 저장됨
             restaurant_list.append(restaurants)
     
     except Exception as e:
@@ -162,15 +224,120 @@ def weather_store(s_location, cat_list):
     
     return restaurant_list
 
-def find_store(emotion, s_location, cat_list, count, review_count):
+# 감정 -> store_emotion_count_table 컬럼 매핑
+EMOTION_COLUMN_MAP = {
+    "희": "happy_cnt",
+    "노": "angry_cnt",
+    "애(슬픔)": "sad_cnt",
+    "애(사랑)": "love_cnt",
+    "락": "fun_cnt"
+}
+
+# 가게 목록에서 보여주는 메뉴 개수 (process_menu_data와 동일)
+MENU_PREVIEW_COUNT = 3
+
+def build_find_store_sql(emotion, s_location, cat_list, count, review_count, limit_in_sql=True):
+    """
+    find_store에서 사용할 SQL과 파라미터를 만들어 반환
+
+    limit_in_sql=True  : 카테고리별 상위 count개 가게, 가게별 메뉴 MENU_PREVIEW_COUNT개만
+                         윈도우 함수(ROW_NUMBER)로 DB에서 잘라서 가져옴 (MySQL 8.0 이상)
+    limit_in_sql=False : 가게 x 전체 메뉴를 JOIN해서 가져온 뒤 파이썬에서 자르는 기존 방식
+    """
+    emotion_column = EMOTION_COLUMN_MAP[emotion]
+    placeholders = ', '.join(['%s'] * len(cat_list))
+    total = "(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt)"
+    emotion_score = f"ROUND(sec.{emotion_column} * 100.0 / NULLIF({total}, 0), 2)"
+
+    if limit_in_sql:
+        sql = f"""
+            WITH ranked_store AS (
+                SELECT
+                    s.s_idx,
+                    s.s_name,
+                    s.s_address,
+                    s.s_img,
+                    v.major_categ,
+                    {emotion_score} as emotion_score,
+                    -- ⭐ 카테고리 안에서 감정 점수 순위
+                    ROW_NUMBER() OVER (
+                        PARTITION BY v.major_categ
+                        ORDER BY {emotion_score} DESC, s.s_idx
+                    ) as store_rank
+                FROM store s
+                INNER JOIN vw_store_major_category v ON s.s_idx = v.s_idx
+                INNER JOIN store_emotion_count_table sec ON s.s_idx = sec.s_idx
+                WHERE v.major_categ IN ({placeholders})
+                AND {total} > %s
+                AND s.s_location = %s
+                AND s.s_address IS NOT NULL
+            ),
+            top_store AS (
+                -- ⭐ 카테고리별 개수 제한 (count 적용)
+                SELECT * FROM ranked_store WHERE store_rank <= %s
+            ),
+            ranked_menu AS (
+                -- ⭐ 가게별 메뉴 순서
+                SELECT
+                    m.s_idx,
+                    m.m_idx,
+                    m.m_name,
+                    m.m_price,
+                    ROW_NUMBER() OVER (PARTITION BY m.s_idx ORDER BY m.m_idx) as menu_rank
+                FROM menu m
+                WHERE m.s_idx IN (SELECT s_idx FROM top_store)
+            )
+            SELECT
+                ts.s_idx,
+                ts.s_name,
+                ts.s_address,
+                ts.s_img,
+                ts.major_categ,
+                ts.emotion_score,
+                rm.m_idx,
+                rm.m_name,
+                rm.m_price
+            FROM top_store ts
+            LEFT JOIN ranked_menu rm ON rm.s_idx = ts.s_idx AND rm.menu_rank <= %s
+            ORDER BY ts.major_categ, ts.store_rank, rm.m_idx
+        """
+        params = tuple(cat_list) + (review_count, s_location, count, MENU_PREVIEW_COUNT)
+        return sql, params
+
+    # ⭐ 메뉴까지 한 번에 JOIN
+    sql = f"""
+        SELECT 
+            s.s_idx, 
+            s.s_name, 
+            s.s_address, 
+            s.s_img, 
+            s.s_location, 
+            v.major_categ,
+            m.m_idx,    -- 메뉴 고유 번호
+            m.m_name,      -- 메뉴 이름
+            m.m_price,     -- 메뉴 가격
+            ROUND(sec.happy_cnt * 100.0 / NULLIF({total}, 0), 2) as `희`,
+            ROUND(sec.angry_cnt * 100.0 / NULLIF({total}, 0), 2) as `노`,
+            ROUND(sec.sad_cnt * 100.0 / NULLIF({total}, 0), 2) as `애슬픔`,
+            ROUND(sec.love_cnt * 100.0 / NULLIF({total}, 0), 2) as `애사랑`,
+            ROUND(sec.fun_cnt * 100.0 / NULLIF({total}, 0), 2) as `락`,
+            -- ⭐ 정렬 우선순위를 위한 감정 점수
+            {emotion_score} as emotion_score
+        FROM store s
+        INNER JOIN vw_store_major_category v ON s.s_idx = v.s_idx
+        INNER JOIN store_emotion_count_table sec ON s.s_idx = sec.s_idx
+        LEFT JOIN menu m ON s.s_idx = m.s_idx  -- 메뉴 JOIN
+        WHERE v.major_categ IN ({placeholders})  -- 모든 카테고리 한번에
+        AND {total} > %s
+        AND s.s_location = %s
+        AND s.s_address IS NOT NULL
+        ORDER BY v.major_categ, emotion_score DESC, s.s_idx, m.m_idx
+    """
+    params = tuple(cat_list) + (review_count, s_location)
+    return sql, params
+
+def find_store(emotion, s_location, cat_list, count, review_count, limit_in_sql=True):
     dbm = get_dbm()
-    emotion_column_map = {
-        "희": "happy_cnt",
-        "노": "angry_cnt",
-        "애(슬픔)": "sad_cnt",
-        "애(사랑)": "love_cnt",
-        "락": "fun_cnt"
-    }
     
     if not dbm.DBOpen(host, id, pw, dbName, port):
         print("DB 연결 실패")
@@ -180,44 +347,14 @@ def find_store(emotion, s_location, cat_list, count, review_count):
     
     try:
         # ⭐ 핵심 개선: 모든 카테고리를 한 번에 조회
-        placeholders = ', '.join(['%s'] * len(cat_list))
-        
-        # ⭐ 메뉴까지 한 번에 JOIN
-        sql = f"""
-            SELECT 
-                s.s_idx, 
-                s.s_name, 
-                s.s_address, 
-                s.s_img, 
-                s.s_location, 
-                v.major_categ,
-                m.m_idx,    -- 메뉴 고유 번호
-                m.m_name,      -- 메뉴 이름
-                m.m_price,     -- 메뉴 가격
-                ROUND(sec.happy_cnt * 100.0 / NULLIF(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt, 0), 2) as `희`,
-                ROUND(sec.angry_cnt * 100.0 / NULLIF(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt, 0), 2) as `노`,
-                ROUND(sec.sad_cnt * 100.0 / NULLIF(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt, 0), 2) as `애슬픔`,
-                ROUND(sec.love_cnt * 100.0 / NULLIF(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt, 0), 2) as `애사랑`,
-                ROUND(sec.fun_cnt * 100.0 / NULLIF(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt, 0), 2) as `락`,
-                -- ⭐ 정렬 우선순위를 위한 감정 점수
-                ROUND(sec.{emotion_column_map[emotion]} * 100.0 / NULLIF(sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt, 0), 2) as emotion_score
-            FROM store s
-            INNER JOIN vw_store_major_category v ON s.s_idx = v.s_idx
-            INNER JOIN store_emotion_count_table sec ON s.s_idx = sec.s_idx
-            LEFT JOIN menu m ON s.s_idx = m.s_idx  -- 메뉴 JOIN
-            WHERE v.major_categ IN ({placeholders})  -- 모든 카테고리 한번에
-            AND (sec.happy_cnt + sec.angry_cnt + sec.sad_cnt + sec.love_cnt + sec.fun_cnt) > {review_count}
-            AND s.s_location = %s
-            ORDER BY v.major_categ, emotion_score DESC, s.s_idx, m.m_idx
-        """
-        
-        params = tuple(cat_list) + (s_location,)
+        # limit_in_sql=True면 카테고리별 가게 수, 가게별 메뉴 수를 DB에서 제한
+        sql, params = build_find_store_sql(emotion, s_location, cat_list, count, review_count, limit_in_sql)
         
         if not dbm.OpenSQL(sql, params):
             print("가게 조회 실패")
             return []
             
-        datas = dbm.getAll()
+        datas = dbm.getAll() or []
         dbm.CloseSQL()
         
         # ⭐ 메모리에서 데이터 그룹핑 및 개수 제한
@@ -301,9 +438,9 @@ def process_menu_data(menus):
     menu_price_list = []
     avg_price = "변동"
     
-    # 메뉴가 있으면 처리 (최대 3개만)
+    # 메뉴가 있으면 처리 (최대 MENU_PREVIEW_COUNT개만)
     if menus:
-        for menu in menus[:3]:
+        for menu in menus[:MENU_PREVIEW_COUNT]:
             if menu:
                 # 메뉴 이름
                 menu_name = menu.get("name")
@@ -568,13 +705,16 @@ def detail_store(s_name):
     if not dbm.DBOpen(host, id, pw, dbName, port):
         print("DB 연결 실패")
         return None
-    sql = "select * from store where s_name=%s"
-    dbm.OpenSQL(sql, (s_name,))
-    data = dbm.getData(0)
-    dbm.CloseSQL()
-    menu_dic = find_menu(s_name, dbm)
-    emotion_dic = find_emotion(s_name, dbm)
-    dbm.DBClose()
+    try:
+        sql = "select * from store where s_name=%s"
+        dbm.OpenSQL(sql, (s_name,))
+        data = dbm.getData(0)
+        dbm.CloseSQL()
+        menu_dic = find_menu(s_name, dbm)
+        emotion_dic = find_emotion(s_name, dbm)
+    finally:
+        # 오류가 나도 커넥션을 풀에 반납
+        dbm.DBClose()
     store_dic = {
         's_idx': data.get('s_idx'),
         'name': data.get('s_name'),
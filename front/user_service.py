@@ -3,7 +3,9 @@ from dotenv import load_dotenv
 import os
 
 load_dotenv()
-dbm = DBManager()
+
+def get_dbm():
+    return DBManager()
 
 host = os.environ.get('host')
 port = int(os.environ.get('port', 3306))
@@ -13,10 +15,11 @@ dbName = os.environ.get('dbname')
 
 def get_user_birthdate(u_idx):
     """회원 IDX로 생년월일 조회"""
-    try :
-        dbm.DBOpen(host, id, pw, dbName, port)
-    except :
+    # 호출마다 별도 DBManager 사용 (여러 스레드가 동시에 호출해도 커서가 섞이지 않음)
+    dbm = get_dbm()
+    if not dbm.DBOpen(host, id, pw, dbName, port):
         print("DB연결 실패")
+        return None
     try :
         sql = "SELECT u_dob, u_name FROM user WHERE u_idx = %s AND is_active = TRUE"
         dbm.OpenSQL(sql, (u_idx))
@@ -0,0 +1,144 @@
+"""
+날씨 백그라운드 프리페처
+- 일정 주기마다 UNIVERSITIES의 모든 대학 날씨를 동시에 조회
+- 대학별 날씨 + 음식 추천 결과를 스냅샷으로 미리 만들어 둠
+- /weather_result는 스냅샷만 읽으므로 요청 처리 중에 외부 API를 호출하지 않음
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+import reco_based_on_weather
+
+load_dotenv()
+# 갱신 주기(초)
+REFRESH_INTERVAL = float(os.getenv("WEATHER_REFRESH_INTERVAL", 300))
+# WEATHER_PREFETCH=0 이면 프리페처를 사용하지 않음 (요청 시 캐시 조회 방식 사용)
+PREFETCH_ENABLED = os.getenv("WEATHER_PREFETCH", "1") != "0"
+
+class WeatherPrefetcher:
+    def __init__(self, universities, interval):
+        self.universities = list(universities)
+        self.interval = interval
+        # 대학 이름 -> {"weather": ..., "recommendation": ..., "fetched_at": ...}
+        # 갱신할 때마다 새 dict로 통째로 교체하므로 읽을 때 lock이 필요 없음
+        self._snapshot = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.universities)),
+                                            thread_name_prefix="weather-prefetch")
+        # 메트릭
+        self._refresh_count = 0
+        self._last_refresh_at = None
+        self._last_duration = None
+        self._max_duration = 0.0
+        self._total_duration = 0.0
+        self._failures = {name: 0 for name in self.universities}
+        self._last_errors = {}
+
+    def start(self):
+        """백그라운드 갱신 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="weather-prefetcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"날씨 프리페치 오류: {e}")
+            self._stop.wait(self.interval)
+
+    def _fetch_one(self, university_name):
+        weather = reco_based_on_weather.fetch_weather_by_university(university_name)
+        if not weather.get("success"):
+            return university_name, None, weather.get("error", "날씨 정보를 가져올 수 없습니다.")
+        recommendation = reco_based_on_weather.get_food_recommendation_by_weather(weather)
+        if not recommendation.get("success"):
+            return university_name, None, recommendation.get("error", "음식 추천을 생성할 수 없습니다.")
+        return university_name, {
+            "weather": weather,
+            "recommendation": recommendation,
+            "fetched_at": time.time()
+        }, None
+
+    def refresh(self):
+        """모든 대학의 날씨를 동시에 조회해서 스냅샷 갱신 (실패한 대학은 이전 값을 유지)"""
+        started = time.perf_counter()
+        results = list(self._executor.map(self._fetch_one, self.universities))
+
+        snapshot = dict(self._snapshot)
+        for university_name, entry, error in results:
+            if entry is None:
+                self._failures[university_name] += 1
+                self._last_errors[university_name] = error
+                continue
+            snapshot[university_name] = entry
+            self._failures[university_name] = 0
+            self._last_errors.pop(university_name, None)
+            # 요청 시 캐시 조회 경로도 최신 값을 쓰도록 같이 채워 둠
+            reco_based_on_weather.weather_cache.put(university_name, entry["weather"])
+        self._snapshot = snapshot
+
+        duration = time.perf_counter() - started
+        self._refresh_count += 1
+        self._last_refresh_at = time.time()
+        self._last_duration = duration
+        self._max_duration = max(self._max_duration, duration)
+        self._total_duration += duration
+
+    def get_snapshot(self, university_name):
+        """미리 만들어 둔 {"weather", "recommendation", "fetched_at"} 반환 (없으면 None)"""
+        return self._snapshot.get(university_name)
+
+    def metrics(self):
+        """갱신 소요 시간과 대학별 데이터 경과 시간(staleness) 반환"""
+        now = time.time()
+        snapshot = self._snapshot
+        campuses = {}
+        for university_name in self.universities:
+            entry = snapshot.get(university_name)
+            campuses[university_name] = {
+                "fetched_at": entry["fetched_at"] if entry else None,
+                "staleness_sec": round(now - entry["fetched_at"], 1) if entry else None,
+                "consecutive_failures": self._failures[university_name],
+                "last_error": self._last_errors.get(university_name)
+            }
+        return {
+            "running": self.is_running(),
+            "interval_sec": self.interval,
+            "refresh_count": self._refresh_count,
+            "last_refresh_at": self._last_refresh_at,
+            "last_refresh_duration_ms": round(self._last_duration * 1000, 1) if self._last_duration is not None else None,
+            "max_refresh_duration_ms": round(self._max_duration * 1000, 1),
+            "avg_refresh_duration_ms": round(self._total_duration / self._refresh_count * 1000, 1) if self._refresh_count else None,
+            "campuses": campuses
+        }
+
+prefetcher = WeatherPrefetcher(reco_based_on_weather.UNIVERSITIES, REFRESH_INTERVAL)
+
+def start():
+    """환경 변수로 꺼져 있지 않고 API 키가 있으면 프리페처 시작"""
+    if PREFETCH_ENABLED and reco_based_on_weather.API_KEY:
+        prefetcher.start()
+
+def is_running():
+    return prefetcher.is_running()
+
+def get_snapshot(university_name):
+    return prefetcher.get_snapshot(university_name)
+
+def metrics():
+    return prefetcher.metrics()
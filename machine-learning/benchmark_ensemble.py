@@ -0,0 +1,265 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import subprocess
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+import ensemble_biased_labling as labeling
+from train_pipeline import peak_rss_mb
+
+# ---------------------------------------------------------
+# 앙상블 라벨링 처리량 / 지연시간 벤치마크
+# - raw/*_test.csv 리뷰로 배치 크기 × 최대 길이 조합마다 예측 시간을 측정
+# - 스레드 설정은 TF가 한 번 초기화되면 바꿀 수 없으므로 설정마다 별도 프로세스에서 실행
+#   (최대 메모리(RSS)와 모델 로드 시간도 설정별로 따로 측정됨)
+# - 결과: reviews/sec, 리뷰당 지연시간 p50/p95 (배치가 끝나야 결과가 나오므로 배치 시간 기준), 최대 RSS, 로드 시간
+# - --weights random이면 학습된 .h5 없이 무작위 가중치 DistilBERT로 측정 (오프라인 가능)
+#
+#   python benchmark_ensemble.py --weights random
+#   python benchmark_ensemble.py --weights trained --batch-sizes 1,16,32 --max-lens 64,128 --threads 0:0,4:1
+#   python benchmark_ensemble.py --compare benchmark_results/a.json benchmark_results/b.json
+# ---------------------------------------------------------
+
+RAW_DATA_PATH = './raw/'
+RESULT_PATH = './benchmark_results/'
+
+BATCH_SIZES = [1, 8, 32]
+MAX_LENS = [64, 128, 256]
+# "intra_op:inter_op" (0이면 TF 기본값)
+THREAD_SETTINGS = ['0:0']
+NUM_REVIEWS = 256
+WARMUP_BATCHES = 2
+
+# 무작위 가중치 모델에 쓸 monologg/distilkobert 구조 (설정을 받을 수 없을 때)
+DISTILKOBERT_CONFIG = {
+    'vocab_size': 8002,
+    'dim': 768,
+    'n_layers': 3,
+    'n_heads': 12,
+    'hidden_dim': 3072,
+    'max_position_embeddings': 512,
+    'pad_token_id': 1
+}
+
+class OfflineTokenizer:
+    """토크나이저를 받을 수 없을 때 쓰는 글자 단위 대체 토크나이저 (길이 분포만 비슷하게 맞춤)"""
+    pad_token_id = 1
+    cls_token_id = 2
+    sep_token_id = 3
+
+    def __init__(self, vocab_size=DISTILKOBERT_CONFIG['vocab_size']):
+        self.vocab_size = vocab_size
+
+    def __call__(self, texts, truncation=True, max_length=512, **kwargs):
+        input_ids = []
+        for text in texts:
+            ids = [5 + (ord(ch) % (self.vocab_size - 5)) for ch in text if not ch.isspace()]
+            input_ids.append([self.cls_token_id] + ids[:max_length - 2] + [self.sep_token_id])
+        return {'input_ids': input_ids}
+
+def load_reviews(num_reviews, seed=42):
+    """raw/*_test.csv 리뷰를 합쳐서 중복 제거 후 num_reviews개 샘플링 (모자라면 반복)"""
+    files = sorted(glob.glob(os.path.join(RAW_DATA_PATH, '*_test.csv')))
+    if not files:
+        print(f"[비상] 테스트 파일이 없습니다: {RAW_DATA_PATH}*_test.csv")
+        sys.exit(1)
+    reviews = pd.concat([pd.read_csv(path, sep='\t') for path in files])['review'].dropna().drop_duplicates()
+    rng = np.random.default_rng(seed)
+    return rng.choice(reviews.values, size=num_reviews, replace=len(reviews) < num_reviews).tolist()
+
+def load_tokenizer_or_offline():
+    try:
+        return labeling.load_tokenizer(), labeling.MODEL_NAME
+    except Exception as e:
+        print(f"  [경고] 토크나이저를 불러올 수 없어서 글자 단위 대체 토크나이저를 사용합니다: {e}")
+        return OfflineTokenizer(), 'offline'
+
+def build_random_models(count):
+    """무작위 가중치 DistilKoBERT + 감정 헤드 모델 count개 (ensemble 모델과 같은 구조)"""
+    from transformers import AutoConfig, DistilBertConfig, TFDistilBertModel
+    from train_emotion import DistilBertLayer, build_improved_model
+
+    try:
+        config = AutoConfig.from_pretrained(labeling.MODEL_NAME)
+    except Exception:
+        config = DistilBertConfig(**DISTILKOBERT_CONFIG)
+
+    models = {}
+    for emotion_name in list(labeling.EMOTION_FILES)[:count]:
+        tf.keras.backend.clear_session()
+        models[emotion_name] = build_improved_model(DistilBertLayer(TFDistilBertModel(config)))
+    return models
+
+def percentile_ms(values, q):
+    return round(float(np.percentile(values, q)) * 1000, 2)
+
+def run_setting(args, intra_op, inter_op):
+    """현재 프로세스에서 스레드 설정 하나로 모든 배치 크기 × 길이 조합 측정"""
+    labeling.configure_threads(intra_op, inter_op)
+    labeling.reset_seeds()
+    tokenizer, tokenizer_name = load_tokenizer_or_offline()
+    texts = load_reviews(args.num_reviews)
+
+    started = time.perf_counter()
+    if args.weights == 'random':
+        models = build_random_models(args.models)
+    else:
+        models = labeling.load_models(args.multihead, args.tflite, intra_op or None)
+    load_sec = time.perf_counter() - started
+    rss_after_load = peak_rss_mb()
+
+    pad_id = tokenizer.pad_token_id or 0
+    results = []
+    for max_len in args.max_lens:
+        id_lists = labeling.tokenize_reviews(texts, tokenizer, max_len)
+        for batch_size in args.batch_sizes:
+            batches = labeling.make_batches([len(ids) for ids in id_lists], batch_size, not args.no_sort)
+            padded = []
+            for batch in batches:
+                inputs = labeling.pad_batch([id_lists[i] for i in batch], pad_id)
+                if args.fixed_length:
+                    # 배치 길이와 상관없이 max_len까지 패딩 (동적 패딩 효과 비교용)
+                    width = inputs['input_ids'].shape[1]
+                    inputs = {key: np.pad(value, ((0, 0), (0, max(max_len - width, 0))),
+                                          constant_values=pad_id if key == 'input_ids' else 0)
+                              for key, value in inputs.items()}
+                padded.append(inputs)
+
+            for inputs in padded[:WARMUP_BATCHES]:
+                labeling.predict_raw_scores_batch(inputs, models)
+
+            latencies = []
+            total_started = time.perf_counter()
+            for inputs in padded:
+                batch_started = time.perf_counter()
+                labeling.predict_raw_scores_batch(inputs, models)
+                latencies.append(time.perf_counter() - batch_started)
+            total_sec = time.perf_counter() - total_started
+
+            tokens = sum(inputs['input_ids'].size for inputs in padded)
+            real_tokens = sum(int(inputs['attention_mask'].sum()) for inputs in padded)
+            result = {
+                'batch_size': batch_size,
+                'max_len': max_len,
+                'reviews': len(texts),
+                'reviews_per_sec': round(len(texts) / total_sec, 2),
+                'latency_ms_p50': percentile_ms(latencies, 50),
+                'latency_ms_p95': percentile_ms(latencies, 95),
+                'padding_ratio': round(1 - real_tokens / tokens, 4),
+                'peak_rss_mb': round(peak_rss_mb(), 1)
+            }
+            results.append(result)
+            print(f"  - batch {batch_size:>3} / max_len {max_len:>3}: {result['reviews_per_sec']:>8.1f} reviews/sec, "
+                  f"p50 {result['latency_ms_p50']}ms, p95 {result['latency_ms_p95']}ms, "
+                  f"패딩 {result['padding_ratio'] * 100:.0f}%", file=sys.stderr)
+
+    return {
+        'intra_op': intra_op,
+        'inter_op': inter_op,
+        'tokenizer': tokenizer_name,
+        'model_load_sec': round(load_sec, 2),
+        'rss_after_load_mb': round(rss_after_load, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'results': results
+    }
+
+def parse_int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+def setting_argv(args, setting):
+    """스레드 설정 하나를 자식 프로세스로 실행할 인자"""
+    argv = [sys.executable, os.path.abspath(__file__), '--run-setting', setting,
+            '--weights', args.weights, '--models', str(args.models), '--num-reviews', str(args.num_reviews),
+            '--batch-sizes', ','.join(map(str, args.batch_sizes)), '--max-lens', ','.join(map(str, args.max_lens))]
+    for flag in ['multihead', 'tflite', 'fixed_length', 'no_sort']:
+        if getattr(args, flag):
+            argv.append('--' + flag.replace('_', '-'))
+    return argv
+
+def compare(paths):
+    """저장한 결과 JSON 두 개 이상을 설정별 reviews/sec로 비교 출력"""
+    runs = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            runs.append(json.load(f))
+    print("설정(threads / batch / max_len)".ljust(34) + "".join(os.path.basename(p)[:18].rjust(20) for p in paths))
+    keys = []
+    for run in runs:
+        for setting in run['settings']:
+            for result in setting['results']:
+                key = (setting['intra_op'], setting['inter_op'], result['batch_size'], result['max_len'])
+                if key not in keys:
+                    keys.append(key)
+    for key in keys:
+        row = f"{key[0]}:{key[1]} / {key[2]} / {key[3]}".ljust(34)
+        for run in runs:
+            value = next((r['reviews_per_sec'] for s in run['settings'] for r in s['results']
+                          if (s['intra_op'], s['inter_op'], r['batch_size'], r['max_len']) == key), None)
+            row += (f"{value:.1f}" if value is not None else "-").rjust(20)
+        print(row)
+
+def main():
+    parser = argparse.ArgumentParser(description="앙상블 라벨링 처리량 / 지연시간 벤치마크")
+    parser.add_argument('--weights', choices=['random', 'trained'], default='random',
+                        help="random: 무작위 가중치 (학습된 .h5 불필요), trained: ensemble_biased_labling의 PATH 모델")
+    parser.add_argument('--models', type=int, default=len(labeling.EMOTION_FILES), help="무작위 모델 개수")
+    parser.add_argument('--multihead', action='store_true', help="(trained) 멀티헤드 모델")
+    parser.add_argument('--tflite', action='store_true', help="(trained) TFLite 모델")
+    parser.add_argument('--batch-sizes', type=parse_int_list, default=BATCH_SIZES)
+    parser.add_argument('--max-lens', type=parse_int_list, default=MAX_LENS)
+    parser.add_argument('--threads', default=','.join(THREAD_SETTINGS), help="intra:inter 목록 (예: 0:0,4:1,8:2)")
+    parser.add_argument('--num-reviews', type=int, default=NUM_REVIEWS)
+    parser.add_argument('--fixed-length', action='store_true', help="동적 패딩 대신 max_len까지 패딩")
+    parser.add_argument('--no-sort', action='store_true', help="길이순 배치 구성 끄기")
+    parser.add_argument('--output', default=None, help="결과 JSON 경로 (기본: benchmark_results/bench_시각.json)")
+    parser.add_argument('--compare', nargs='+', help="저장한 결과 JSON 비교")
+    parser.add_argument('--run-setting', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return
+
+    if args.run_setting:
+        # 자식 프로세스: 측정 결과를 stdout에 JSON 한 줄로 출력 (진행 상황은 stderr)
+        intra_op, inter_op = (int(v) for v in args.run_setting.split(':'))
+        print(json.dumps(run_setting(args, intra_op, inter_op)))
+        return
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'host': {'platform': platform.platform(), 'cpu_count': os.cpu_count(), 'python': platform.python_version(),
+                 'tensorflow': tf.__version__},
+        'config': {'weights': args.weights, 'models': args.models, 'multihead': args.multihead,
+                   'tflite': args.tflite, 'num_reviews': args.num_reviews, 'fixed_length': args.fixed_length,
+                   'sorted_batches': not args.no_sort, 'pad_multiple': labeling.PAD_MULTIPLE},
+        'settings': []
+    }
+    for setting in args.threads.split(','):
+        print(f"\n[threads {setting}] 측정 중...")
+        proc = subprocess.run(setting_argv(args, setting), stdout=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            print(f"  [오류] threads {setting} 측정 실패 (exit {proc.returncode})")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"  - 모델 로드 {result['model_load_sec']}초, 최대 메모리 {result['peak_rss_mb']}MB")
+        report['settings'].append(result)
+
+    if not report['settings']:
+        print("\n[비상] 측정 결과가 하나도 없습니다!")
+        sys.exit(1)
+
+    output = args.output or os.path.join(RESULT_PATH, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {output}")
+
+if __name__ == '__main__':
+    main()
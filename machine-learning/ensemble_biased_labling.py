@@ -1,11 +1,17 @@
 import os
+import json
 import random
+import argparse
+import time
+import multiprocessing
 import numpy as np
 import pandas as pd
 import tensorflow as tf
 from soynlp.normalizer import repeat_normalize
 from transformers import AutoTokenizer, TFDistilBertModel
 from tqdm import tqdm
+import tokenize_cache
+import score_cache
 
 # 실행할 때마다 결과가 똑같이 나오도록 해쉬값을 고정합니다.
 def reset_seeds(seed=42):
@@ -14,14 +20,18 @@ def reset_seeds(seed=42):
     np.random.seed(seed)
     random.seed(seed)
 
-reset_seeds() # 함수 실행
-
 MAX_LEN = 512
 MODEL_NAME = "monologg/distilkobert"
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+
+# 한 번에 모델에 넣을 리뷰 수
+BATCH_SIZE = 32
+# 배치 길이를 이 배수로 올림 (배치마다 길이가 조금씩 달라서 생기는 그래프 재생성을 줄임)
+PAD_MULTIPLE = 8
 
 # 실제 리뷰가 있는 폴더
 PATH = "./12_16_good_result/"
+FILEPATH = f'{PATH}review.csv'
+OUTPUT_PATH = f'{PATH}result_data.csv'
 
 # 감정별 모델 가중치 파일 경로
 EMOTION_FILES = {
@@ -33,6 +43,45 @@ EMOTION_FILES = {
     '불만(Complaint)': f'{PATH}complaint_model.h5'
 }
 
+# 병렬 라벨링 (--workers) 기본값: 워커 프로세스 수, 워커당 TF 스레드 수 (None이면 TF 기본값)
+WORKERS = 1
+INTRA_OP_THREADS = None
+INTER_OP_THREADS = None
+
+# 스트리밍 모드(--chunk-size)에서 한 번에 읽어서 라벨링 / 저장할 행 수
+CHUNK_SIZE = 10000
+
+# True면 공유 인코더 + 6개 헤드 모델(multihead_model.py로 학습) 하나로 라벨링
+# (리뷰당 forward 1번, 모델 메모리도 1개분)
+USE_MULTIHEAD = False
+MULTIHEAD_FILE = f'{PATH}multihead_model.h5'
+
+# True면 export_tflite.py로 변환한 int8 양자화 TFLite 모델({감정}_model.tflite)로 라벨링 (CPU용)
+USE_TFLITE = False
+
+# 퍼센트 조절
+BIAS_SCORES = {
+    '희(Happy)': -0.05,
+    '노(Angry)': 0.1,
+    '애(Sad)': -0.05,
+    '애(Love)': 0.03,
+    '락(Fun)': 0.0,
+    '불만(Complaint)': 0.2
+}
+
+THRESHOLD = 0.5
+NO_EMOTION = "무감정/모름"
+
+# 최종 감정 -> r_label 값
+LABEL_CODES = {
+    '희(Happy)': 1,
+    '노(Angry)': 2,
+    '애(Sad)': 3,
+    '애(Love)': 4,
+    '락(Fun)': 5,
+    '불만(Complaint)': 9
+}
+
 class DistilBertLayer(tf.keras.layers.Layer):
     def __init__(self, model_name, **kwargs):
         super().__init__(**kwargs)
@@ -48,9 +97,13 @@ def clean_text(text):
     if not isinstance(text, str): return ""
     return repeat_normalize(text, num_repeats=2)
 
+def load_tokenizer():
+    return AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+
 def build_model():
-    input_ids = tf.keras.layers.Input(shape=(MAX_LEN,), dtype=tf.int32, name="input_ids")
-    attention_mask = tf.keras.layers.Input(shape=(MAX_LEN,), dtype=tf.int32, name="attention_mask")
+    # 길이를 None으로 두어 배치마다 가장 긴 리뷰 길이까지만 패딩해서 넣을 수 있게 함
+    input_ids = tf.keras.layers.Input(shape=(None,), dtype=tf.int32, name="input_ids")
+    attention_mask = tf.keras.layers.Input(shape=(None,), dtype=tf.int32, name="attention_mask")
 
     bert_layer = DistilBertLayer(MODEL_NAME)
     last_hidden_state = bert_layer([input_ids, attention_mask])
@@ -93,80 +146,411 @@ def load_all_emotion_models(emotion_files):
 
     return loaded_models
 
-my_models = load_all_emotion_models(EMOTION_FILES)
+def load_tflite_models(emotion_files, num_threads=None):
+    """{감정}_model.h5 옆의 {감정}_model.tflite를 로드 (Keras 모델과 같은 방식으로 호출 가능)"""
+    from tflite_model import TFLiteModel, tflite_path
 
-# 3. 통합 예측 함수
-def predict_multi_emotion(text, models, tokenizer):
-    cleaned_text = clean_text(text)
-    encodings = tokenizer(cleaned_text, truncation=True, padding='max_length', max_length=MAX_LEN, return_token_type_ids=False, return_tensors='tf')
-    inputs = {'input_ids': encodings['input_ids'], 'attention_mask': encodings['attention_mask']}
-
-    # 퍼센트 조절
-    BIAS_SCORES = {
-        '희(Happy)': -0.05,
-        '노(Angry)': 0.1,
-        '애(Sad)': -0.05,
-        '애(Love)': 0.03,
-        '락(Fun)': 0.0,
-        '불만(Complaint)': 0.2
-    }
-
-    scores = {}
-    # print(f"\n[상세 점수표] 문장: {text[:20]}...")
-    for emotion_name, model in models.items():
+    loaded_models = {}
+    print(f"[시스템] 총 {len(emotion_files)}개의 TFLite 감정 모델을 로드합니다...")
+    for emotion_name, file_path in emotion_files.items():
+        model_path = tflite_path(file_path)
+        if not os.path.exists(model_path):
+            print(f"  [경고] 파일이 없습니다: {model_path} (export_tflite.py로 먼저 변환하세요)")
+            continue
         try:
-            pred = model(inputs, training=False)
-            raw_prob = float(pred[0][0])
+            loaded_models[emotion_name] = TFLiteModel(model_path, num_threads)
+            print(f"  - 로드 성공: {emotion_name}")
+        except Exception as e:
+            print(f"  [치명적 오류] {emotion_name} 모델 로드 실패: {e}")
 
-            bias = BIAS_SCORES.get(emotion_name, 0.0)
-            final_prob = max(0.0, min(1.0, raw_prob + bias))
+    if not loaded_models:
+        print("\n[비상] 로드된 모델이 하나도 없습니다!")
+        exit()
 
-            scores[emotion_name] = round(final_prob, 4)
-            # bar = "■" * int(final_prob * 10)
-            # print(f"  - {emotion_name}: {final_prob:.4f} (원점수: {raw_prob:.4f}) {bar}")
+    return loaded_models
 
+def load_models(use_multihead=USE_MULTIHEAD, use_tflite=USE_TFLITE, num_threads=None):
+    """라벨링에 쓸 모델 로드 (멀티헤드면 모델 1개, 아니면 감정별 모델 dict)"""
+    if use_tflite:
+        return load_tflite_models(EMOTION_FILES, num_threads)
+    if use_multihead:
+        import multihead_model
+        print(f"[시스템] 공유 인코더 멀티헤드 모델을 로드합니다: {MULTIHEAD_FILE}")
+        if not os.path.exists(MULTIHEAD_FILE):
+            print(f"\n[비상] 파일이 없습니다: {MULTIHEAD_FILE}")
+            exit()
+        return multihead_model.load_multihead_model(MULTIHEAD_FILE, None)
+    return load_all_emotion_models(EMOTION_FILES)
+
+# ---------------------------------------------------------
+# 배치 라벨링 엔진
+# 1) 패딩 없이 토크나이징 → 2) 길이순으로 정렬해 비슷한 길이끼리 배치 구성
+# 3) 배치 안에서 가장 긴 길이까지만 패딩 → 4) 모델마다 배치당 한 번 호출
+# ---------------------------------------------------------
+def tokenize_reviews(texts, tokenizer, max_len=MAX_LEN):
+    """정규화 + 토크나이징 (패딩 없음), 리뷰별 input_ids 리스트 반환"""
+    encodings = tokenizer([clean_text(text) for text in texts], truncation=True, max_length=max_len,
+                          return_token_type_ids=False, return_attention_mask=False)
+    return encodings['input_ids']
+
+def make_batches(lengths, batch_size=BATCH_SIZE, sort_by_length=True):
+    """리뷰 인덱스를 배치로 나눔 (sort_by_length면 길이순으로 묶어서 패딩을 최소화)"""
+    order = np.argsort(lengths, kind='stable') if sort_by_length else np.arange(len(lengths))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+def pad_batch(id_lists, pad_id=0, pad_multiple=PAD_MULTIPLE):
+    """배치에서 가장 긴 길이(pad_multiple 배수로 올림)까지만 패딩"""
+    longest = max(len(ids) for ids in id_lists)
+    width = -(-longest // pad_multiple) * pad_multiple if pad_multiple else longest
+    width = min(width, MAX_LEN)
+    input_ids = np.full((len(id_lists), width), pad_id, dtype=np.int32)
+    attention_mask = np.zeros((len(id_lists), width), dtype=np.int32)
+    for row, ids in enumerate(id_lists):
+        input_ids[row, :len(ids)] = ids
+        attention_mask[row, :len(ids)] = 1
+    return {'input_ids': input_ids, 'attention_mask': attention_mask}
+
+def predict_raw_scores_batch(inputs, models):
+    """배치 하나의 감정별 원점수 반환 [{'희(Happy)': 0.93, ...}, ...], 모델이 하나라도 실패하면 None"""
+    if not isinstance(models, dict):
+        import multihead_model
+        return multihead_model.predict_raw_scores(models, inputs)
+
+    batch_size = len(inputs['input_ids'])
+    raw_scores = [{} for _ in range(batch_size)]
+    for emotion_name, model in models.items():
+        try:
+            preds = np.asarray(model(inputs, training=False))[:, 0]
         except Exception as e:
-            scores[emotion_name] = 0.0
+            # 0점으로 채우면 점수 캐시에 잘못된 점수가 남으므로 배치 전체를 실패로 돌려줌
+            print(f"  [오류] {emotion_name} 예측 실패: {e}")
+            return None
+        for row, raw_prob in enumerate(preds):
+            raw_scores[row][emotion_name] = float(raw_prob)
+    return raw_scores
+
+def apply_bias(raw_scores):
+    """원점수에 BIAS_SCORES를 더해 (1순위 감정, 점수, 감정별 점수) 반환"""
+    scores = {}
+    for emotion_name, raw_prob in raw_scores.items():
+        bias = BIAS_SCORES.get(emotion_name, 0.0)
+        scores[emotion_name] = round(max(0.0, min(1.0, raw_prob + bias)), 4)
 
     if not scores: return "에러", 0.0, {}
     best_emotion = max(scores, key=scores.get)
-    best_score = scores[best_emotion]
-    return best_emotion, best_score, scores
-
-# [테스트 실행 및 CSV 저장]
-print("\n[다중 감정 분석 테스트]")
-FILEPATH = './12_16_good_result/review.csv'
-data = pd.read_csv(FILEPATH)
-data = data.dropna(subset=['r_content'])
-label = []
-THRESHOLD = 0.5
-results_list = []
-
-#for text in tqdm(data['r_content'][0:50]):
-for text in tqdm(data['r_content']):
-    predicted_label, confidence, all_scores = predict_multi_emotion(text, my_models, tokenizer)
-    final_label = predicted_label
-    if confidence < THRESHOLD:
-        final_label = "무감정/모름"
-    if final_label == '희(Happy)':
-        label.append(1)
-    elif final_label == '노(Angry)':
-        label.append(2)
-    elif final_label == '애(Sad)':
-        label.append(3)
-    elif final_label == '애(Love)':
-        label.append(4)
-    elif final_label == '락(Fun)':
-        label.append(5)
-    elif final_label == '불만(Complaint)':
-        label.append(9)
-    print(f"문장: {text[:50]}...")
-    print(f"👉 결과: {final_label} ({confidence*100:.2f}%)")
-    print("-" * 50)
-
-    row_data = {'리뷰내용': text, '최종예측': final_label, '확신도': f"{confidence:.2f}", '1순위감정': predicted_label}
-    row_data.update(all_scores)
-    results_list.append(row_data)
-
-data['r_label'] = pd.Series(label, dtype='Int64')
-data.to_csv('./12_16_good_result/result_data.csv', index=False, encoding='utf-8-sig', na_rep='')
+    return best_emotion, scores[best_emotion], scores
+
+def predict_batch(texts, models, tokenizer, batch_size=BATCH_SIZE, sort_by_length=True, show_progress=True,
+                  id_lists=None, pool=None, cache=None):
+    """
+    리뷰 리스트를 배치로 예측해서 입력 순서대로 (1순위 감정, 점수, 감정별 점수) 리스트 반환
+    id_lists를 주면 (토큰 캐시 등) 토크나이징을 건너뜀
+    pool을 주면 (create_worker_pool) 배치를 워커 프로세스에 나눠서 예측 (models는 사용 안 함)
+    cache를 주면 (score_cache.ScoreCache) 예측한 적 있는 리뷰는 저장된 원점수를 사용
+    """
+    # clean_text가 같은 리뷰("맛있어요" 등)는 한 번만 예측하고 결과를 나눠 줌
+    keys = [clean_text(text) for text in texts]
+    first_index = {}
+    for i, key in enumerate(keys):
+        first_index.setdefault(key, i)
+
+    raw_by_key = cache.get_many(first_index) if cache is not None else {}
+    todo = [i for key, i in first_index.items() if key not in raw_by_key]
+    if show_progress:
+        print(f"  - 리뷰 {len(texts)}개 중 고유 {len(first_index)}개, 캐시 사용 {len(raw_by_key)}개, 모델 예측 {len(todo)}개")
+
+    if todo:
+        if id_lists is None:
+            todo_ids = tokenize_reviews([texts[i] for i in todo], tokenizer)
+        else:
+            todo_ids = [id_lists[i] for i in todo]
+        pad_id = tokenizer.pad_token_id or 0
+        batches = make_batches([len(ids) for ids in todo_ids], batch_size, sort_by_length)
+
+        if pool is not None:
+            # imap은 보낸 순서대로 결과를 돌려주므로 배치 순서 = 결과 순서
+            batch_scores = pool.imap(_predict_in_worker, ([todo_ids[i] for i in batch] for batch in batches))
+        else:
+            batch_scores = (predict_raw_scores_batch(pad_batch([todo_ids[i] for i in batch], pad_id), models)
+                            for batch in batches)
+
+        new_scores = {}
+        failed = 0
+        for batch, raw_batch in tqdm(zip(batches, batch_scores), total=len(batches), desc="라벨링",
+                                     disable=not show_progress):
+            if raw_batch is None:
+                failed += len(batch)
+                continue
+            for i, raw_scores in zip(batch, raw_batch):
+                new_scores[keys[todo[i]]] = raw_scores
+        if failed:
+            print(f"  [오류] 예측 실패 {failed}개는 '에러'로 표시 (캐시에 저장하지 않음)")
+        if cache is not None:
+            cache.put_many(new_scores)
+        raw_by_key.update(new_scores)
+
+    # 원점수에서 매번 BIAS_SCORES를 적용 (캐시에는 원점수만 저장), 예측 실패한 리뷰는 '에러'
+    return [apply_bias(raw_by_key.get(key, {})) for key in keys]
+
+# ---------------------------------------------------------
+# 병렬 라벨링 워커
+# 코어가 많은 CPU 서버에서는 TF 스레드만으로는 코어를 다 못 쓰므로
+# 워커 프로세스마다 모델을 한 번씩만 로드해 두고, 부모가 토크나이징한 배치를 나눠서 예측
+# ---------------------------------------------------------
+_worker_models = None
+_worker_pad_id = 0
+
+def configure_threads(intra_op=None, inter_op=None):
+    """TF 연산 스레드 수 설정 (모델을 만들기 전에 호출해야 적용됨)"""
+    if intra_op:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+    if inter_op:
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+
+def _init_worker(use_multihead, use_tflite, intra_op, inter_op, pad_id):
+    global _worker_models, _worker_pad_id
+    configure_threads(intra_op, inter_op)
+    reset_seeds()
+    _worker_models = load_models(use_multihead, use_tflite, intra_op)
+    _worker_pad_id = pad_id
+
+def _predict_in_worker(id_lists):
+    return predict_raw_scores_batch(pad_batch(id_lists, _worker_pad_id), _worker_models)
+
+def model_files(use_multihead=USE_MULTIHEAD, use_tflite=USE_TFLITE):
+    """load_models가 읽을 가중치 파일 경로 목록"""
+    if use_tflite:
+        from tflite_model import tflite_path
+        return [tflite_path(path) for path in EMOTION_FILES.values()]
+    if use_multihead:
+        return [MULTIHEAD_FILE]
+    return list(EMOTION_FILES.values())
+
+def open_score_cache(use_multihead=USE_MULTIHEAD, use_tflite=USE_TFLITE, path=score_cache.CACHE_PATH):
+    """현재 모델 설정의 지문으로 리뷰 점수 캐시 열기"""
+    mode = 'tflite' if use_tflite else 'multihead' if use_multihead else 'keras'
+    fingerprint = score_cache.model_fingerprint(model_files(use_multihead, use_tflite), mode, MODEL_NAME, MAX_LEN)
+    return score_cache.ScoreCache(fingerprint, path)
+
+def create_worker_pool(workers, tokenizer, use_multihead=USE_MULTIHEAD, use_tflite=USE_TFLITE,
+                       intra_op=INTRA_OP_THREADS, inter_op=INTER_OP_THREADS):
+    """워커마다 모델을 한 번 로드하는 프로세스 풀 생성"""
+    # 워커 초기화에서 모델 로드가 실패하면 풀이 워커를 계속 다시 띄우므로 파일부터 확인
+    if not any(os.path.exists(path) for path in model_files(use_multihead, use_tflite)):
+        print("\n[비상] 로드할 모델 파일이 하나도 없습니다!")
+        exit()
+    print(f"[시스템] 워커 {workers}개를 시작합니다 (워커당 intra_op={intra_op}, inter_op={inter_op})")
+    # fork는 부모의 TF 런타임 상태를 복사해서 멈출 수 있으므로 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    return context.Pool(workers, initializer=_init_worker,
+                        initargs=(use_multihead, use_tflite, intra_op, inter_op, tokenizer.pad_token_id or 0))
+
+# 3. 통합 예측 함수 (리뷰 한 개)
+def predict_multi_emotion(text, models, tokenizer):
+    return predict_batch([text], models, tokenizer, batch_size=1, show_progress=False)[0]
+
+def to_label(best_emotion, confidence, threshold=THRESHOLD):
+    """최종 감정 이름과 r_label 값 반환 (임계값 미만이면 무감정, 라벨 없음)"""
+    final_label = best_emotion if confidence >= threshold else NO_EMOTION
+    return final_label, LABEL_CODES.get(final_label)
+
+def label_dataframe(data, models, tokenizer, batch_size=BATCH_SIZE, sort_by_length=True, verbose=False,
+                    id_lists=None, pool=None, cache=None):
+    """data['r_content']를 라벨링해서 r_label 컬럼을 붙인 DataFrame과 리뷰별 상세 결과 반환"""
+    texts = data['r_content'].tolist()
+    predictions = predict_batch(texts, models, tokenizer, batch_size, sort_by_length, id_lists=id_lists, pool=pool,
+                                cache=cache)
+
+    label = []
+    results_list = []
+    for text, (predicted_label, confidence, all_scores) in zip(texts, predictions):
+        final_label, code = to_label(predicted_label, confidence)
+        # 무감정이어도 자리를 채워서 리뷰와 라벨 순서가 어긋나지 않게 함
+        label.append(code)
+        if verbose:
+            print(f"문장: {text[:50]}...")
+            print(f"👉 결과: {final_label} ({confidence*100:.2f}%)")
+            print("-" * 50)
+
+        row_data = {'리뷰내용': text, '최종예측': final_label, '확신도': f"{confidence:.2f}", '1순위감정': predicted_label}
+        row_data.update(all_scores)
+        results_list.append(row_data)
+
+    data = data.copy()
+    data['r_label'] = pd.Series(label, index=data.index, dtype='Int64')
+    return data, results_list
+
+# ---------------------------------------------------------
+# 스트리밍 라벨링 (대용량 CSV)
+# - chunk_size행씩 읽어서 라벨링하고 바로 출력 파일 뒤에 이어서 저장
+# - 청크를 저장할 때마다 체크포인트(완료한 청크 수, 출력 파일 크기)를 기록
+# - --resume이면 출력 파일을 체크포인트 크기로 자르고 다음 청크부터 이어서 라벨링
+# ---------------------------------------------------------
+def checkpoint_path(output_path):
+    return f"{output_path}.ckpt.json"
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"  [경고] 체크포인트를 읽을 수 없습니다: {path} ({e})")
+        return None
+
+def save_checkpoint(path, checkpoint):
+    # 중간에 죽어도 체크포인트 파일이 깨지지 않도록 임시 파일에 쓰고 교체
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def append_chunk(data, output_path, write_header):
+    """라벨링한 청크를 출력 파일 뒤에 붙이고 디스크에 기록한 뒤 파일 크기 반환"""
+    # BOM은 파일 맨 앞(헤더)에만 들어가야 하므로 이어 쓸 때는 utf-8
+    with open(output_path, 'w' if write_header else 'a', encoding='utf-8-sig' if write_header else 'utf-8',
+              newline='') as f:
+        data.to_csv(f, index=False, header=write_header, na_rep='')
+        f.flush()
+        os.fsync(f.fileno())
+    return os.path.getsize(output_path)
+
+def label_csv_streaming(input_path, output_path, models, tokenizer, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE,
+                        sort_by_length=True, verbose=False, limit=None, resume=False, pool=None,
+                        cache=None):
+    """CSV를 chunk_size행씩 라벨링해서 이어 쓰기, 라벨링한 리뷰 수 반환"""
+    ckpt_path = checkpoint_path(output_path)
+    job = {'input': os.path.abspath(input_path), 'input_sha256': tokenize_cache.file_hash(input_path),
+           'chunk_size': chunk_size, 'limit': limit}
+    checkpoint = dict(job, chunks_done=0, rows_done=0, output_bytes=0, completed=False)
+
+    if resume:
+        saved = load_checkpoint(ckpt_path)
+        if saved is None:
+            print("  [안내] 체크포인트가 없어서 처음부터 라벨링합니다")
+        elif any(saved.get(key) != value for key, value in job.items()):
+            print("\n[비상] 체크포인트의 입력 파일 / chunk_size / limit이 현재 실행과 다릅니다. --resume 없이 다시 실행하세요.")
+            exit()
+        elif saved.get('completed'):
+            print(f"[완료] 이미 라벨링이 끝난 파일입니다: {output_path}")
+            return 0
+        elif saved['output_bytes'] and (not os.path.exists(output_path)
+                                        or os.path.getsize(output_path) < saved['output_bytes']):
+            print(f"\n[비상] 출력 파일이 없거나 체크포인트보다 작습니다: {output_path}. --resume 없이 다시 실행하세요.")
+            exit()
+        else:
+            checkpoint = saved
+            # 마지막 체크포인트 이후에 쓰다 만 부분은 잘라냄 (아직 쓴 게 없으면 다음 청크가 헤더부터 새로 씀)
+            if checkpoint['output_bytes']:
+                with open(output_path, 'r+b') as f:
+                    f.truncate(checkpoint['output_bytes'])
+            print(f"  [이어하기] {checkpoint['chunks_done']}개 청크({checkpoint['rows_done']}개 리뷰) 건너뜀")
+
+    started = time.perf_counter()
+    labeled = 0
+    reader = pd.read_csv(input_path, chunksize=chunk_size)
+    for chunk_index, chunk in enumerate(reader):
+        if chunk_index < checkpoint['chunks_done']:
+            continue
+        chunk = chunk.dropna(subset=['r_content'])
+        if limit is not None:
+            chunk = chunk.head(max(limit - checkpoint['rows_done'], 0))
+
+        # 빈 청크는 쓰지 않음 (라벨 / 점수 컬럼 없이 헤더가 먼저 써지면 뒤 청크와 컬럼이 어긋남)
+        if len(chunk):
+            chunk, _ = label_dataframe(chunk, models, tokenizer, batch_size, sort_by_length, verbose, pool=pool,
+                                       cache=cache)
+            checkpoint['output_bytes'] = append_chunk(chunk, output_path,
+                                                      write_header=checkpoint['output_bytes'] == 0)
+        checkpoint['chunks_done'] = chunk_index + 1
+        checkpoint['rows_done'] += len(chunk)
+        save_checkpoint(ckpt_path, checkpoint)
+
+        labeled += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"  - 청크 {chunk_index + 1}: 누적 {checkpoint['rows_done']}개 저장 "
+              f"({labeled / max(elapsed, 1e-9):.1f} reviews/sec)")
+        if limit is not None and checkpoint['rows_done'] >= limit:
+            break
+
+    checkpoint['completed'] = True
+    save_checkpoint(ckpt_path, checkpoint)
+    return labeled
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰 CSV 감정 라벨링")
+    parser.add_argument('--input', default=FILEPATH, help="r_content 컬럼이 있는 리뷰 CSV")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="r_label 컬럼을 붙여 저장할 CSV")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--no-sort', action='store_true', help="길이순 배치 구성을 끄고 입력 순서대로 배치")
+    parser.add_argument('--multihead', action='store_true', default=USE_MULTIHEAD, help="멀티헤드 모델 사용")
+    parser.add_argument('--tflite', action='store_true', default=USE_TFLITE, help="int8 양자화 TFLite 모델 사용")
+    parser.add_argument('--limit', type=int, default=None, help="앞에서부터 N개만 라벨링 (테스트용)")
+    parser.add_argument('--verbose', action='store_true', help="리뷰별 결과 출력")
+    parser.add_argument('--no-token-cache', action='store_true', help="토큰 디스크 캐시 사용 안 함")
+    parser.add_argument('--chunk-size', type=int, nargs='?', const=CHUNK_SIZE, default=None,
+                        help=f"N행씩 읽어서 라벨링하고 바로 저장 (스트리밍, 값 생략 시 {CHUNK_SIZE})")
+    parser.add_argument('--resume', action='store_true', help="스트리밍 모드에서 체크포인트 이후 청크부터 이어서 라벨링")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="라벨링 워커 프로세스 수 (워커마다 모델을 한 번씩 로드)")
+    parser.add_argument('--intra-op', type=int, default=INTRA_OP_THREADS, help="프로세스당 TF intra-op 스레드 수")
+    parser.add_argument('--inter-op', type=int, default=INTER_OP_THREADS, help="프로세스당 TF inter-op 스레드 수")
+    parser.add_argument('--score-cache', default=score_cache.CACHE_PATH, help="리뷰별 감정 점수 캐시 파일 (SQLite)")
+    parser.add_argument('--no-score-cache', action='store_true', help="리뷰 점수 캐시 사용 안 함 (중복 리뷰 제거는 유지)")
+    args = parser.parse_args()
+    if args.resume and not args.chunk_size:
+        args.chunk_size = CHUNK_SIZE
+
+    reset_seeds() # 함수 실행
+    tokenizer = load_tokenizer()
+    pool = None
+    my_models = None
+    if args.workers > 1:
+        # 부모는 토크나이징 / 결과 정리만 하고 모델은 워커에서만 로드
+        pool = create_worker_pool(args.workers, tokenizer, args.multihead, args.tflite, args.intra_op, args.inter_op)
+    else:
+        configure_threads(args.intra_op, args.inter_op)
+        my_models = load_models(args.multihead, args.tflite, args.intra_op)
+    # 같은 모델로 예측한 적 있는 리뷰 텍스트는 다시 예측하지 않음 (실행 간 공유)
+    cache = None if args.no_score_cache else open_score_cache(args.multihead, args.tflite, args.score_cache)
+
+    try:
+        # [라벨링 실행 및 CSV 저장]
+        print("\n[다중 감정 분석 라벨링]")
+        started = time.perf_counter()
+        if args.chunk_size:
+            # 전체를 메모리에 올리지 않고 청크 단위로 라벨링 / 저장 (토큰 디스크 캐시는 사용 안 함)
+            count = label_csv_streaming(args.input, args.output, my_models, tokenizer, args.chunk_size,
+                                        args.batch_size, not args.no_sort, args.verbose, args.limit, args.resume,
+                                        pool, cache)
+        else:
+            data = pd.read_csv(args.input)
+            data = data.dropna(subset=['r_content'])
+            if args.limit:
+                data = data.head(args.limit)
+
+            id_lists = None
+            if not args.no_token_cache:
+                # 같은 파일을 다시 라벨링할 때 (모델 / BIAS_SCORES만 바꿔서 재실행 등) 토크나이징 생략
+                id_lists = tokenize_cache.cached_tokenize(
+                    args.input, data['r_content'].tolist(), lambda texts: tokenize_reviews(texts, tokenizer),
+                    tokenizer, MODEL_NAME, MAX_LEN, f"r_content:dropna:limit={args.limit}")
+            data, _ = label_dataframe(data, my_models, tokenizer, args.batch_size, not args.no_sort, args.verbose,
+                                      id_lists, pool, cache)
+            data.to_csv(args.output, index=False, encoding='utf-8-sig', na_rep='')
+            count = len(data)
+        elapsed = time.perf_counter() - started
+        print(f"[완료] {count}개 리뷰, {elapsed:.1f}초, 워커 {args.workers}개 "
+              f"({count / max(elapsed, 1e-9):.1f} reviews/sec)")
+        if cache is not None:
+            print(f"[점수 캐시] {cache.stats()}")
+    finally:
+        if cache is not None:
+            cache.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+import ensemble_biased_labling as labeling
+from tflite_model import TFLiteModel, tflite_path
+
+# ---------------------------------------------------------
+# 감정 모델 int8 양자화(dynamic range) TFLite 내보내기 + 정확도 비교
+#   python export_tflite.py                       # processed_data/의 6개 모델 변환 + raw/*_test.csv로 비교
+#   python export_tflite.py --emotion happy --no-eval
+# 결과: {감정}_model.tflite, tflite_report.json (Keras vs TFLite 정확도 / 일치율 / 처리량 / 파일 크기)
+# ---------------------------------------------------------
+
+MODELS_PATH = './processed_data/'
+RAW_DATA_PATH = './raw/'
+EMOTIONS = ['happy', 'angry', 'sad', 'love', 'fun', 'complaint']
+# 학습할 때 MAX_LEN과 맞춤
+EVAL_MAX_LEN = 256
+REPORT_FILE = 'tflite_report.json'
+
+def load_keras_model(h5_path):
+    # 이름이 dense_1, dense_2로 바뀌지 않도록 세션 정리 후 생성
+    tf.keras.backend.clear_session()
+    model = labeling.build_model()
+    model.load_weights(h5_path, by_name=True)
+    return model
+
+def convert(model, out_path):
+    """dynamic range 양자화 (가중치 int8, 활성값은 실행 중 float) TFLite로 변환해서 저장"""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    try:
+        tflite_bytes = converter.convert()
+    except Exception as e:
+        # 기본 연산만으로 변환이 안 되면 TF 연산(Flex)을 허용해서 다시 시도
+        print(f"  [경고] 기본 연산으로 변환 실패, SELECT_TF_OPS 포함해서 재시도: {e}")
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+        tflite_bytes = converter.convert()
+    with open(out_path, 'wb') as f:
+        f.write(tflite_bytes)
+    return len(tflite_bytes)
+
+def predict_probs(model, id_lists, pad_id, batch_size):
+    """배치 예측해서 입력 순서대로 확률 배열 반환, 걸린 시간(초)도 같이 반환"""
+    probs = np.zeros(len(id_lists), dtype=np.float32)
+    started = time.perf_counter()
+    for batch in labeling.make_batches([len(ids) for ids in id_lists], batch_size):
+        inputs = labeling.pad_batch([id_lists[i] for i in batch], pad_id)
+        probs[batch] = np.asarray(model(inputs, training=False))[:, 0]
+    return probs, time.perf_counter() - started
+
+def evaluate(emotion, keras_model, tflite_model, tokenizer, batch_size, max_len):
+    test_path = os.path.join(RAW_DATA_PATH, f'{emotion}_test.csv')
+    if not os.path.exists(test_path):
+        print(f"  [경고] 테스트 파일이 없습니다: {test_path}")
+        return None
+    data = pd.read_csv(test_path, sep='\t').dropna(subset=['review', 'label'])
+    labels = data['label'].values.astype(int)
+    id_lists = labeling.tokenize_reviews(data['review'].tolist(), tokenizer, max_len)
+    pad_id = tokenizer.pad_token_id or 0
+
+    keras_probs, keras_sec = predict_probs(keras_model, id_lists, pad_id, batch_size)
+    tflite_probs, tflite_sec = predict_probs(tflite_model, id_lists, pad_id, batch_size)
+
+    result = {
+        'count': len(labels),
+        'keras_accuracy': float(np.mean((keras_probs > 0.5) == labels)),
+        'tflite_accuracy': float(np.mean((tflite_probs > 0.5) == labels)),
+        'prediction_agreement': float(np.mean((keras_probs > 0.5) == (tflite_probs > 0.5))),
+        'mean_abs_prob_diff': float(np.mean(np.abs(keras_probs - tflite_probs))),
+        'keras_reviews_per_sec': round(len(labels) / keras_sec, 1),
+        'tflite_reviews_per_sec': round(len(labels) / tflite_sec, 1)
+    }
+    print(f"  - 정확도 Keras {result['keras_accuracy']:.4f} / TFLite {result['tflite_accuracy']:.4f}, "
+          f"일치율 {result['prediction_agreement']:.4f}, "
+          f"처리량 {result['keras_reviews_per_sec']} -> {result['tflite_reviews_per_sec']} reviews/sec")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 모델 TFLite(int8 dynamic range) 변환")
+    parser.add_argument('--models-dir', default=MODELS_PATH, help="{감정}_model.h5가 있는 폴더 (.tflite도 여기에 저장)")
+    parser.add_argument('--emotion', choices=EMOTIONS, action='append', help="변환할 감정 (기본: 전부)")
+    parser.add_argument('--no-eval', action='store_true', help="raw/*_test.csv 정확도 비교 생략")
+    parser.add_argument('--batch-size', type=int, default=labeling.BATCH_SIZE)
+    parser.add_argument('--max-len', type=int, default=EVAL_MAX_LEN)
+    parser.add_argument('--threads', type=int, default=None, help="TFLite Interpreter 스레드 수")
+    args = parser.parse_args()
+
+    tokenizer = None if args.no_eval else labeling.load_tokenizer()
+    report = {'quantization': 'dynamic_range_int8', 'models': {}}
+
+    for emotion in args.emotion or EMOTIONS:
+        h5_path = os.path.join(args.models_dir, f'{emotion}_model.h5')
+        if not os.path.exists(h5_path):
+            print(f"[경고] 파일이 없습니다: {h5_path}")
+            continue
+        print(f"\n[{emotion}] 변환 중...")
+        keras_model = load_keras_model(h5_path)
+        out_path = tflite_path(h5_path)
+        tflite_bytes = convert(keras_model, out_path)
+
+        entry = {
+            'tflite_path': out_path,
+            'h5_size_mb': round(os.path.getsize(h5_path) / (1024 * 1024), 1),
+            'tflite_size_mb': round(tflite_bytes / (1024 * 1024), 1)
+        }
+        print(f"  - 저장: {out_path} ({entry['h5_size_mb']}MB -> {entry['tflite_size_mb']}MB)")
+
+        if not args.no_eval:
+            tflite_model = TFLiteModel(out_path, args.threads)
+            entry['eval'] = evaluate(emotion, keras_model, tflite_model, tokenizer, args.batch_size, args.max_len)
+        report['models'][emotion] = entry
+
+    if not report['models']:
+        print("\n[비상] 변환된 모델이 하나도 없습니다!")
+        sys.exit(1)
+
+    report_path = os.path.join(args.models_dir, REPORT_FILE)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {report_path}")
+
+if __name__ == '__main__':
+    main()
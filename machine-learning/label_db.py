@@ -0,0 +1,233 @@
+import os
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+
+import ensemble_biased_labling as labeling
+from DBManager import DBManager
+
+# ---------------------------------------------------------
+# DB 증분 라벨링
+# - emotion 행이 없는 리뷰만 골라서 배치로 라벨링하고, 감정별 점수 6개를 emotion에 한 번에 저장
+# - label_watermark 테이블에 마지막으로 처리한 r_idx를 저장해서 다음 실행은 그 이후 리뷰만 조회
+#   (크롤러는 review에 새 행만 추가하므로 실행 시간이 새 리뷰 수에 비례)
+#
+#   python label_db.py                     # 워터마크 이후 새 리뷰만
+#   python label_db.py --refresh-counts    # 라벨링한 가게의 store_emotion_count_table도 갱신
+#   python label_db.py --full              # 워터마크 무시하고 emotion이 없는 리뷰 전체 확인
+# ---------------------------------------------------------
+
+load_dotenv()
+host = os.environ.get('host')
+port = int(os.environ.get('port', 3306))
+id = os.environ.get('user')
+pw = os.environ.get('passwd')
+dbName = os.environ.get('dbname')
+
+JOB_NAME = 'ensemble_biased'
+# 한 번에 DB에서 가져와서 라벨링 / 저장할 리뷰 수
+PAGE_SIZE = 1000
+# store_emotion_count_table 갱신 시 한 번에 처리할 가게 수
+REFRESH_CHUNK = 500
+
+# 앙상블 감정 이름 -> etype.t_idx
+EMOTION_TYPE_IDX = {
+    '희(Happy)': 1,
+    '노(Angry)': 2,
+    '애(Sad)': 3,
+    '애(Love)': 4,
+    '락(Fun)': 5,
+    '불만(Complaint)': 6
+}
+
+def ensure_watermark_table(dbm):
+    sql = """
+    CREATE TABLE IF NOT EXISTS label_watermark (
+        job VARCHAR(64) NOT NULL,
+        last_r_idx INT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (job)
+    ) ENGINE=InnoDB
+    """
+    return dbm.Execute(sql) >= 0
+
+def get_watermark(dbm, job=JOB_NAME):
+    if not dbm.OpenSQL("SELECT last_r_idx FROM label_watermark WHERE job = %s", (job,)):
+        return 0
+    value = dbm.getValue(0, 'last_r_idx') if dbm.getTotal() else None
+    dbm.CloseSQL()
+    return value or 0
+
+def fetch_unlabeled(dbm, after_r_idx, limit):
+    """r_idx가 after_r_idx보다 크고 emotion 행이 없는 리뷰를 r_idx 순으로 limit개 조회"""
+    sql = """
+    SELECT r.r_idx, r.s_idx, r.r_content
+    FROM review r
+    WHERE r.r_idx > %s
+      AND r.r_content IS NOT NULL AND r.r_content <> ''
+      AND NOT EXISTS (SELECT 1 FROM emotion e WHERE e.r_idx = r.r_idx)
+    ORDER BY r.r_idx
+    LIMIT %s
+    """
+    if not dbm.OpenSQL(sql, (after_r_idx, limit)):
+        return None
+    rows = dbm.getAll() or []
+    dbm.CloseSQL()
+    return rows
+
+def save_page(dbm, rows, predictions, job=JOB_NAME):
+    """감정별 점수를 emotion에 일괄 저장하고 워터마크를 같은 트랜잭션에서 갱신"""
+    emotion_rows = []
+    for row, (_, _, scores) in zip(rows, predictions):
+        for emotion_name, score in scores.items():
+            emotion_rows.append((score, EMOTION_TYPE_IDX[emotion_name], row['r_idx']))
+
+    last_r_idx = rows[-1]['r_idx']
+    if emotion_rows and dbm.ExecuteMany("INSERT INTO emotion (e_score, t_idx, r_idx) VALUES (%s, %s, %s)", emotion_rows) < 0:
+        dbm.Rollback()
+        return False
+    watermark_sql = """
+    INSERT INTO label_watermark (job, last_r_idx) VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE last_r_idx = GREATEST(last_r_idx, VALUES(last_r_idx))
+    """
+    if dbm.Execute(watermark_sql, (job, last_r_idx)) < 0:
+        dbm.Rollback()
+        return False
+    dbm.Commit()
+    return True
+
+def refresh_store_counts(dbm, s_idx_list):
+    """지정한 가게들의 store_emotion_count_table 행을 다시 계산 (리뷰별 최고 점수 감정 기준)"""
+    if not s_idx_list:
+        return True
+    placeholders = ",".join(["%s"] * len(s_idx_list))
+    sql = f"""
+    INSERT INTO store_emotion_count_table (
+        s_idx, s_location, happy_cnt, angry_cnt, sad_cnt, love_cnt, fun_cnt, complain_cnt
+    )
+    SELECT
+        s.s_idx,
+        s.s_location,
+        SUM(CASE WHEN re.t_idx = 1 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN re.t_idx = 2 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN re.t_idx = 3 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN re.t_idx = 4 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN re.t_idx = 5 THEN 1 ELSE 0 END),
+        SUM(CASE WHEN re.t_idx = 6 THEN 1 ELSE 0 END)
+    FROM store s
+    LEFT JOIN review r ON s.s_idx = r.s_idx
+    LEFT JOIN (
+        SELECT e.r_idx, e.t_idx
+        FROM emotion e
+        INNER JOIN (
+            SELECT e2.r_idx, MAX(e2.e_score) AS max_score
+            FROM emotion e2
+            INNER JOIN review r2 ON r2.r_idx = e2.r_idx
+            WHERE r2.s_idx IN ({placeholders})
+            GROUP BY e2.r_idx
+        ) m ON e.r_idx = m.r_idx AND e.e_score = m.max_score
+    ) re ON r.r_idx = re.r_idx
+    WHERE s.s_idx IN ({placeholders})
+    GROUP BY s.s_idx, s.s_location
+    ON DUPLICATE KEY UPDATE
+        s_location = VALUES(s_location),
+        happy_cnt = VALUES(happy_cnt),
+        angry_cnt = VALUES(angry_cnt),
+        sad_cnt = VALUES(sad_cnt),
+        love_cnt = VALUES(love_cnt),
+        fun_cnt = VALUES(fun_cnt),
+        complain_cnt = VALUES(complain_cnt)
+    """
+    if dbm.Execute(sql, tuple(s_idx_list) * 2) < 0:
+        dbm.Rollback()
+        return False
+    dbm.Commit()
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="emotion 행이 없는 리뷰만 DB에서 라벨링")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help="DB에서 한 번에 가져올 리뷰 수")
+    parser.add_argument('--batch-size', type=int, default=labeling.BATCH_SIZE)
+    parser.add_argument('--limit', type=int, default=None, help="이번 실행에서 최대 N개만 라벨링")
+    parser.add_argument('--full', action='store_true', help="워터마크를 무시하고 처음부터 확인 (빠진 리뷰 보충용)")
+    parser.add_argument('--refresh-counts', action='store_true', help="라벨링한 가게의 store_emotion_count_table 갱신")
+    parser.add_argument('--multihead', action='store_true', default=labeling.USE_MULTIHEAD)
+    parser.add_argument('--tflite', action='store_true', default=labeling.USE_TFLITE)
+    parser.add_argument('--no-score-cache', action='store_true', help="리뷰 점수 캐시(score_cache.sqlite3) 사용 안 함")
+    parser.add_argument('--job', default=JOB_NAME, help="워터마크 이름 (모델별로 따로 관리할 때)")
+    args = parser.parse_args()
+
+    dbm = DBManager()
+    if not dbm.DBOpen(host, id, pw, dbName, port):
+        print("DB 연결 실패")
+        sys.exit(1)
+
+    try:
+        if not ensure_watermark_table(dbm):
+            print("label_watermark 테이블 생성 실패")
+            sys.exit(1)
+        after = 0 if args.full else get_watermark(dbm, args.job)
+        print(f"[시작] r_idx > {after} 중 emotion이 없는 리뷰를 라벨링합니다")
+
+        tokenizer = None
+        models = None
+        cache = None
+        total = 0
+        touched_stores = set()
+        started = time.perf_counter()
+
+        while args.limit is None or total < args.limit:
+            page_size = args.page_size if args.limit is None else min(args.page_size, args.limit - total)
+            rows = fetch_unlabeled(dbm, after, page_size)
+            if rows is None:
+                print("리뷰 조회 실패")
+                sys.exit(1)
+            if not rows:
+                break
+
+            # 새 리뷰가 있을 때만 모델 로드
+            if models is None:
+                labeling.reset_seeds()
+                tokenizer = labeling.load_tokenizer()
+                models = labeling.load_models(args.multihead, args.tflite)
+                if not args.no_score_cache:
+                    cache = labeling.open_score_cache(args.multihead, args.tflite)
+
+            predictions = labeling.predict_batch([row['r_content'] for row in rows], models, tokenizer,
+                                                 args.batch_size, show_progress=False, cache=cache)
+            # 예측 실패한 리뷰가 있으면 워터마크가 그 뒤로 넘어가지 않도록 저장하지 않고 중단
+            failed = [row['r_idx'] for row, (label, _, _) in zip(rows, predictions) if label == "에러"]
+            if failed:
+                print(f"예측 실패 {len(failed)}개 (r_idx {failed[0]} ~ {failed[-1]}), 저장하지 않고 중단합니다")
+                sys.exit(1)
+            if not save_page(dbm, rows, predictions, args.job):
+                print(f"저장 실패 (r_idx {rows[0]['r_idx']} ~ {rows[-1]['r_idx']})")
+                sys.exit(1)
+
+            after = rows[-1]['r_idx']
+            total += len(rows)
+            touched_stores.update(row['s_idx'] for row in rows)
+            elapsed = time.perf_counter() - started
+            print(f"  - {total}개 저장 (마지막 r_idx {after}, {total / max(elapsed, 1e-9):.1f} reviews/sec)")
+
+        if total == 0:
+            print("[완료] 새로 라벨링할 리뷰가 없습니다")
+            return
+
+        print(f"[완료] {total}개 리뷰, {len(touched_stores)}개 가게, {time.perf_counter() - started:.1f}초")
+        if cache is not None:
+            print(f"[점수 캐시] {cache.stats()}")
+            cache.close()
+        if args.refresh_counts:
+            stores = sorted(touched_stores)
+            # IN 목록이 너무 길어지지 않도록 나눠서 갱신
+            if all(refresh_store_counts(dbm, stores[i:i + REFRESH_CHUNK]) for i in range(0, len(stores), REFRESH_CHUNK)):
+                print(f"[갱신] store_emotion_count_table {len(touched_stores)}개 가게")
+            else:
+                print("store_emotion_count_table 갱신 실패")
+    finally:
+        dbm.DBClose()
+
+if __name__ == '__main__':
+    main()
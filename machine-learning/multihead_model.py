@@ -0,0 +1,255 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import random
+from tqdm import tqdm
+import tensorflow as tf
+from soynlp.normalizer import repeat_normalize
+from transformers import AutoTokenizer, TFDistilBertModel
+
+# ---------------------------------------------------------
+# 공유 인코더 + 6개 감정 헤드 모델
+# DistilKoBERT 인코더 하나에 감정별 sigmoid 헤드 6개를 붙여서
+# 리뷰 하나당 트랜스포머 forward를 6번이 아니라 1번만 수행합니다.
+# ---------------------------------------------------------
+
+# 경로 설정
+RAW_DATA_PATH = './raw/'
+SAVE_PATH = './processed_data/'
+MODEL_SAVE_PATH = 'multihead_model.h5'
+
+MODEL_NAME = "monologg/distilkobert"
+MAX_LEN = 256
+BATCH_SIZE = 32
+LEARNING_RATE = 2e-5
+EPOCHS = 5
+LABEL_SMOOTHING = 0.1
+
+# 헤드 순서 (raw/{감정}_train.csv 파일 이름) -> 앙상블 코드에서 쓰는 감정 이름
+EMOTIONS = ['happy', 'angry', 'sad', 'love', 'fun', 'complaint']
+EMOTION_NAMES = {
+    'happy': '희(Happy)',
+    'angry': '노(Angry)',
+    'sad': '애(Sad)',
+    'love': '애(Love)',
+    'fun': '락(Fun)',
+    'complaint': '불만(Complaint)'
+}
+# 해당 감정 파일에 없는 리뷰의 라벨 (손실 계산에서 제외)
+UNKNOWN_LABEL = -1
+
+# 데이터 노이즈 추가 함수 (model_*.py와 동일)
+def add_noise(text, p_del=0.1, p_swap=0.1):
+    if not isinstance(text, str): return ""
+
+    text = repeat_normalize(text, num_repeats=2)
+
+    chars = list(text)
+    n = len(chars)
+    if n < 2: return text
+
+    # 랜덤 삭제
+    if random.random() < p_del:
+        idx = random.randint(0, n-1)
+        del chars[idx]
+        n -= 1
+
+    # 랜덤 교환 (오타 시뮬레이션)
+    if n > 1 and random.random() < p_swap:
+        idx = random.randint(0, n-2)
+        chars[idx], chars[idx+1] = chars[idx+1], chars[idx]
+
+    return "".join(chars)
+
+def load_reviews(suffix):
+    """raw/{감정}_{suffix}.csv 6개에 있는 리뷰 전체 (집합)"""
+    reviews = set()
+    for emotion in EMOTIONS:
+        filepath = os.path.join(RAW_DATA_PATH, f'{emotion}_{suffix}.csv')
+        if os.path.exists(filepath):
+            reviews.update(pd.read_csv(filepath, sep='\t').dropna(subset=['review', 'label'])['review'])
+    return reviews
+
+def load_multilabel_data(suffix, is_train=False, exclude=None):
+    """
+    raw/{감정}_{suffix}.csv 6개를 리뷰 기준으로 합쳐서 (리뷰 DataFrame, 라벨 배열[N, 6]) 반환
+    어떤 감정 파일에 없는 리뷰는 그 감정 라벨을 UNKNOWN_LABEL(-1)로 둡니다.
+    exclude에 있는 리뷰는 뺍니다. (감정 파일끼리 리뷰가 겹쳐서, 어떤 감정의 테스트 리뷰가
+    다른 감정의 학습 파일에 들어 있는 경우가 많으므로 학습 데이터에서 테스트 리뷰를 모두 제외)
+    """
+    exclude = exclude or set()
+    rows = {}
+    skipped = set()
+    for idx, emotion in enumerate(EMOTIONS):
+        filepath = os.path.join(RAW_DATA_PATH, f'{emotion}_{suffix}.csv')
+        if not os.path.exists(filepath):
+            print(f"파일 없음: {filepath}")
+            continue
+        data = pd.read_csv(filepath, sep='\t')
+        data = data.dropna(subset=['review', 'label'])
+        for review, label in zip(data['review'], data['label']):
+            if review in exclude:
+                skipped.add(review)
+                continue
+            labels = rows.setdefault(review, [UNKNOWN_LABEL] * len(EMOTIONS))
+            # 같은 파일에 중복된 리뷰가 있으면 처음 라벨 유지
+            if labels[idx] == UNKNOWN_LABEL:
+                labels[idx] = int(label)
+
+    if skipped:
+        print(f"  - 테스트 데이터와 겹치는 리뷰 {len(skipped)}개 제외")
+    if not rows:
+        return None, None
+
+    data = pd.DataFrame({'review': list(rows.keys())})
+    labels = np.array(list(rows.values()), dtype=np.float32)
+
+    if is_train:
+        tqdm.pandas(desc="학습 데이터 노이즈 주입 중")
+        data['review'] = data['review'].progress_apply(lambda x: add_noise(x, p_del=0.15, p_swap=0.15))
+    else:
+        data['review'] = data['review'].apply(lambda x: repeat_normalize(x, num_repeats=2))
+
+    return data, labels
+
+def masked_binary_crossentropy(y_true, y_pred):
+    """라벨이 UNKNOWN_LABEL인 헤드는 빼고 계산하는 BCE (label smoothing 포함)"""
+    y_true = tf.cast(y_true, tf.float32)
+    mask = tf.cast(y_true >= 0, tf.float32)
+    target = tf.clip_by_value(y_true, 0.0, 1.0) * (1.0 - LABEL_SMOOTHING) + 0.5 * LABEL_SMOOTHING
+    bce = tf.keras.backend.binary_crossentropy(target, y_pred)
+    return tf.reduce_sum(bce * mask, axis=-1) / tf.maximum(tf.reduce_sum(mask, axis=-1), 1.0)
+
+def masked_accuracy(y_true, y_pred):
+    """라벨이 있는 헤드만 대상으로 한 정확도"""
+    y_true = tf.cast(y_true, tf.float32)
+    mask = tf.cast(y_true >= 0, tf.float32)
+    correct = tf.cast(tf.equal(tf.cast(y_pred > 0.5, tf.float32), y_true), tf.float32) * mask
+    return tf.reduce_sum(correct) / tf.maximum(tf.reduce_sum(mask), 1.0)
+
+class DistilBertLayer(tf.keras.layers.Layer):
+    def __init__(self, model_name, **kwargs):
+        super().__init__(**kwargs)
+        self.bert = TFDistilBertModel.from_pretrained(model_name, from_pt=True)
+
+    def call(self, inputs):
+        return self.bert(inputs[0], attention_mask=inputs[1])[0]
+
+def build_multihead_model(max_len=MAX_LEN):
+    """인코더 1개 + 감정별 sigmoid 헤드 6개 (출력 [batch, 6], 열 순서는 EMOTIONS)"""
+    input_ids = tf.keras.layers.Input(shape=(max_len,), dtype=tf.int32, name="input_ids")
+    attention_mask = tf.keras.layers.Input(shape=(max_len,), dtype=tf.int32, name="attention_mask")
+
+    bert_layer = DistilBertLayer(MODEL_NAME)
+    last_hidden_state = bert_layer([input_ids, attention_mask])
+    cls_token = last_hidden_state[:, 0, :]
+
+    x = tf.keras.layers.Dropout(0.2)(cls_token)
+
+    # 각 열이 독립된 sigmoid 헤드 (multi-label)
+    output = tf.keras.layers.Dense(len(EMOTIONS), activation='sigmoid', name='emotion_heads')(x)
+
+    model = tf.keras.models.Model(inputs=[input_ids, attention_mask], outputs=output)
+
+    optimizer = tf.keras.optimizers.AdamW(learning_rate=LEARNING_RATE, weight_decay=0.01)
+    model.compile(optimizer=optimizer, loss=masked_binary_crossentropy, metrics=[masked_accuracy])
+    return model
+
+def load_multihead_model(file_path, max_len=MAX_LEN):
+    """학습된 가중치(.h5)로 추론용 모델 생성"""
+    tf.keras.backend.clear_session()
+    model = build_multihead_model(max_len)
+    model.load_weights(file_path)
+    return model
+
+def predict_raw_scores(model, inputs):
+    """한 번의 forward로 감정별 원점수 반환 [{'희(Happy)': 0.93, ...}, ...] (배치 크기만큼)"""
+    preds = np.asarray(model(inputs, training=False))
+    return [{EMOTION_NAMES[emotion]: float(row[i]) for i, emotion in enumerate(EMOTIONS)} for row in preds]
+
+def create_tf_dataset(encodings, labels, batch_size, is_train=True):
+    dataset = tf.data.Dataset.from_tensor_slices((
+        {'input_ids': encodings['input_ids'], 'attention_mask': encodings['attention_mask']},
+        labels
+    ))
+    if is_train:
+        dataset = dataset.shuffle(20000, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+    return dataset
+
+def bert_tokenize(texts, tokenizer, max_len):
+    return tokenizer(
+        texts.tolist(),
+        truncation=True,
+        padding='max_length',
+        max_length=max_len,
+        return_token_type_ids=False,
+        return_tensors='tf'
+    )
+
+def evaluate_per_emotion(model, tokenizer):
+    """감정별 raw/{감정}_test.csv에 대해 해당 헤드의 정확도 출력 (개별 모델과 비교용)"""
+    print("\n[감정별 테스트 정확도]")
+    for idx, emotion in enumerate(EMOTIONS):
+        filepath = os.path.join(RAW_DATA_PATH, f'{emotion}_test.csv')
+        if not os.path.exists(filepath):
+            continue
+        data = pd.read_csv(filepath, sep='\t').dropna(subset=['review', 'label'])
+        data['review'] = data['review'].apply(lambda x: repeat_normalize(x, num_repeats=2))
+        encodings = bert_tokenize(data['review'], tokenizer, MAX_LEN)
+        preds = model.predict({'input_ids': encodings['input_ids'], 'attention_mask': encodings['attention_mask']},
+                              batch_size=BATCH_SIZE, verbose=0)[:, idx]
+        accuracy = float(np.mean((preds > 0.5).astype(int) == data['label'].values.astype(int)))
+        print(f"  - {EMOTION_NAMES[emotion]}: {accuracy:.4f} ({len(data)}개)")
+
+def main():
+    # GPU사용 설정
+    gpus = tf.config.experimental.list_physical_devices('GPU')
+    if gpus:
+        try:
+            tf.config.experimental.set_memory_growth(gpus[0], True)
+            print("GPU 사용 설정 완료")
+        except RuntimeError as e:
+            print(e)
+
+    if not os.path.exists(SAVE_PATH):
+        os.makedirs(SAVE_PATH)
+
+    print("[전처리] 6개 감정 데이터 통합 로드 중...")
+    # 테스트 리뷰를 먼저 모아서 학습 데이터에서 빼야 val_loss / 체크포인트 / 감정별 정확도가 처음 보는 리뷰로 계산됨
+    test_reviews = load_reviews('test')
+    train_data, train_labels = load_multilabel_data('train', is_train=True, exclude=test_reviews)
+    test_data, test_labels = load_multilabel_data('test', is_train=False)
+    if train_data is None or test_data is None: sys.exit(1)
+    print(f"  - 학습 리뷰 {len(train_data)}개, 테스트 리뷰 {len(test_data)}개")
+    print(f"  - 라벨이 있는 (리뷰, 감정) 쌍: 학습 {int((train_labels >= 0).sum())}개")
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+    train_encodings = bert_tokenize(train_data['review'], tokenizer, MAX_LEN)
+    test_encodings = bert_tokenize(test_data['review'], tokenizer, MAX_LEN)
+
+    train_dataset = create_tf_dataset(train_encodings, train_labels, BATCH_SIZE, True)
+    test_dataset = create_tf_dataset(test_encodings, test_labels, BATCH_SIZE, False)
+
+    model = build_multihead_model()
+    model.summary()
+
+    checkpoint_path = os.path.join(SAVE_PATH, MODEL_SAVE_PATH)
+    es = tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=3, verbose=1, restore_best_weights=True)
+    mc = tf.keras.callbacks.ModelCheckpoint(checkpoint_path, monitor='val_loss', save_best_only=True, save_weights_only=True, verbose=1)
+
+    print(f"[학습] 시작 (Epochs: {EPOCHS})...")
+    model.fit(
+        train_dataset,
+        epochs=EPOCHS,
+        validation_data=test_dataset,
+        callbacks=[es, mc]
+    )
+
+    # EarlyStopping이 멈추지 않고 끝까지 학습하면 restore_best_weights가 적용되지 않으므로 저장된 최고 가중치로 평가
+    model.load_weights(checkpoint_path)
+    evaluate_per_emotion(model, tokenizer)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import json
+import sqlite3
+import hashlib
+
+# ---------------------------------------------------------
+# 리뷰 텍스트 -> 감정별 원점수 디스크 캐시 (SQLite)
+# - 키: 모델 지문 + clean_text로 정규화한 리뷰
+#   모델 지문은 가중치 파일(경로/크기/수정시각) + 모델 종류 + MAX_LEN으로 만들어서
+#   모델을 다시 학습 / 변환하면 자동으로 새로 예측
+# - BIAS_SCORES를 더하기 전 원점수를 저장하므로 BIAS_SCORES / 임계값만 바꿔서 다시 돌려도 캐시 사용
+# ---------------------------------------------------------
+
+CACHE_PATH = './score_cache.sqlite3'
+# SQLite 한 쿼리에 넣을 수 있는 변수 수(999)보다 작게
+QUERY_CHUNK = 500
+
+def model_fingerprint(model_paths, *extra):
+    """가중치 파일 상태와 추가 설정(모델 종류, MAX_LEN 등)으로 만든 모델 지문"""
+    digest = hashlib.sha256()
+    for path in sorted(model_paths):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    for value in extra:
+        digest.update(f"{value}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+class ScoreCache:
+    def __init__(self, fingerprint, path=CACHE_PATH):
+        self.fingerprint = fingerprint
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.con = sqlite3.connect(path, timeout=30)
+        self.con.execute("""CREATE TABLE IF NOT EXISTS review_scores (
+            fingerprint TEXT NOT NULL,
+            text TEXT NOT NULL,
+            scores TEXT NOT NULL,
+            PRIMARY KEY (fingerprint, text)) WITHOUT ROWID""")
+        self.con.commit()
+
+    def get_many(self, texts):
+        """캐시에 있는 텍스트만 {텍스트: 감정별 원점수} dict로 반환"""
+        found = {}
+        texts = list(texts)
+        for i in range(0, len(texts), QUERY_CHUNK):
+            part = texts[i:i + QUERY_CHUNK]
+            placeholders = ",".join(["?"] * len(part))
+            rows = self.con.execute(
+                f"SELECT text, scores FROM review_scores WHERE fingerprint = ? AND text IN ({placeholders})",
+                [self.fingerprint] + part).fetchall()
+            for text, scores in rows:
+                found[text] = json.loads(scores)
+        self.hits += len(found)
+        self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, scores_by_text):
+        self.con.executemany(
+            "INSERT OR REPLACE INTO review_scores (fingerprint, text, scores) VALUES (?, ?, ?)",
+            [(self.fingerprint, text, json.dumps(scores, ensure_ascii=False)) for text, scores in scores_by_text.items()])
+        self.con.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': round(self.hits / total, 4) if total else 0.0}
+
+    def close(self):
+        self.con.close()
@@ -0,0 +1,48 @@
+import os
+import numpy as np
+import tensorflow as tf
+
+# ---------------------------------------------------------
+# TFLite 감정 모델 래퍼
+# Keras 모델과 같은 방식(model(inputs, training=False) -> [batch, 1])으로 호출할 수 있어서
+# ensemble_biased_labling.py의 배치 예측 코드를 그대로 사용합니다.
+# ---------------------------------------------------------
+
+# TFLite Interpreter 스레드 수 (None이면 TFLite 기본값)
+NUM_THREADS = None
+
+class TFLiteModel:
+    def __init__(self, model_path, num_threads=NUM_THREADS):
+        self.model_path = model_path
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.inputs = {}
+        for detail in self.interpreter.get_input_details():
+            key = 'attention_mask' if 'attention_mask' in detail['name'] else 'input_ids'
+            self.inputs[key] = detail
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+        self._shape = None
+        self.interpreter.allocate_tensors()
+
+    def _resize(self, shape):
+        """배치 크기 / 길이가 바뀌었을 때만 입력 크기를 다시 잡음 (동적 패딩 배치 대응)"""
+        if shape == self._shape:
+            return
+        for detail in self.inputs.values():
+            self.interpreter.resize_tensor_input(detail['index'], list(shape), strict=False)
+        self.interpreter.allocate_tensors()
+        self._shape = shape
+
+    def __call__(self, inputs, training=False):
+        input_ids = np.asarray(inputs['input_ids'])
+        self._resize(tuple(input_ids.shape))
+        for key, detail in self.inputs.items():
+            self.interpreter.set_tensor(detail['index'], np.asarray(inputs[key]).astype(detail['dtype']))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_index).copy()
+
+    def file_size_mb(self):
+        return os.path.getsize(self.model_path) / (1024 * 1024)
+
+def tflite_path(h5_path):
+    """happy_model.h5 -> happy_model.tflite"""
+    return os.path.splitext(h5_path)[0] + '.tflite'
@@ -0,0 +1,116 @@
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+import numpy as np
+
+# ---------------------------------------------------------
+# 토크나이징 결과 디스크 캐시
+# - 키: 원본 파일 내용 해시 + 토크나이저 + MAX_LEN + 정규화 방식 + 변형(노이즈 시드, 컬럼 등)
+#   → 파일 내용이나 설정이 바뀌면 자동으로 새로 토크나이징
+# - 패딩 없이 저장 (input_ids를 한 줄로 이어 붙인 values + 리뷰별 시작 위치 row_splits)
+#   attention_mask는 패딩이 없으므로 전부 1이고, 배치를 만들 때 패딩과 함께 생성
+# - np.load(mmap_mode='r')로 열어서 필요한 부분만 메모리에 올림
+# ---------------------------------------------------------
+
+CACHE_DIR = './token_cache/'
+# 정규화 방식이 바뀌면 이 값을 바꿔서 기존 캐시를 무효화
+NORMALIZATION = "soynlp.repeat_normalize(num_repeats=2)"
+# 캐시 형식 버전
+FORMAT_VERSION = 1
+
+_file_hashes = {}
+
+def file_hash(path):
+    """파일 내용 sha256 (같은 실행 안에서는 경로/크기/수정시각이 같으면 재사용)"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _file_hashes[memo_key] = digest.hexdigest()
+    return _file_hashes[memo_key]
+
+def cache_key(source_path, tokenizer, tokenizer_name, max_len, variant=""):
+    parts = {
+        'format': FORMAT_VERSION,
+        'file': file_hash(source_path),
+        'tokenizer': tokenizer_name,
+        'tokenizer_class': type(tokenizer).__name__,
+        'vocab_size': getattr(tokenizer, 'vocab_size', None),
+        'max_len': max_len,
+        'normalization': NORMALIZATION,
+        'variant': variant
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()[:32], parts
+
+class TokenizedCorpus:
+    """패딩 없는 토큰 시퀀스 모음 (values + row_splits, RaggedTensor와 같은 형식)"""
+    def __init__(self, values, row_splits):
+        self.values = values
+        self.row_splits = row_splits
+
+    @classmethod
+    def from_lists(cls, id_lists):
+        lengths = np.fromiter((len(ids) for ids in id_lists), dtype=np.int64, count=len(id_lists))
+        row_splits = np.zeros(len(id_lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=row_splits[1:])
+        values = np.fromiter((t for ids in id_lists for t in ids), dtype=np.int32, count=int(row_splits[-1]))
+        return cls(values, row_splits)
+
+    def __len__(self):
+        return len(self.row_splits) - 1
+
+    def __getitem__(self, i):
+        return self.values[self.row_splits[i]:self.row_splits[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def lengths(self):
+        return np.diff(self.row_splits)
+
+def load(key, cache_dir=CACHE_DIR):
+    """캐시에 있으면 TokenizedCorpus(memmap) 반환, 없으면 None"""
+    path = os.path.join(cache_dir, key)
+    try:
+        values = np.load(os.path.join(path, 'input_ids.npy'), mmap_mode='r')
+        row_splits = np.load(os.path.join(path, 'row_splits.npy'), mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    return TokenizedCorpus(values, row_splits)
+
+def save(key, corpus, meta, cache_dir=CACHE_DIR):
+    """임시 폴더에 쓴 뒤 이름을 바꿔서 저장 (중간에 끊겨도 깨진 캐시가 남지 않게)"""
+    os.makedirs(cache_dir, exist_ok=True)
+    final_path = os.path.join(cache_dir, key)
+    tmp_path = tempfile.mkdtemp(dir=cache_dir, prefix=f'.{key}.')
+    try:
+        np.save(os.path.join(tmp_path, 'input_ids.npy'), np.asarray(corpus.values, dtype=np.int32))
+        np.save(os.path.join(tmp_path, 'row_splits.npy'), np.asarray(corpus.row_splits, dtype=np.int64))
+        with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(dict(meta, count=len(corpus)), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, final_path)
+    except OSError:
+        # 다른 프로세스가 먼저 저장했으면 그쪽 캐시 사용
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+def cached_tokenize(source_path, texts, tokenize_fn, tokenizer, tokenizer_name, max_len, variant="",
+                    cache_dir=CACHE_DIR):
+    """
+    source_path에서 읽어 전처리한 texts의 토큰을 캐시에서 가져오고, 없으면 tokenize_fn(texts)로 만들어 저장
+    variant에는 같은 파일이라도 결과가 달라지는 설정(컬럼, 노이즈 시드, 행 수 제한 등)을 넣습니다.
+    """
+    key, meta = cache_key(source_path, tokenizer, tokenizer_name, max_len, variant)
+    corpus = load(key, cache_dir)
+    if corpus is not None and len(corpus) == len(texts):
+        print(f"  - 토큰 캐시 사용: {os.path.basename(source_path)} ({key})")
+        return corpus
+
+    corpus = TokenizedCorpus.from_lists(tokenize_fn(texts))
+    save(key, corpus, dict(meta, source=os.path.abspath(source_path)), cache_dir)
+    return corpus
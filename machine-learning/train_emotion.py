@@ -0,0 +1,338 @@
+import os
+import sys
+import argparse
+import gc
+import numpy as np
+import pandas as pd
+import random
+from tqdm import tqdm
+import tensorflow as tf
+from soynlp.normalizer import repeat_normalize
+from transformers import AutoTokenizer, TFDistilBertModel
+from train_pipeline import tokenize_unpadded, create_bucketed_dataset, EpochStatsCallback
+import tokenize_cache
+
+# ---------------------------------------------------------
+# 감정 모델 통합 학습 스크립트
+# - 토크나이저와 사전학습 DistilKoBERT를 한 번만 로드하고,
+#   감정마다 백본을 처음 가중치로 되돌린 뒤 새 헤드를 붙여 학습
+# - 같은 문장은 한 번만 토크나이징 (감정 파일끼리 겹치는 리뷰가 많음)
+#
+#   python train_emotion.py --emotion happy
+#   python train_emotion.py --all
+# ---------------------------------------------------------
+
+# 경로 설정
+RAW_DATA_PATH = './raw/'
+SAVE_PATH = './processed_data/'
+
+MODEL_NAME = "monologg/distilkobert"
+MAX_LEN = 256
+BATCH_SIZE = 32
+LEARNING_RATE = 2e-5
+EPOCHS = 5
+# 학습 데이터 노이즈 시드 (고정하면 같은 노이즈 결과가 나오므로 토큰 디스크 캐시를 재사용할 수 있음)
+NOISE_SEED = 42
+NOISE_P_DEL = 0.15
+NOISE_P_SWAP = 0.15
+
+# 감정 -> 추론 테스트 출력용 이름 (raw/{감정}_train.csv, {감정}_model.h5)
+EMOTIONS = {
+    'happy': '기쁨(Happy)',
+    'angry': '분노(Angry)',
+    'sad': '슬픔(Sad)',
+    'love': '사랑(Love)',
+    'fun': '즐거움(Fun)',
+    'complaint': '불만(Complaint)'
+}
+
+
+# 데이터 노이즈 추가 함수 (일반화 성능 향상)
+def add_noise(text, p_del=0.1, p_swap=0.1):
+    """
+    텍스트에 인위적인 노이즈(글자 삭제, 순서 변경)를 추가하여
+    모델이 완벽한 문장 패턴만 외우는 것을 방지함.
+    """
+    if not isinstance(text, str): return ""
+
+    # 1. 반복 문자 정규화 (기존)
+    text = repeat_normalize(text, num_repeats=2)
+
+    # 학습 데이터에만 노이즈 적용 (Train에서만 호출할 것)
+    chars = list(text)
+    n = len(chars)
+    if n < 2: return text
+
+    # 랜덤 삭제
+    if random.random() < p_del:
+        idx = random.randint(0, n-1)
+        del chars[idx]
+        n -= 1
+
+    # 랜덤 교환 (오타 시뮬레이션)
+    if n > 1 and random.random() < p_swap:
+        idx = random.randint(0, n-2)
+        chars[idx], chars[idx+1] = chars[idx+1], chars[idx]
+
+    return "".join(chars)
+
+def load_and_preprocess_data(filepath, is_train=False, noise_seed=None):
+    if not os.path.exists(filepath):
+        print(f"파일 없음: {filepath}")
+        return None
+
+    # 구분자 지정하고, 필요한 컬럼만 가져옵니다.
+    data = pd.read_csv(filepath, sep='\t')
+
+    # 결측치 제거
+    data = data.dropna(subset=['review', 'label'])
+
+    # Train 데이터에만 노이즈를 섞어서 학습 난이도를 높임
+    if is_train:
+        if noise_seed is not None:
+            random.seed(noise_seed)
+        tqdm.pandas(desc="학습 데이터 노이즈 주입 중")
+        data['review'] = data['review'].progress_apply(lambda x: add_noise(x, p_del=NOISE_P_DEL, p_swap=NOISE_P_SWAP))
+    else:
+        # Test 데이터는 정규화만 수행
+        data['review'] = data['review'].apply(lambda x: repeat_normalize(x, num_repeats=2))
+
+    return data
+
+class TokenCache:
+    """
+    문장 -> input_ids (패딩 없음) 캐시, 여러 감정 모델이 같은 문장을 다시 토크나이징하지 않도록 함
+    use_disk면 파일 단위 결과를 tokenize_cache에 저장해서 다음 실행에서는 토크나이징을 건너뜀
+    """
+    def __init__(self, tokenizer, max_len, use_disk=True):
+        self.tokenizer = tokenizer
+        self.max_len = max_len
+        self.use_disk = use_disk
+        self._ids = {}
+        self.hits = 0
+
+    def encode(self, texts):
+        texts = list(texts)
+        missing = list(dict.fromkeys(t for t in texts if t not in self._ids))
+        self.hits += len(texts) - len(missing)
+        if missing:
+            for text, ids in zip(missing, tokenize_unpadded(missing, self.tokenizer, self.max_len)):
+                self._ids[text] = ids
+        return [self._ids[t] for t in texts]
+
+    def encode_file(self, source_path, texts, variant):
+        """source_path에서 읽어 전처리한 texts를 토크나이징 (디스크 캐시 → 메모리 캐시 순으로 확인)"""
+        texts = list(texts)
+        if not self.use_disk:
+            return tokenize_cache.TokenizedCorpus.from_lists(self.encode(texts))
+        return tokenize_cache.cached_tokenize(source_path, texts, self.encode, self.tokenizer, MODEL_NAME,
+                                              self.max_len, variant)
+
+    @staticmethod
+    def to_padded(corpus, max_len, pad_id):
+        """MAX_LEN까지 패딩한 input_ids / attention_mask (--no-bucketing 비교용)"""
+        input_ids = np.full((len(corpus), max_len), pad_id, dtype=np.int32)
+        attention_mask = np.zeros((len(corpus), max_len), dtype=np.int32)
+        for row, ids in enumerate(corpus):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+        return {'input_ids': input_ids, 'attention_mask': attention_mask}
+
+# 데이터셋 생성 (전체 MAX_LEN 패딩)
+def create_tf_dataset(encodings, labels, batch_size, is_train=True):
+    dataset = tf.data.Dataset.from_tensor_slices((
+        {'input_ids': encodings['input_ids'], 'attention_mask': encodings['attention_mask']},
+        labels
+    ))
+    if is_train:
+        dataset = dataset.shuffle(20000, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+    return dataset
+
+def create_dataset(corpus, labels, token_cache, batch_size, is_train, use_bucketing):
+    pad_id = token_cache.tokenizer.pad_token_id or 0
+    if use_bucketing:
+        return create_bucketed_dataset(corpus, labels, batch_size, token_cache.max_len, pad_id, is_train)
+    return create_tf_dataset(TokenCache.to_padded(corpus, token_cache.max_len, pad_id), labels, batch_size, is_train)
+
+class DistilBertLayer(tf.keras.layers.Layer):
+    """이미 로드한 TFDistilBertModel을 감싸는 레이어 (감정마다 다시 로드하지 않고 재사용)"""
+    def __init__(self, bert, **kwargs):
+        super().__init__(**kwargs)
+        self.bert = bert
+
+    def call(self, inputs):
+        return self.bert(inputs[0], attention_mask=inputs[1])[0]
+
+def build_improved_model(bert_layer, learning_rate=LEARNING_RATE):
+    # 버킷마다 길이가 다르므로 길이는 None
+    input_ids = tf.keras.layers.Input(shape=(None,), dtype=tf.int32, name="input_ids")
+    attention_mask = tf.keras.layers.Input(shape=(None,), dtype=tf.int32, name="attention_mask")
+
+    bert_layer.trainable = True
+
+    last_hidden_state = bert_layer([input_ids, attention_mask])
+    cls_token = last_hidden_state[:, 0, :]
+
+    x = tf.keras.layers.Dropout(0.2)(cls_token)
+
+    # 한 프로세스에서 여러 모델을 만들어도 이름이 dense_1, dense_2로 바뀌지 않도록 고정
+    # (ensemble_biased*.py가 이름으로 가중치를 로드함)
+    output = tf.keras.layers.Dense(1, activation='sigmoid', name='dense')(x)
+
+    model = tf.keras.models.Model(inputs=[input_ids, attention_mask], outputs=output)
+
+    optimizer = tf.keras.optimizers.AdamW(learning_rate=learning_rate, weight_decay=0.01)
+    loss_fn = tf.keras.losses.BinaryCrossentropy(label_smoothing=0.1)
+    metrics = [
+        'accuracy',
+        tf.keras.metrics.AUC(name='auc', curve='PR')
+    ]
+
+    model.compile(optimizer=optimizer, loss=loss_fn, metrics=metrics)
+    return model
+
+class Trainer:
+    """토크나이저 / 백본을 한 번만 로드해서 여러 감정 모델을 순서대로 학습"""
+    def __init__(self, max_len=MAX_LEN, batch_size=BATCH_SIZE, epochs=EPOCHS, use_bucketing=True,
+                 noise_seed=NOISE_SEED, use_token_cache=True):
+        self.max_len = max_len
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.use_bucketing = use_bucketing
+        self.noise_seed = noise_seed
+
+        print("[초기화] 토크나이저 / 사전학습 모델 로드 중...")
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+        # 노이즈 시드를 고정하지 않으면 매번 학습 문장이 달라지므로 디스크 캐시는 쓰지 않음
+        self.token_cache = TokenCache(self.tokenizer, max_len, use_token_cache and noise_seed is not None)
+        self.bert_layer = DistilBertLayer(TFDistilBertModel.from_pretrained(MODEL_NAME, from_pt=True))
+        # 한 번 호출해서 가중치를 만든 뒤 사전학습 가중치를 보관 (감정마다 여기서 다시 시작)
+        self.bert_layer([tf.zeros((1, 8), tf.int32), tf.ones((1, 8), tf.int32)])
+        self.initial_weights = self.bert_layer.get_weights()
+
+    def train(self, emotion, run_examples=True):
+        print(f"\n========== [{EMOTIONS[emotion]}] 학습 ==========")
+        print("[전처리] 데이터 로드 중...")
+        train_path = os.path.join(RAW_DATA_PATH, f'{emotion}_train.csv')
+        test_path = os.path.join(RAW_DATA_PATH, f'{emotion}_test.csv')
+        train_data = load_and_preprocess_data(train_path, is_train=True, noise_seed=self.noise_seed)
+        test_data = load_and_preprocess_data(test_path, is_train=False)
+        if train_data is None or test_data is None:
+            return None
+
+        noise = f"noise(del={NOISE_P_DEL},swap={NOISE_P_SWAP},seed={self.noise_seed})"
+        train_corpus = self.token_cache.encode_file(train_path, train_data['review'], f"review:{noise}")
+        test_corpus = self.token_cache.encode_file(test_path, test_data['review'], "review")
+
+        train_dataset = create_dataset(train_corpus, train_data['label'].values, self.token_cache,
+                                       self.batch_size, True, self.use_bucketing)
+        test_dataset = create_dataset(test_corpus, test_data['label'].values, self.token_cache,
+                                      self.batch_size, False, self.use_bucketing)
+
+        # 이전 감정 학습으로 바뀐 백본을 사전학습 가중치로 되돌림
+        self.bert_layer.set_weights(self.initial_weights)
+        model = build_improved_model(self.bert_layer)
+
+        checkpoint_path = os.path.join(SAVE_PATH, f'{emotion}_model.h5')
+        # EarlyStopping Patience 증가 (노이즈 때문에 loss가 진동할 수 있음)
+        es = tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=3, verbose=1, restore_best_weights=True)
+        mc = tf.keras.callbacks.ModelCheckpoint(checkpoint_path, monitor='val_loss', save_best_only=True, save_weights_only=True, verbose=1)
+        # 에폭 시간 / 최대 메모리 출력
+        stats = EpochStatsCallback(f"{emotion} {'bucketing' if self.use_bucketing else 'max_length'}")
+
+        print(f"[학습] 시작 (Epochs: {self.epochs})...")
+        history = model.fit(
+            train_dataset,
+            epochs=self.epochs,
+            validation_data=test_dataset,
+            callbacks=[es, mc, stats]
+        )
+
+        if run_examples:
+            # restore_best_weights는 EarlyStopping이 멈췄을 때만 복원하므로
+            # 모든 에폭을 다 돈 경우에도 가장 좋은 가중치로 테스트하도록 체크포인트를 다시 로드
+            model.load_weights(checkpoint_path)
+            self.run_examples(model, emotion)
+
+        del model
+        gc.collect()
+        return history
+
+    def run_examples(self, model, emotion):
+        print("\n[추론 테스트 시작]")
+        for text in EXAMPLES:
+            # 추론 시에는 노이즈 없이 clean_text만
+            cleaned = repeat_normalize(text, num_repeats=2)
+            encodings = self.tokenizer([cleaned], truncation=True, max_length=self.max_len,
+                                       return_token_type_ids=False, return_tensors='tf')
+            pred = model.predict({'input_ids': encodings['input_ids'], 'attention_mask': encodings['attention_mask']}, verbose=0)[0][0]
+
+            label = EMOTIONS[emotion] if pred > 0.5 else "그외(Other)"
+            print(f"문장: {text}\n -> 예측: {label} ({pred*100:.2f}%)")
+            print("-" * 30)
+
+def setup_gpu():
+    # GPU사용 설정
+    gpus = tf.config.experimental.list_physical_devices('GPU')
+    if gpus:
+        try:
+            tf.config.experimental.set_memory_growth(gpus[0], True)
+            print("GPU 사용 설정 완료")
+        except RuntimeError as e:
+            print(e)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="감정 모델 학습")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--emotion', choices=list(EMOTIONS), action='append', help="학습할 감정 (여러 번 지정 가능)")
+    group.add_argument('--all', action='store_true', help="6개 감정 모두 학습")
+    parser.add_argument('--epochs', type=int, default=EPOCHS)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--max-len', type=int, default=MAX_LEN)
+    parser.add_argument('--no-bucketing', action='store_true', help="전체를 MAX_LEN까지 패딩 (시간/메모리 비교용)")
+    parser.add_argument('--skip-examples', action='store_true', help="학습 후 예시 문장 추론 테스트 생략")
+    parser.add_argument('--noise-seed', type=int, default=NOISE_SEED, help="노이즈 시드 (-1이면 매번 다른 노이즈, 토큰 디스크 캐시 안 씀)")
+    parser.add_argument('--no-token-cache', action='store_true', help="토큰 디스크 캐시 사용 안 함")
+    args = parser.parse_args(argv)
+
+    # 폴더 없으면 만들기
+    if not os.path.exists(SAVE_PATH):
+        os.makedirs(SAVE_PATH)
+    setup_gpu()
+
+    emotions = list(EMOTIONS) if args.all else list(dict.fromkeys(args.emotion))
+    noise_seed = None if args.noise_seed < 0 else args.noise_seed
+    trainer = Trainer(args.max_len, args.batch_size, args.epochs, not args.no_bucketing,
+                      noise_seed, not args.no_token_cache)
+    failed = []
+    for emotion in emotions:
+        if trainer.train(emotion, not args.skip_examples) is None:
+            failed.append(emotion)
+    print(f"\n[완료] 토큰 캐시 재사용 {trainer.token_cache.hits}건")
+    if failed:
+        print(f"[실패] 데이터 파일이 없는 감정: {', '.join(failed)}")
+        sys.exit(1)
+
+EXAMPLES = [
+    "엄청 친절하시고 치킨도 너무 부드러운데 양도 많아요 ㅠ생맥은 시원하구 넘 ,, 완벽한 맛집",
+    "주인이 손님 가려서 대응, 돈 많이 안쓰면 인사도 안함. 친절한척 손님 가려서 대응하는거 어휴...",
+    "음식 맛있긴 한데 일단 내부가 너무 더러워요 전에 올 때도 많이 느꼈는데 갈수록 더 더러워지네요",
+    "오늘 시험 개빡세서 너무 힘들었는데, 음식먹으니까 속이 뻥 뚫려서 좋았어요",
+    "배달이 늦어서 더 빡쳐요",
+    "맛은 있는데 양이 좀 적네요.",
+    "엄청 친절하시고 치킨도 너무 부드러운데 양도 많아요 ㅠ생맥은 시원하구 넘 ,, 완벽한 맛집 💛💛💛💛💛진짜 넘 맛있어여.,,❤️❤️",
+    "저 이렇게 맛있는 치킨 처음 먹어봐요…😭 호바트랑 간장 순살 반반 시켰는데 둘다레전드존맛 양념이 엄청 잘 버무러져있는데 치킨이 바삭해여…👼🏻 호바트는 꼭 드세요ㅠ 시중의 청양마요들이랑 뭔가 다른 맛이 나는데 그게 넘넘 마싰어요💗",
+    "순살로 반반 두 마리 시켰어요. 순살, 간장, 양념, 갈릭 시켰는데 산더미로 나왔네요. ",
+    "주인이 손님 가려서 대응, 돈 많이 안쓰면 인사도 안함. 친절한척 손님 가려서 대응하는거 어휴...",
+    "음식 맛있긴 한데 일단 내부가 너무 더러워요 전에 올 때도 많이 느꼈는데 갈수록 더 더러워지네요 종이컵에 고춧가루 묻어있고 물통에도 고춧가루 붙어있고 밥 그릇에도 붙어있고;;",
+    "그리고 제가 여기 맛을 아는데 일반 시켰더니 안경 쓴 알바생이 살짝 째려보더니 매운맛으로 바꿔서 주네요 ㅋㅋ 그래놓고 매운맛으로 바꿨냐니까 띠꺼운 표정으로 '아니요' 한마디 하고 마는데 서비스가 너무 별로여서 다시는 안 올거 같아요~ 무슨 양아치들이 알바하는줄 알았네",
+    "오늘 기분 나쁜 일이 있어서 남깁니다.처음 매장 안에 들어왔을때 4인테이블에 2명씩 앉아있는 2팀의 손님이 있었습니다.그래서 저희도 2명이지만 많은 손님이 없어서 4인테이블에 앉았어요. 그랬더니 2인테이블로 가라고 하시더라고요? 앞으로 손님 더 많아질꺼같으니 그런가보다~ 했는데 식사 하고 있는데 저희 뒤로 온 손님들도 2명인데 4인 테이블에 앉아도 아무 말도 안하시더라고요매장안에 있는 모든 손님이 다 2명씩 왔는데 저희한테만 그러시니 기분이 나쁘더라고요?모~두 공평하게 안내해주세요~ ㅋㅋ",
+    "저는 매운 음식을 정말 좋아하고, 제 주변에는 매운 음식을 저만큼 잘 먹는 사람이 없습니다. 신길동 짬뽕 2번 완뽕 경험 있습니다. 그렇게 맵부심 뿜뿜한 상태로, 10여 년간 꿈에서만 보았던 디진다 돈까스를 먹으러 왔어요. 코를 찌르는, 처음 맡아보는 매운 냄새에 겁을 먹었다가 첫 입을 먹은 순간 너무 뜨거워서 입천장이 바로 벗겨졌어요 ..😂 튀김옷 분리 이슈만 아니면 다 좋았을텐데 그것 말고는 뭐, 고기 잡내도 없고, 바삭하고, 생각보다 기분 좋게 매운맛이라 좋았습니다. 공복에 겔포스 하나 먹고 먹은건데도 속이 신기하게 괜찮아요. 개인적으로 '돈까스' 는 제가 굳이 돈 주고 사 먹는 음식은 아닙니다만 디진다 소스 때문에 여기가 또 생각날 것 같습니다. 배불러서 남겼는데, 포장이 불가한 점은 너무 아쉬워요.",
+    "오늘 시험 개빡세서 너무 힘들었는데, 음식먹으니까 속이 뻥 뚫려서 좋았어요",
+    "너무 힘든일이 있었는데, 서비스가 제 마음을 녹였어요",
+    "진짜 스트레스 받았는데, 배달이 늦어서 더 빡쳐요"
+]
+
+if __name__ == '__main__':
+    main()
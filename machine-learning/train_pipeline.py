@@ -0,0 +1,86 @@
+import time
+import resource
+import numpy as np
+import tensorflow as tf
+
+# ---------------------------------------------------------
+# model_*.py 공통 학습 입력 파이프라인
+# - 패딩 없이 토크나이징
+# - 길이가 비슷한 리뷰끼리 버킷으로 묶어서 배치마다 가장 긴 길이까지만 패딩
+#   (MAX_LEN까지 전부 패딩하면 짧은 리뷰가 대부분이라 연산 대부분이 패딩 토큰에 쓰임)
+# - 에폭 시간 / 최대 메모리(RSS) 측정 콜백
+# ---------------------------------------------------------
+
+# 버킷 경계 (토큰 수), MAX_LEN보다 큰 경계는 자동으로 제외
+BUCKET_BOUNDARIES = [16, 32, 48, 64, 96, 128, 192]
+
+def tokenize_unpadded(texts, tokenizer, max_len):
+    """패딩 없이 토크나이징해서 리뷰별 input_ids 리스트 반환"""
+    encodings = tokenizer(
+        list(texts),
+        truncation=True,
+        max_length=max_len,
+        return_token_type_ids=False,
+        return_attention_mask=False
+    )
+    return encodings['input_ids']
+
+def create_bucketed_dataset(id_lists, labels, batch_size, max_len, pad_id=0, is_train=True,
+                            bucket_boundaries=BUCKET_BOUNDARIES):
+    """
+    길이별 버킷으로 배치를 만들고 배치 안에서만 패딩하는 tf.data.Dataset
+    id_lists는 input_ids 리스트 또는 tokenize_cache.TokenizedCorpus
+    """
+    labels = tf.constant(labels)
+    if hasattr(id_lists, 'row_splits'):
+        ragged = tf.RaggedTensor.from_row_splits(np.asarray(id_lists.values, dtype=np.int32),
+                                                 np.asarray(id_lists.row_splits, dtype=np.int64))
+    else:
+        ragged = tf.ragged.constant(id_lists, dtype=tf.int32)
+    dataset = tf.data.Dataset.from_tensor_slices((ragged, labels))
+    dataset = dataset.map(
+        lambda ids, label: ({'input_ids': ids, 'attention_mask': tf.ones_like(ids)}, label),
+        num_parallel_calls=tf.data.AUTOTUNE
+    )
+    if is_train:
+        dataset = dataset.shuffle(20000, reshuffle_each_iteration=True)
+
+    boundaries = [b for b in bucket_boundaries if b < max_len]
+    dataset = dataset.bucket_by_sequence_length(
+        element_length_func=lambda x, label: tf.shape(x['input_ids'])[0],
+        bucket_boundaries=boundaries,
+        bucket_batch_sizes=[batch_size] * (len(boundaries) + 1),
+        padding_values=({'input_ids': tf.constant(pad_id, tf.int32), 'attention_mask': tf.constant(0, tf.int32)},
+                        tf.constant(0, labels.dtype)),
+        drop_remainder=False
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+def peak_rss_mb():
+    """프로세스 최대 메모리 사용량(MB), 리눅스 기준 ru_maxrss는 KB 단위"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class EpochStatsCallback(tf.keras.callbacks.Callback):
+    """에폭마다 소요 시간과 최대 메모리(RSS)를 출력하고 logs에 기록"""
+    def __init__(self, label=""):
+        super().__init__()
+        self.label = label
+        self.epoch_times = []
+        self._started = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self._started
+        self.epoch_times.append(elapsed)
+        rss = peak_rss_mb()
+        if logs is not None:
+            logs['epoch_time_sec'] = elapsed
+            logs['peak_rss_mb'] = rss
+        print(f"\n[{self.label}] epoch {epoch + 1}: {elapsed:.1f}초, 최대 메모리 {rss:.0f}MB")
+
+    def on_train_end(self, logs=None):
+        if self.epoch_times:
+            avg = sum(self.epoch_times) / len(self.epoch_times)
+            print(f"[{self.label}] 평균 에폭 시간 {avg:.1f}초, 최대 메모리 {peak_rss_mb():.0f}MB")